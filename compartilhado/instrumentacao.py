@@ -0,0 +1,445 @@
+import argparse
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+FORMATOS = ("json", "prometheus")
+TIPOS_PERFIL = ("cprofile", "tracemalloc")
+PREFIXO_PROMETHEUS = "infwebnet"
+ARQUIVO_IO = "/proc/self/io"
+
+# (nome, tipo, descrição, campo somado dos registros) das métricas no formato Prometheus.
+METRICAS_PROMETHEUS = (
+    ("etapa_chamadas_total", "counter", "Chamadas da etapa.", "chamadas"),
+    ("etapa_erros_total", "counter", "Chamadas que terminaram em exceção.", "erros"),
+    (
+        "etapa_tempo_real_segundos_total",
+        "counter",
+        "Tempo de relógio acumulado.",
+        "tempo_real_s",
+    ),
+    (
+        "etapa_tempo_cpu_segundos_total",
+        "counter",
+        "Tempo de CPU acumulado do processo e dos processos filhos.",
+        "tempo_cpu_s",
+    ),
+    (
+        "etapa_memoria_pico_bytes",
+        "gauge",
+        "Maior aumento do pico de memória do processo durante uma chamada.",
+        "memoria_pico_bytes",
+    ),
+    (
+        "etapa_linhas_entrada_total",
+        "counter",
+        "Linhas recebidas pela etapa.",
+        "linhas_entrada",
+    ),
+    (
+        "etapa_linhas_saida_total",
+        "counter",
+        "Linhas devolvidas pela etapa.",
+        "linhas_saida",
+    ),
+    ("etapa_bytes_lidos_total", "counter", "Bytes lidos pelo processo.", "bytes_lidos"),
+    (
+        "etapa_bytes_escritos_total",
+        "counter",
+        "Bytes escritos pelo processo.",
+        "bytes_escritos",
+    ),
+)
+
+
+def _pico_memoria():
+    # Pico de memória residente do processo, em bytes (ru_maxrss é em KiB no Linux).
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _tempo_cpu():
+    # CPU de todas as threads do processo mais a dos processos filhos já encerrados (ex.: os
+    # workers de um ProcessPoolExecutor, ao fim do bloco `with`).
+    tempo = time.process_time()
+    if resource is not None:
+        filhos = resource.getrusage(resource.RUSAGE_CHILDREN)
+        tempo += filhos.ru_utime + filhos.ru_stime
+    return tempo
+
+
+def _bytes_io():
+    # (lidos, escritos) pelo processo até agora, incluindo pipes e sockets; None fora do Linux.
+    try:
+        with open(ARQUIVO_IO, encoding="ascii") as arquivo:
+            campos = dict(linha.split(": ") for linha in arquivo.read().splitlines())
+        return int(campos["rchar"]), int(campos["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def contar_linhas(valor):
+    """
+    Quantidade de linhas de um valor recebido ou devolvido por uma etapa.
+
+    DataFrames, listas, dicionários e demais objetos com `len` contam como `len(valor)`; tuplas
+    (etapas com várias saídas) somam as linhas de cada elemento; textos e escalares não contam.
+
+    Returns:
+        int: A quantidade de linhas.
+    """
+    if isinstance(valor, tuple):
+        return sum(contar_linhas(elemento) for elemento in valor)
+    if valor is None or isinstance(valor, (str, bytes)):
+        return 0
+    try:
+        return len(valor)
+    except TypeError:
+        return 0
+
+
+def _diferenca(depois, antes):
+    if depois is None or antes is None:
+        return None
+    return max(depois - antes, 0)
+
+
+def _escapar_rotulo(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrumentacao:
+    """
+    Mede as chamadas das etapas de um pipeline, sem mudar o código das etapas.
+
+    Cada função envolvida com `envolver` (ou `instrumentar`) registra, por chamada, o tempo de
+    relógio, o tempo de CPU, o aumento do pico de memória do processo, as linhas recebidas e
+    devolvidas (ver `contar_linhas`) e os bytes lidos e escritos (`/proc/self/io`).
+
+    O tempo de CPU, a memória e os bytes são medidas do processo inteiro: o trabalho entregue a
+    pools de threads entra na conta, mas, com etapas rodando em paralelo, cada uma também conta o
+    que as outras fizeram no mesmo intervalo. O tempo de CPU inclui ainda os processos filhos
+    encerrados durante a etapa (pools de processos); a memória e os bytes desses processos não
+    aparecem.
+
+    Opcionalmente, uma única etapa roda sob o cProfile (funções mais demoradas) ou sob o
+    tracemalloc (linhas que mais alocaram); o relatório é gravado em `perfil_<etapa>.txt`.
+    """
+
+    def __init__(
+        self,
+        perfil=None,
+        tipo_perfil="cprofile",
+        diretorio_perfis=".",
+        linhas_perfil=25,
+    ):
+        """
+        Args:
+            perfil (str, optional): Nome da etapa a perfilar.
+            tipo_perfil (str): "cprofile" (tempo por função; grava também o `.prof`, para o
+                pstats ou o snakeviz) ou "tracemalloc" (memória alocada por linha).
+            diretorio_perfis (str): Diretório dos relatórios de perfil.
+            linhas_perfil (int): Quantidade de funções ou linhas em cada relatório.
+
+        Raises:
+            ValueError: Se o tipo de perfil não existir.
+        """
+        if tipo_perfil not in TIPOS_PERFIL:
+            raise ValueError(
+                f"Tipo de perfil desconhecido: '{tipo_perfil}'. "
+                f"Opções: {', '.join(TIPOS_PERFIL)}."
+            )
+        self.perfil = perfil
+        self.tipo_perfil = tipo_perfil
+        self.diretorio_perfis = diretorio_perfis
+        self.linhas_perfil = linhas_perfil
+        self.registros = []
+        self.relatorios_perfil = []
+
+        self._trava = threading.Lock()
+        self._profiler = None
+        self._parar_tracemalloc = False
+
+    def envolver(self, funcao, nome=None):
+        """
+        Args:
+            funcao (callable): A função da etapa.
+            nome (str, optional): Nome da etapa nos registros; por padrão, o nome da função.
+
+        Returns:
+            callable: Uma função com a mesma assinatura que chama `funcao` e registra a
+            chamada. O código original continua acessível por `__wrapped__` (o
+            `inspect.getsource` e as assinaturas das etapas não mudam).
+        """
+        nome = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            return self._medir(nome, funcao, args, kwargs)
+
+        return envolvida
+
+    def instrumentar(self, namespace, nomes):
+        """
+        Troca funções de um módulo (ou de um dicionário como `globals()`) pelas versões
+        envolvidas, para que as chamadas feitas pelo nome passem a ser medidas.
+
+        Args:
+            namespace: O módulo ou o dicionário.
+            nomes (list): Nomes das funções.
+
+        Raises:
+            KeyError: Se algum nome não existir no namespace.
+        """
+        dicionario = namespace if isinstance(namespace, dict) else vars(namespace)
+        for nome in nomes:
+            dicionario[nome] = self.envolver(dicionario[nome], nome)
+
+    def _medir(self, nome, funcao, args, kwargs):
+        perfilar = nome == self.perfil
+        registro = {
+            "etapa": nome,
+            "inicio": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "linhas_entrada": sum(contar_linhas(valor) for valor in args)
+            + sum(contar_linhas(valor) for valor in kwargs.values()),
+            "erro": None,
+        }
+
+        pico_antes = _pico_memoria()
+        io_antes = _bytes_io()
+        antes_alocacoes = self._iniciar_perfil() if perfilar else None
+        cpu_antes = _tempo_cpu()
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = funcao(*args, **kwargs)
+        except BaseException as erro:
+            registro["erro"] = type(erro).__name__
+            raise
+        finally:
+            registro["tempo_real_s"] = time.perf_counter() - inicio
+            registro["tempo_cpu_s"] = _tempo_cpu() - cpu_antes
+            if perfilar:
+                if self._profiler is not None:
+                    self._profiler.disable()
+                self._concluir_perfil(nome, antes_alocacoes)
+            registro["linhas_saida"] = contar_linhas(resultado)
+            registro["memoria_pico_bytes"] = _diferenca(_pico_memoria(), pico_antes)
+            io_depois = _bytes_io()
+            if io_antes is None or io_depois is None:
+                registro["bytes_lidos"] = registro["bytes_escritos"] = None
+            else:
+                registro["bytes_lidos"] = io_depois[0] - io_antes[0]
+                registro["bytes_escritos"] = io_depois[1] - io_antes[1]
+            with self._trava:
+                self.registros.append(registro)
+
+        return resultado
+
+    def _iniciar_perfil(self):
+        # Para o tracemalloc, devolve o snapshot de antes da etapa.
+        if self.tipo_perfil == "cprofile":
+            self._profiler = self._profiler or cProfile.Profile()
+            self._profiler.enable()
+            return None
+
+        self._parar_tracemalloc = not tracemalloc.is_tracing()
+        if self._parar_tracemalloc:
+            tracemalloc.start(25)
+        return tracemalloc.take_snapshot()
+
+    def _concluir_perfil(self, nome, antes_alocacoes):
+        os.makedirs(self.diretorio_perfis, exist_ok=True)
+        base = os.path.join(self.diretorio_perfis, f"perfil_{nome}")
+        texto = io.StringIO()
+
+        if self.tipo_perfil == "cprofile":
+            # As chamadas repetidas da etapa se acumulam no mesmo perfil.
+            self._profiler.dump_stats(f"{base}.prof")
+            pstats.Stats(self._profiler, stream=texto).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(self.linhas_perfil)
+        else:
+            depois = tracemalloc.take_snapshot()
+            if self._parar_tracemalloc:
+                tracemalloc.stop()
+            filtros = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+            diferencas = depois.filter_traces(filtros).compare_to(
+                antes_alocacoes.filter_traces(filtros), "lineno"
+            )
+            texto.write(f"Alocações da etapa '{nome}' (maiores aumentos):\n\n")
+            for diferenca in diferencas[: self.linhas_perfil]:
+                texto.write(f"{diferenca}\n")
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto.getvalue())
+        with self._trava:
+            if f"{base}.txt" not in self.relatorios_perfil:
+                self.relatorios_perfil.append(f"{base}.txt")
+
+    def resumo(self):
+        """
+        Returns:
+            dict: Para cada etapa, na ordem da primeira chamada, as somas das medidas de todas as
+            chamadas (o pico de memória é o maior entre elas).
+        """
+        with self._trava:
+            registros = list(self.registros)
+
+        etapas = {}
+        for registro in registros:
+            etapa = etapas.setdefault(
+                registro["etapa"],
+                {
+                    "chamadas": 0,
+                    "erros": 0,
+                    "tempo_real_s": 0.0,
+                    "tempo_cpu_s": 0.0,
+                    "memoria_pico_bytes": None,
+                    "linhas_entrada": 0,
+                    "linhas_saida": 0,
+                    "bytes_lidos": None,
+                    "bytes_escritos": None,
+                },
+            )
+            etapa["chamadas"] += 1
+            etapa["erros"] += registro["erro"] is not None
+            for campo in (
+                "tempo_real_s",
+                "tempo_cpu_s",
+                "linhas_entrada",
+                "linhas_saida",
+            ):
+                etapa[campo] += registro[campo]
+            if registro["memoria_pico_bytes"] is not None:
+                etapa["memoria_pico_bytes"] = max(
+                    etapa["memoria_pico_bytes"] or 0, registro["memoria_pico_bytes"]
+                )
+            for campo in ("bytes_lidos", "bytes_escritos"):
+                if registro[campo] is not None:
+                    etapa[campo] = (etapa[campo] or 0) + registro[campo]
+        return etapas
+
+    def para_json(self):
+        """
+        Returns:
+            str: As chamadas (`registros`), o `resumo` por etapa e os relatórios de perfil, em JSON.
+        """
+        with self._trava:
+            registros = list(self.registros)
+        return json.dumps(
+            {
+                "registros": registros,
+                "etapas": self.resumo(),
+                "perfis": list(self.relatorios_perfil),
+            },
+            ensure_ascii=False,
+            indent=4,
+        )
+
+    def para_prometheus(self, prefixo=PREFIXO_PROMETHEUS):
+        """
+        Returns:
+            str: O `resumo` no formato de texto do Prometheus (para o textfile collector do
+            node_exporter ou um Pushgateway), com a etapa no rótulo `etapa`.
+        """
+        etapas = self.resumo()
+        linhas = []
+        for nome, tipo, descricao, campo in METRICAS_PROMETHEUS:
+            linhas.append(f"# HELP {prefixo}_{nome} {descricao}")
+            linhas.append(f"# TYPE {prefixo}_{nome} {tipo}")
+            for etapa, medidas in etapas.items():
+                if medidas[campo] is not None:
+                    linhas.append(
+                        f'{prefixo}_{nome}{{etapa="{_escapar_rotulo(etapa)}"}} '
+                        f"{medidas[campo]}"
+                    )
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho, formato=None):
+        """
+        Grava as métricas em um arquivo.
+
+        Args:
+            caminho (str): Arquivo de saída.
+            formato (str, optional): "json" ou "prometheus"; por padrão, "prometheus" para
+                arquivos .prom e "json" para os demais.
+
+        Raises:
+            ValueError: Se o formato não for suportado.
+        """
+        if formato is None:
+            formato = "prometheus" if caminho.endswith(".prom") else "json"
+        if formato not in FORMATOS:
+            raise ValueError(
+                f"Formato não suportado: '{formato}'. Opções: {', '.join(FORMATOS)}."
+            )
+
+        conteudo = self.para_json() if formato == "json" else self.para_prometheus()
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, caminho)
+
+
+def adicionar_argumentos(argumentos):
+    """
+    Acrescenta as opções de instrumentação (`--metricas`, `--formato-metricas`, `--perfil` e
+    `--tipo-perfil`) a um `argparse.ArgumentParser`.
+    """
+    argumentos.add_argument(
+        "--metricas",
+        metavar="ARQUIVO",
+        help="Mede cada etapa (tempo, CPU, memória, linhas e bytes) e grava as métricas no "
+        "ARQUIVO, em JSON ou, para arquivos .prom, no formato do Prometheus.",
+    )
+    argumentos.add_argument("--formato-metricas", choices=FORMATOS)
+    argumentos.add_argument(
+        "--perfil",
+        metavar="ETAPA",
+        help="Perfila uma etapa e grava as funções ou linhas mais custosas em "
+        "perfil_ETAPA.txt.",
+    )
+    argumentos.add_argument("--tipo-perfil", choices=TIPOS_PERFIL, default="cprofile")
+
+
+def criar_instrumentacao(args):
+    """
+    Returns:
+        Instrumentacao: A instrumentação pedida pelas opções de `adicionar_argumentos`, ou None
+        se nenhuma foi usada.
+    """
+    if not args.metricas and not args.perfil:
+        return None
+    return Instrumentacao(perfil=args.perfil, tipo_perfil=args.tipo_perfil)
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Converte um arquivo de métricas em JSON para o formato do Prometheus."
+    )
+    argumentos.add_argument("arquivo")
+    argumentos.add_argument("--prefixo", default=PREFIXO_PROMETHEUS)
+    args = argumentos.parse_args()
+
+    with open(args.arquivo, encoding="utf-8") as f:
+        metricas = json.load(f)
+    instrumentacao = Instrumentacao()
+    instrumentacao.registros = metricas["registros"]
+    print(instrumentacao.para_prometheus(args.prefixo), end="")
@@ -0,0 +1,270 @@
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+
+class Vocabulario:
+    """
+    Associa cada valor distinto a um código inteiro (0, 1, 2...), na ordem em que aparece.
+
+    Um mesmo vocabulário pode ser compartilhado por várias colunas, para que códigos iguais
+    representem sempre o mesmo valor.
+    """
+
+    def __init__(self, valores=()):
+        """
+        Args:
+            valores (iterable, optional): Valores já conhecidos, codificados nessa ordem.
+        """
+        self.valores = []
+        self._codigos = {}
+        self.codificar(list(valores))
+
+    def __len__(self):
+        return len(self.valores)
+
+    def codificar(self, valores):
+        """
+        Converte valores em códigos, acrescentando ao vocabulário os que ainda não existem.
+
+        Args:
+            valores (list): Valores hasheáveis.
+
+        Returns:
+            np.ndarray: Um código int32 por valor.
+        """
+        codigos_locais, distintos = pd.factorize(pd.Series(valores, dtype=object))
+
+        mapa = np.empty(len(distintos), dtype=np.int32)
+        for posicao, valor in enumerate(distintos):
+            mapa[posicao] = self._codigo(valor)
+
+        codigos = mapa[codigos_locais]
+
+        # O factorize agrupa None e NaN; eles são codificados à parte para voltarem iguais.
+        for posicao in np.flatnonzero(codigos_locais == -1):
+            codigos[posicao] = self._codigo(valores[posicao])
+
+        return codigos
+
+    def _codigo(self, valor):
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def decodificar(self, codigos):
+        """
+        Args:
+            codigos (np.ndarray): Códigos deste vocabulário.
+
+        Returns:
+            np.ndarray: Os valores correspondentes, em um array de objetos.
+        """
+        valores = np.empty(len(self.valores), dtype=object)
+        valores[:] = self.valores
+        return valores[codigos]
+
+
+class ColunaListas:
+    """
+    Coluna de listas em formato CSR: códigos de todos os elementos em arrays contíguos e um
+    array de deslocamentos, em que os elementos da linha i ocupam `deslocamentos[i]:deslocamentos[i + 1]`.
+
+    Com `campos=1`, cada elemento é um valor (ex.: hobbies, linguagens). Com `campos=2`, cada
+    elemento é um par, como (jogo, plataforma) em 'jogos', e cada posição do par tem seu próprio
+    array de códigos e vocabulário.
+
+    Linhas que não são listas (ex.: "Não Informado") ou cujos elementos fogem do formato são
+    guardadas sem conversão em `nao_compactadas` e ocupam uma fatia vazia; `para_listas`
+    devolve a coluna exatamente como era.
+    """
+
+    def __init__(
+        self,
+        codigos,
+        deslocamentos,
+        vocabularios,
+        tipo_elemento=None,
+        nao_compactadas=None,
+    ):
+        self.codigos = codigos
+        self.deslocamentos = deslocamentos
+        self.vocabularios = vocabularios
+        self.tipo_elemento = tipo_elemento
+        self.nao_compactadas = nao_compactadas or {}
+
+    @classmethod
+    def de_listas(cls, listas, campos=1, vocabularios=None):
+        """
+        Compacta uma coluna de listas.
+
+        Args:
+            listas (iterable): As listas de cada linha (ex.: `df["jogos"]`).
+            campos (int): 1 para listas de valores, 2 para listas de pares.
+            vocabularios (list, optional): Um `Vocabulario` por campo, para compartilhar códigos
+                entre colunas; por padrão, vocabulários novos.
+
+        Returns:
+            ColunaListas: A coluna compactada.
+        """
+        listas = list(listas)
+        vocabularios = vocabularios or [Vocabulario() for _ in range(campos)]
+
+        elementos = list(
+            chain.from_iterable(linha for linha in listas if isinstance(linha, list))
+        )
+
+        tipo_elemento = None
+        if campos > 1:
+            # Pares vêm como tuplas (dados gerados em Python) ou listas (dados lidos de JSON).
+            tipos_pares = Counter(
+                tipo for tipo in map(type, elementos) if tipo in (list, tuple)
+            )
+            tipo_elemento = max(tipos_pares, key=tipos_pares.get, default=tuple)
+
+        def elemento_valido(elemento):
+            if campos == 1:
+                return not isinstance(elemento, (list, tuple, dict, set))
+            return type(elemento) is tipo_elemento and len(elemento) == campos
+
+        nao_compactadas = {
+            posicao: linha
+            for posicao, linha in enumerate(listas)
+            if not isinstance(linha, list)
+        }
+
+        # Caminho rápido: tipos e tamanhos verificados sobre todos os elementos de uma vez; só
+        # se algum estiver fora do formato as linhas são verificadas uma a uma.
+        tipos = set(map(type, elementos))
+        if campos == 1:
+            todos_validos = not tipos & {list, tuple, dict, set}
+        else:
+            todos_validos = tipos <= {tipo_elemento} and set(map(len, elementos)) <= {
+                campos
+            }
+
+        if not todos_validos:
+            for posicao, linha in enumerate(listas):
+                if posicao not in nao_compactadas and not all(
+                    map(elemento_valido, linha)
+                ):
+                    nao_compactadas[posicao] = linha
+            elementos = list(
+                chain.from_iterable(
+                    linha
+                    for posicao, linha in enumerate(listas)
+                    if posicao not in nao_compactadas
+                )
+            )
+
+        if nao_compactadas:
+            tamanhos = [
+                0 if posicao in nao_compactadas else len(linha)
+                for posicao, linha in enumerate(listas)
+            ]
+        else:
+            tamanhos = list(map(len, listas))
+        deslocamentos = np.zeros(len(listas) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=deslocamentos[1:], dtype=np.int64)
+
+        if campos == 1:
+            colunas_campos = [elementos]
+        elif elementos:
+            colunas_campos = [list(campo) for campo in zip(*elementos)]
+        else:
+            colunas_campos = [[] for _ in range(campos)]
+
+        codigos = [
+            vocabulario.codificar(valores)
+            for vocabulario, valores in zip(vocabularios, colunas_campos)
+        ]
+
+        return cls(codigos, deslocamentos, vocabularios, tipo_elemento, nao_compactadas)
+
+    def __len__(self):
+        return len(self.deslocamentos) - 1
+
+    def linhas(self):
+        """
+        Returns:
+            np.ndarray: A linha de cada elemento (mesmo tamanho dos arrays de códigos).
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self.deslocamentos))
+
+    def contagens(self, campo=0):
+        """
+        Returns:
+            np.ndarray: Quantas vezes cada código do vocabulário do campo aparece na coluna.
+        """
+        return np.bincount(self.codigos[campo], minlength=len(self.vocabularios[campo]))
+
+    def valores_distintos(self, campo=0):
+        """
+        Returns:
+            set: Os valores do campo presentes na coluna.
+        """
+        return set(self.vocabularios[campo].decodificar(np.unique(self.codigos[campo])))
+
+    def mais_comuns(self, quantidade=None, campo=0):
+        """
+        Equivalente vetorizado de `Counter(elementos).most_common(quantidade)`.
+
+        Empates ficam na ordem da primeira ocorrência na coluna, como no `Counter`.
+
+        Args:
+            quantidade (int, optional): Quantos valores retornar; por padrão, todos.
+            campo (int): O campo contado.
+
+        Returns:
+            list: Pares (valor, contagem), do mais frequente para o menos frequente.
+        """
+        codigos = self.codigos[campo]
+        contagens = self.contagens(campo)
+
+        primeira_ocorrencia = np.full(len(contagens), len(codigos), dtype=np.int64)
+        np.minimum.at(primeira_ocorrencia, codigos, np.arange(len(codigos)))
+
+        presentes = np.flatnonzero(contagens)
+        ordem = presentes[
+            np.lexsort((primeira_ocorrencia[presentes], -contagens[presentes]))
+        ][:quantidade]
+
+        valores = self.vocabularios[campo].decodificar(ordem)
+        return list(zip(valores.tolist(), contagens[ordem].tolist()))
+
+    def para_listas(self):
+        """
+        Reconstrói a coluna no formato original (listas de valores ou de pares).
+
+        Returns:
+            list: Uma lista por linha.
+        """
+        valores_campos = [
+            vocabulario.decodificar(codigos).tolist()
+            for vocabulario, codigos in zip(self.vocabularios, self.codigos)
+        ]
+        if len(valores_campos) == 1:
+            elementos = valores_campos[0]
+        else:
+            elementos = list(map(self.tipo_elemento, zip(*valores_campos)))
+
+        inicios = self.deslocamentos[:-1].tolist()
+        fins = self.deslocamentos[1:].tolist()
+        listas = [elementos[inicio:fim] for inicio, fim in zip(inicios, fins)]
+
+        for posicao, linha in self.nao_compactadas.items():
+            listas[posicao] = linha
+        return listas
+
+    def memoria(self):
+        """
+        Returns:
+            int: Bytes ocupados pelos arrays de códigos e deslocamentos (sem os vocabulários).
+        """
+        return self.deslocamentos.nbytes + sum(
+            codigos.nbytes for codigos in self.codigos
+        )
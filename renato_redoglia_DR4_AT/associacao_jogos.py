@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from listas_compactas import ColunaListas
+
+
+class MotorAssociacaoJogos:
+    """
+    Motor de associação entre os jogos dos usuários e o catálogo extraído da Wikipedia.
+
+    O catálogo é indexado uma única vez por pares normalizados (plataforma, jogo). A associação
+    de todos os usuários é então resolvida em uma única passagem vetorizada de explode/merge,
+    sem percorrer o catálogo para cada jogo de cada usuário.
+
+    O mesmo motor pode ser reutilizado para várias tabelas de usuários e reindexado com
+    `atualizar_catalogo` quando o catálogo muda.
+    """
+
+    COLUNAS_INDICE = ["chave_plataforma", "chave_jogo", "ocorrencias"]
+
+    def __init__(self, dados_jogos_extraidos=None):
+        """
+        Args:
+            dados_jogos_extraidos (list, optional): Catálogo no formato retornado por `parsear_paginas`.
+        """
+        self.indice = pd.DataFrame(columns=self.COLUNAS_INDICE)
+
+        if dados_jogos_extraidos is not None:
+            self.atualizar_catalogo(dados_jogos_extraidos)
+
+    def atualizar_catalogo(self, dados_jogos_extraidos):
+        """
+        Reconstrói o índice (plataforma, jogo) a partir de um novo catálogo.
+
+        Jogos repetidos dentro da mesma plataforma são contados, preservando a multiplicidade
+        de associações da implementação original.
+
+        Args:
+            dados_jogos_extraidos (list): Catálogo no formato retornado por `parsear_paginas`.
+
+        Returns:
+            MotorAssociacaoJogos: O próprio motor, para encadeamento.
+        """
+        pares = [
+            (plataforma["plataforma"], jogo["nome_jogo"])
+            for plataforma in dados_jogos_extraidos
+            for jogo in plataforma["jogos"]
+        ]
+        catalogo = pd.DataFrame(
+            pares, columns=["plataforma", "nome_jogo"], dtype=object
+        )
+
+        self.indice = (
+            pd.DataFrame(
+                {
+                    "chave_plataforma": catalogo["plataforma"].str.lower(),
+                    "chave_jogo": catalogo["nome_jogo"].str.lower(),
+                }
+            )
+            .groupby(["chave_plataforma", "chave_jogo"], sort=False)
+            .size()
+            .rename("ocorrencias")
+            .reset_index()
+        )
+        return self
+
+    def associar(self, df_usuarios, jogos=None):
+        """
+        Preenche a coluna 'jogos_associados' de todos os usuários em uma única passagem.
+
+        Os pares (jogo, plataforma) dos usuários são comparados ao índice já como arrays de
+        códigos (`ColunaListas`): cada jogo e plataforma distintos é normalizado uma única vez
+        e a busca no índice é feita em bloco, para todos os pares de todos os usuários.
+
+        Args:
+            df_usuarios (pd.DataFrame): DataFrame com a coluna 'jogos', uma lista de pares (jogo, plataforma).
+            jogos (ColunaListas, optional): A coluna 'jogos' já compactada (com `campos=2`);
+                por padrão, é compactada aqui.
+
+        Returns:
+            pd.DataFrame: O mesmo DataFrame, com a coluna 'jogos_associados' preenchida.
+        """
+        if jogos is None:
+            jogos = ColunaListas.de_listas(df_usuarios["jogos"], campos=2)
+
+        vocabulario_jogos, vocabulario_plataformas = jogos.vocabularios
+        codigos_jogos, codigos_plataformas = jogos.codigos
+
+        nomes_jogos = vocabulario_jogos.decodificar(np.arange(len(vocabulario_jogos)))
+        nomes_plataformas = vocabulario_plataformas.decodificar(
+            np.arange(len(vocabulario_plataformas))
+        )
+        chaves_jogos = pd.Series(nomes_jogos, dtype=object).str.lower().to_numpy()
+        chaves_plataformas = (
+            pd.Series(nomes_plataformas, dtype=object).str.lower().to_numpy()
+        )
+
+        indice = pd.MultiIndex.from_arrays(
+            [self.indice["chave_plataforma"], self.indice["chave_jogo"]]
+        )
+        posicoes_indice = indice.get_indexer(
+            pd.MultiIndex.from_arrays(
+                [
+                    chaves_plataformas[codigos_plataformas],
+                    chaves_jogos[codigos_jogos],
+                ]
+            )
+        )
+        ocorrencias = np.where(
+            posicoes_indice >= 0,
+            self.indice["ocorrencias"].to_numpy(dtype=np.int64)[posicoes_indice],
+            0,
+        )
+
+        # Cada par encontrado aparece uma vez por ocorrência no catálogo.
+        selecionados = np.repeat(np.arange(len(ocorrencias)), ocorrencias)
+        associados = [[] for _ in range(len(df_usuarios))]
+        for linha, nome_jogo, plataforma in zip(
+            jogos.linhas()[selecionados].tolist(),
+            nomes_jogos[codigos_jogos[selecionados]].tolist(),
+            nomes_plataformas[codigos_plataformas[selecionados]].tolist(),
+        ):
+            associados[linha].append({"nome_jogo": nome_jogo, "plataforma": plataforma})
+
+        # Linhas fora do formato de lista de pares seguem a regra original: só os elementos
+        # que são pares são associados.
+        ocorrencias_por_chave = dict(
+            zip(
+                zip(self.indice["chave_plataforma"], self.indice["chave_jogo"]),
+                self.indice["ocorrencias"],
+            )
+        )
+        for linha, valor in jogos.nao_compactadas.items():
+            if not isinstance(valor, (list, tuple)):
+                continue
+            for par in valor:
+                if not (isinstance(par, (list, tuple)) and len(par) == 2):
+                    continue
+                nome_jogo, plataforma = par
+                if not (isinstance(nome_jogo, str) and isinstance(plataforma, str)):
+                    continue
+                chave = (plataforma.lower(), nome_jogo.lower())
+                associados[linha].extend(
+                    {"nome_jogo": nome_jogo, "plataforma": plataforma}
+                    for _ in range(ocorrencias_por_chave.get(chave, 0))
+                )
+
+        df_usuarios["jogos_associados"] = associados
+        return df_usuarios
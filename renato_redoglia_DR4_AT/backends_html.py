@@ -0,0 +1,358 @@
+import argparse
+import glob
+import time
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+BACKENDS = ("html.parser", "lxml", "streaming")
+
+# Deve ser incrementada sempre que a extração mudar, para invalidar o cache do parsing.
+VERSAO_EXTRACAO = 1
+
+# Textos dentro destas tags não entram no `get_text` do BeautifulSoup (são Stylesheet, Script, etc.).
+TAGS_SEM_TEXTO = {"style", "script", "template", "rt", "rp"}
+
+TAMANHO_BLOCO_STREAMING = 64 * 1024
+
+
+def montar_jogos(tabelas):
+    """
+    Converte as linhas das tabelas 'wikitable' na lista de jogos usada por `parsear_paginas`.
+
+    Args:
+        tabelas (list): Lista de tabelas no formato (colunas, linhas), em que `colunas` são os
+            textos das células <th> da primeira linha e `linhas` são os textos das células <td>
+            de cada uma das demais linhas.
+
+    Returns:
+        list: Lista de dicionários com as chaves 'nome_jogo' e 'dados_jogo'.
+    """
+    jogos = []
+
+    for colunas, linhas in tabelas:
+        for colunas_valores in linhas:
+            if len(colunas_valores) == len(colunas):
+                dados_jogo = dict(zip(colunas, colunas_valores))
+                nome_jogo = dados_jogo.get("Título") or dados_jogo.get(
+                    "Jogo", "Desconhecido"
+                )
+                jogos.append({"nome_jogo": nome_jogo, "dados_jogo": dados_jogo})
+
+    return jogos
+
+
+def _tabelas_bs4(conteudo_html):
+    soup = BeautifulSoup(conteudo_html, "html.parser")
+    titulo = soup.title.string if soup.title else ""
+    if titulo is not None:
+        # Converte o NavigableString em str para não carregar a árvore inteira junto.
+        titulo = str(titulo)
+
+    tabelas = []
+    for tabela in soup.find_all("table", class_="wikitable"):
+        cabecalho = tabela.find("tr")
+        if not cabecalho:
+            continue
+
+        colunas = [th.get_text(strip=True) for th in cabecalho.find_all("th")]
+        linhas = [
+            [td.get_text(strip=True) for td in linha.find_all("td")]
+            for linha in tabela.find_all("tr")[1:]
+        ]
+        tabelas.append((colunas, linhas))
+
+    return titulo, tabelas
+
+
+def _texto_lxml(elemento):
+    partes = []
+
+    def percorrer(no):
+        if no.text:
+            partes.append(no.text)
+        for filho in no:
+            if isinstance(filho.tag, str) and filho.tag not in TAGS_SEM_TEXTO:
+                percorrer(filho)
+            if filho.tail:
+                partes.append(filho.tail)
+
+    percorrer(elemento)
+    return "".join(parte.strip() for parte in partes)
+
+
+def _tabelas_lxml(conteudo_html):
+    if lxml is None:
+        raise ImportError("O backend 'lxml' requer o pacote lxml instalado.")
+
+    documento = lxml.html.document_fromstring(conteudo_html)
+
+    titulo = ""
+    elemento_titulo = next(documento.iter("title"), None)
+    if elemento_titulo is not None:
+        titulo = elemento_titulo.text if len(elemento_titulo) == 0 else None
+
+    tabelas = []
+    for tabela in documento.iter("table"):
+        if "wikitable" not in (tabela.get("class") or "").split():
+            continue
+
+        linhas = list(tabela.iter("tr"))
+        if not linhas:
+            continue
+
+        colunas = [_texto_lxml(th) for th in linhas[0].iter("th")]
+        tabelas.append(
+            (
+                colunas,
+                [[_texto_lxml(td) for td in linha.iter("td")] for linha in linhas[1:]],
+            )
+        )
+
+    return titulo, tabelas
+
+
+class _ParserWikitables(HTMLParser):
+    """
+    Parser orientado a eventos que só materializa o título e as linhas das tabelas 'wikitable'.
+
+    Mantém uma pilha apenas das tags relevantes e reproduz a semântica de busca recursiva do
+    BeautifulSoup: uma linha aninhada também pertence às tabelas externas e o texto de uma
+    célula aninhada também compõe o texto das células externas.
+    """
+
+    TAGS_RELEVANTES = {"title", "table", "tr", "th", "td"} | TAGS_SEM_TEXTO
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pilha = []
+        self.texto_pendente = []
+        self.titulo = ""
+        self.partes_titulo = None
+        self.titulo_tem_filhos = False
+        self.titulo_encontrado = False
+        self.tabelas = []
+
+    def _abertos(self, *tags):
+        return [
+            objeto for tag, objeto in self.pilha if tag in tags and objeto is not None
+        ]
+
+    def _descarregar_texto(self):
+        if not self.texto_pendente:
+            return
+
+        texto = "".join(self.texto_pendente)
+        self.texto_pendente = []
+
+        if self.partes_titulo is not None:
+            self.partes_titulo.append(texto)
+
+        if any(tag in TAGS_SEM_TEXTO for tag, _ in self.pilha):
+            return
+
+        texto = texto.strip()
+        if texto:
+            for celula in self._abertos("th", "td"):
+                celula.append(texto)
+
+    def handle_starttag(self, tag, attrs):
+        self._descarregar_texto()
+        if self.partes_titulo is not None:
+            self.titulo_tem_filhos = True
+
+        if tag not in self.TAGS_RELEVANTES:
+            return
+
+        objeto = None
+
+        if tag == "title" and not self.titulo_encontrado:
+            self.titulo_encontrado = True
+            self.partes_titulo = []
+            objeto = self.partes_titulo
+
+        elif tag == "table":
+            classes = (dict(attrs).get("class") or "").split()
+            if "wikitable" in classes:
+                objeto = []
+                self.tabelas.append(objeto)
+
+        elif tag == "tr":
+            tabelas_abertas = self._abertos("table")
+            if tabelas_abertas:
+                objeto = ([], [])
+                for tabela in tabelas_abertas:
+                    tabela.append(objeto)
+
+        elif tag in ("th", "td"):
+            linhas_abertas = self._abertos("tr")
+            if linhas_abertas:
+                objeto = []
+                indice = 0 if tag == "th" else 1
+                for linha in linhas_abertas:
+                    linha[indice].append(objeto)
+
+        self.pilha.append((tag, objeto))
+
+    def handle_endtag(self, tag):
+        self._descarregar_texto()
+
+        for posicao in range(len(self.pilha) - 1, -1, -1):
+            if self.pilha[posicao][0] == tag:
+                for _, objeto_fechado in self.pilha[posicao:]:
+                    if (
+                        self.partes_titulo is not None
+                        and objeto_fechado is self.partes_titulo
+                    ):
+                        self._fechar_titulo()
+                del self.pilha[posicao:]
+                break
+
+    def handle_data(self, data):
+        self.texto_pendente.append(data)
+
+    def handle_comment(self, data):
+        self._descarregar_texto()
+        if self.partes_titulo is not None:
+            self.titulo_tem_filhos = True
+
+    def _fechar_titulo(self):
+        if self.titulo_tem_filhos or not self.partes_titulo:
+            self.titulo = None
+        else:
+            self.titulo = "".join(self.partes_titulo)
+        self.partes_titulo = None
+
+    def close(self):
+        super().close()
+        self._descarregar_texto()
+        if self.partes_titulo is not None:
+            self._fechar_titulo()
+
+
+def _tabelas_streaming(conteudo_html):
+    parser = _ParserWikitables()
+
+    for inicio in range(0, len(conteudo_html), TAMANHO_BLOCO_STREAMING):
+        parser.feed(conteudo_html[inicio : inicio + TAMANHO_BLOCO_STREAMING])
+    parser.close()
+
+    tabelas = [
+        (
+            ["".join(celula) for celula in linhas[0][0]],
+            [["".join(celula) for celula in tds] for _, tds in linhas[1:]],
+        )
+        for linhas in parser.tabelas
+        if linhas
+    ]
+    return parser.titulo, tabelas
+
+
+_EXTRATORES = {
+    "html.parser": _tabelas_bs4,
+    "lxml": _tabelas_lxml,
+    "streaming": _tabelas_streaming,
+}
+
+
+def extrair_titulo_e_jogos(conteudo_html, backend="html.parser"):
+    """
+    Extrai o título da página e os jogos das tabelas 'wikitable' com o backend escolhido.
+
+    Backends disponíveis:
+        - "html.parser": árvore completa do BeautifulSoup (comportamento original).
+        - "lxml": árvore do lxml, construída em C (requer o pacote lxml).
+        - "streaming": parser orientado a eventos que só guarda as linhas das 'wikitable'.
+
+    Args:
+        conteudo_html (str): O HTML da página.
+        backend (str): Nome do backend de parsing.
+
+    Returns:
+        tuple: O título da página (ou None, como `soup.title.string`) e a lista de jogos.
+
+    Raises:
+        ValueError: Se o backend não existir.
+    """
+    if backend not in _EXTRATORES:
+        raise ValueError(
+            f"Backend de parsing desconhecido: '{backend}'. Opções: {', '.join(BACKENDS)}."
+        )
+
+    titulo, tabelas = _EXTRATORES[backend](conteudo_html)
+    return titulo, montar_jogos(tabelas)
+
+
+def comparar_backends(
+    caminhos_arquivos_html, backends=BACKENDS, referencia="html.parser"
+):
+    """
+    Compara a saída e o tempo de cada backend de parsing nos arquivos HTML informados.
+
+    Args:
+        caminhos_arquivos_html (list): Lista com os caminhos dos arquivos HTML.
+        backends (tuple): Backends a comparar.
+        referencia (str): Backend cuja saída é considerada a correta.
+
+    Returns:
+        list: Uma lista de dicionários com arquivo, backend, tempo em segundos, quantidade de
+        jogos e se a saída é idêntica à da referência.
+    """
+    resultados = []
+
+    for caminho_arquivo_html in caminhos_arquivos_html:
+        with open(caminho_arquivo_html, "r", encoding="utf-8") as f:
+            conteudo_html = f.read()
+
+        saida_referencia = extrair_titulo_e_jogos(conteudo_html, referencia)
+
+        for backend in backends:
+            try:
+                inicio = time.perf_counter()
+                saida = extrair_titulo_e_jogos(conteudo_html, backend)
+                tempo = time.perf_counter() - inicio
+            except ImportError as e:
+                print(f"Backend '{backend}' indisponível: {e}")
+                continue
+
+            resultados.append(
+                {
+                    "arquivo": caminho_arquivo_html,
+                    "backend": backend,
+                    "tempo": tempo,
+                    "jogos": len(saida[1]),
+                    "identico": saida == saida_referencia,
+                }
+            )
+
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Compara a saída e o tempo dos backends de parsing das páginas de plataformas."
+    )
+    argumentos.add_argument(
+        "arquivos",
+        nargs="*",
+        help="Arquivos HTML a comparar (padrão: plataforma_*.html do diretório atual).",
+    )
+    argumentos.add_argument(
+        "--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS
+    )
+    args = argumentos.parse_args()
+
+    arquivos = args.arquivos or sorted(glob.glob("plataforma_*.html"))
+
+    for resultado in comparar_backends(arquivos, tuple(args.backends)):
+        situacao = "idêntico" if resultado["identico"] else "DIVERGENTE"
+        print(
+            f"{resultado['arquivo']:<40} {resultado['backend']:<12} "
+            f"{resultado['tempo'] * 1000:>9.1f} ms {resultado['jogos']:>6} jogos  {situacao}"
+        )
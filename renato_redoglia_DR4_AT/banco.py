@@ -0,0 +1,241 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from sqlalchemy import create_engine, event
+
+ARQUIVO_BANCO = "INFwebNET_DB.db"
+
+# Aplicados a cada conexão nova do pool: cache de páginas de 64 MiB (valor negativo = KiB),
+# leitura por mmap de até 256 MiB e fsync só nos checkpoints (seguro em WAL; no journal padrão,
+# uma queda de energia pode perder o último commit, mas não corrompe o banco).
+PRAGMAS_SQLITE = {
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+}
+
+TABELA_JOGOS_PLATAFORMAS = "Jogos_Plataformas"
+INDICE_CHAVE_JOGOS_PLATAFORMAS = "idx_jogos_plataformas_chave"
+
+
+def _em_lotes(itens, tamanho_lote):
+    iterador = iter(itens)
+    while lote := list(islice(iterador, tamanho_lote)):
+        yield lote
+
+
+_engines = {}
+_trava_engines = threading.Lock()
+
+
+def obter_engine(arquivo_banco=ARQUIVO_BANCO, pragmas=None):
+    """
+    Retorna o engine compartilhado de um banco SQLite, criando-o na primeira chamada.
+
+    O engine mantém um pool de conexões reaproveitadas entre chamadas, e cada conexão nova
+    recebe os pragmas de `PRAGMAS_SQLITE`. Chamadas seguintes para o mesmo arquivo devolvem o
+    mesmo engine (os pragmas só são considerados na criação).
+
+    Args:
+        arquivo_banco (str): Caminho do arquivo do banco.
+        pragmas (dict, optional): Pragmas que substituem ou complementam `PRAGMAS_SQLITE`.
+
+    Returns:
+        sqlalchemy.Engine: O engine do banco.
+    """
+    chave = os.path.abspath(arquivo_banco)
+
+    with _trava_engines:
+        engine = _engines.get(chave)
+        if engine is None:
+            engine = create_engine(f"sqlite:///{arquivo_banco}")
+            pragmas_conexao = {**PRAGMAS_SQLITE, **(pragmas or {})}
+
+            @event.listens_for(engine, "connect")
+            def _aplicar_pragmas(conexao_dbapi, registro_conexao):
+                cursor = conexao_dbapi.cursor()
+                for nome, valor in pragmas_conexao.items():
+                    cursor.execute(f"PRAGMA {nome}={valor}")
+                cursor.close()
+
+            _engines[chave] = engine
+
+        return engine
+
+
+def descartar_engines():
+    """
+    Fecha as conexões de todos os engines compartilhados e os remove do cache.
+    """
+    with _trava_engines:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+@contextmanager
+def transacao_sqlite(engine, wal=False):
+    """
+    Abre uma transação explícita (BEGIN IMMEDIATE) em uma conexão SQLite do engine.
+
+    O driver sqlite3 só inicia transações implícitas antes de comandos DML, deixando comandos
+    DDL (CREATE, DROP) fora delas. Aqui o controle é manual, de modo que DDL e DML fiquem na
+    mesma transação: ou tudo é gravado no commit, ou nada é.
+
+    Args:
+        engine (sqlalchemy.Engine): Engine do banco SQLite.
+        wal (bool): Se True, ativa o journal_mode=WAL antes de iniciar a transação.
+
+    Yields:
+        sqlite3.Cursor: Cursor da transação aberta.
+    """
+    conexao = engine.raw_connection()
+    conexao_sqlite = conexao.driver_connection
+    isolation_level_anterior = conexao_sqlite.isolation_level
+
+    try:
+        conexao_sqlite.isolation_level = None
+        cursor = conexao_sqlite.cursor()
+
+        if wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+    finally:
+        conexao_sqlite.isolation_level = isolation_level_anterior
+        conexao.close()
+
+
+def _garantir_esquema_jogos_plataformas(cursor):
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_JOGOS_PLATAFORMAS} (
+            nome_plataforma TEXT NOT NULL,
+            nome_jogo TEXT NOT NULL,
+            ocorrencia INTEGER NOT NULL DEFAULT 0,
+            dados_jogo TEXT
+        )
+        """
+    )
+
+    colunas = {
+        coluna[1]
+        for coluna in cursor.execute(f"PRAGMA table_info({TABELA_JOGOS_PLATAFORMAS})")
+    }
+
+    if "ocorrencia" not in colunas:
+        # Tabelas criadas pelo modo de substituição (to_sql) ou por versões anteriores não têm a
+        # coluna e podem repetir o par (plataforma, jogo): numera as repetições pela ordem de
+        # inserção, sem descartar nenhuma linha, e troca o índice antigo pelo novo.
+        cursor.execute(f"DROP INDEX IF EXISTS {INDICE_CHAVE_JOGOS_PLATAFORMAS}")
+        cursor.execute(
+            f"""
+            ALTER TABLE {TABELA_JOGOS_PLATAFORMAS}
+            ADD COLUMN ocorrencia INTEGER NOT NULL DEFAULT 0
+            """
+        )
+        cursor.execute(
+            f"""
+            UPDATE {TABELA_JOGOS_PLATAFORMAS} AS atual
+            SET ocorrencia = (
+                SELECT COUNT(*) FROM {TABELA_JOGOS_PLATAFORMAS} AS anterior
+                WHERE anterior.nome_plataforma = atual.nome_plataforma
+                AND anterior.nome_jogo = atual.nome_jogo
+                AND anterior.rowid < atual.rowid
+            )
+            """
+        )
+
+    cursor.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {INDICE_CHAVE_JOGOS_PLATAFORMAS}
+        ON {TABELA_JOGOS_PLATAFORMAS} (nome_plataforma, nome_jogo, ocorrencia)
+        """
+    )
+
+
+def sincronizar_jogos_plataformas(
+    engine, dados_jogos_extraidos, wal=False, tamanho_lote=1000
+):
+    """
+    Atualiza a tabela 'Jogos_Plataformas' de forma incremental, em uma única transação.
+
+    A tabela tem chave única (nome_plataforma, nome_jogo, ocorrencia), em que `ocorrencia`
+    numera, a partir de 0 e na ordem do catálogo, as linhas que repetem o mesmo jogo na mesma
+    plataforma; assim nenhuma linha do catálogo é descartada. Só são gravadas as linhas que
+    mudaram: jogos novos são inseridos, jogos com `dados_jogo` diferente são atualizados e jogos
+    que saíram do catálogo são removidos, sempre com `executemany` em lotes. Como tudo acontece
+    em uma única transação, leitores continuam vendo a versão anterior da tabela até o commit.
+
+    Args:
+        engine (sqlalchemy.Engine): Engine do banco SQLite.
+        dados_jogos_extraidos (list): Lista de dicionários com os jogos extraídos por plataforma.
+        wal (bool): Se True, ativa o journal_mode=WAL, que permite leituras durante a escrita.
+        tamanho_lote (int): Quantidade de linhas por chamada de `executemany`.
+
+    Returns:
+        dict: As quantidades de linhas inseridas, atualizadas, removidas e inalteradas.
+    """
+    desejadas = {}
+    ocorrencias = {}
+    for plataforma in dados_jogos_extraidos:
+        for jogo in plataforma["jogos"]:
+            par = (plataforma["plataforma"], jogo["nome_jogo"])
+            ocorrencia = ocorrencias.get(par, 0)
+            ocorrencias[par] = ocorrencia + 1
+            desejadas[(*par, ocorrencia)] = json.dumps(jogo["dados_jogo"])
+
+    with transacao_sqlite(engine, wal=wal) as cursor:
+        _garantir_esquema_jogos_plataformas(cursor)
+
+        existentes = {
+            (nome_plataforma, nome_jogo, ocorrencia): dados_jogo
+            for nome_plataforma, nome_jogo, ocorrencia, dados_jogo in cursor.execute(
+                f"SELECT nome_plataforma, nome_jogo, ocorrencia, dados_jogo FROM {TABELA_JOGOS_PLATAFORMAS}"
+            )
+        }
+
+        inserir = [
+            (*chave, dados)
+            for chave, dados in desejadas.items()
+            if chave not in existentes
+        ]
+        atualizar = [
+            (dados, *chave)
+            for chave, dados in desejadas.items()
+            if chave in existentes and existentes[chave] != dados
+        ]
+        remover = [chave for chave in existentes if chave not in desejadas]
+
+        for lote in _em_lotes(remover, tamanho_lote):
+            cursor.executemany(
+                f"DELETE FROM {TABELA_JOGOS_PLATAFORMAS} WHERE nome_plataforma = ? AND nome_jogo = ? AND ocorrencia = ?",
+                lote,
+            )
+        for lote in _em_lotes(atualizar, tamanho_lote):
+            cursor.executemany(
+                f"UPDATE {TABELA_JOGOS_PLATAFORMAS} SET dados_jogo = ? WHERE nome_plataforma = ? AND nome_jogo = ? AND ocorrencia = ?",
+                lote,
+            )
+        for lote in _em_lotes(inserir, tamanho_lote):
+            cursor.executemany(
+                f"INSERT INTO {TABELA_JOGOS_PLATAFORMAS} (nome_plataforma, nome_jogo, ocorrencia, dados_jogo) VALUES (?, ?, ?, ?)",
+                lote,
+            )
+
+    return {
+        "inseridos": len(inserir),
+        "atualizados": len(atualizar),
+        "removidos": len(remover),
+        "inalterados": len(desejadas) - len(inserir) - len(atualizar),
+    }
@@ -0,0 +1,535 @@
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+import pandas as pd
+
+import backends_html
+import main
+from banco import ARQUIVO_BANCO, descartar_engines
+from listas_compactas import ColunaListas
+
+ESCALAS = (1_000, 10_000, 100_000)
+PLATAFORMAS = ("PlayStation 3", "PlayStation 4", "Xbox One", "Nintendo Switch")
+JOGOS_POR_PAGINA = 2_000
+
+NOMES = (
+    "Ana João Maria Pedro Lucas Júlia Camila Rafael Renato Luíza Otávio Cecília Mônica "
+    "Sérgio Fábio Íris"
+).split()
+SOBRENOMES = (
+    "Silva Souza Costa Ribeiro Gomes Barbosa Dias Araújo Simões Brandão".split()
+)
+CIDADES = {
+    "RJ": ("Rio de Janeiro", "Niterói"),
+    "SP": ("São Paulo", "Campinas"),
+    "MG": ("Belo Horizonte", "Juiz de Fora"),
+    "SC": ("Florianópolis", "Itajaí"),
+    "PE": ("Recife",),
+}
+HOBBIES = "leitura cinema futebol xadrez ciclismo fotografia música corrida".split()
+LINGUAGENS = ("Python", "Java", "C#", "Go", "PHP", "Ruby", "C++", "JavaScript")
+PALAVRAS_TITULO = (
+    "Shadow Legends Racing Dragon Quest Tales Soul Star Wars Knight Ninja Dead Space Final "
+    "Fantasy Street Fighter Kingdom Hearts Metal Gear Crash Battle Front Zero Dawn Origins"
+).split()
+ESTUDIOS = (
+    "Ubisoft",
+    "Capcom",
+    "Square Enix",
+    "Bandai Namco",
+    "Electronic Arts",
+    "Sega",
+    "Konami",
+    "Naughty Dog",
+)
+
+
+def nomes_jogos(quantidade, semente=42):
+    """
+    Sorteia nomes de jogos distintos, às vezes com caracteres que viram entidades no HTML
+    ("&", aspas) e com números de sequência.
+
+    Args:
+        quantidade (int): Quantidade de nomes.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list: Os nomes.
+    """
+    aleatorio = random.Random(semente)
+    nomes = {}
+    while len(nomes) < quantidade:
+        nome = " ".join(aleatorio.sample(PALAVRAS_TITULO, aleatorio.randint(1, 3)))
+        sorteio = aleatorio.random()
+        if sorteio < 0.05:
+            nome += " & Friends"
+        elif sorteio < 0.10:
+            nome = f"{nome}: Director's Cut"
+        elif sorteio < 0.40:
+            nome += f" {aleatorio.randint(2, 9)}"
+        nomes.setdefault(nome, None)
+    return list(nomes)
+
+
+def gerar_pagina_wikitable(caminho, plataforma, jogos, semente=42):
+    """
+    Gera uma página sintética no formato das listas de jogos da Wikipédia.
+
+    A página tem o título validado por `parsear_paginas`, uma tabela sem a classe 'wikitable'
+    (ignorada), scripts e estilos (que não entram no texto) e a 'wikitable sortable' com os
+    jogos: nomes em <i><a>, entidades HTML, referências em <sup> e algumas linhas com células a
+    mais ou a menos, que os backends descartam.
+
+    Args:
+        caminho (str): Arquivo de saída.
+        plataforma (str): Nome da plataforma.
+        jogos (list): Nomes dos jogos da tabela.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        int: Quantidade de linhas válidas (com a mesma quantidade de colunas do cabeçalho).
+    """
+    aleatorio = random.Random(f"{semente}:{plataforma}")
+    colunas = ("Título", "Desenvolvedora", "Publicadora", "Ano", "Exclusivo", "Ref.")
+    validas = 0
+
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(
+            '<!DOCTYPE html>\n<html lang="pt">\n<head>\n<meta charset="UTF-8">\n'
+            f"<title>Lista de jogos para {html.escape(plataforma)} – Wikipédia, a "
+            "enciclopédia livre</title>\n"
+            "<style>.wikitable { border: 1px solid #a2a9b1; }</style>\n"
+            '<script>var wgPageName = "Lista_de_jogos"; if (a < b) {}</script>\n'
+            "</head>\n<body>\n"
+            '<table class="infobox"><tr><th>Plataforma</th></tr>'
+            f"<tr><td>{html.escape(plataforma)}</td></tr></table>\n"
+            '<!-- <table class="wikitable"><tr><th>X</th></tr></table> -->\n'
+            '<table class="wikitable sortable">\n<tbody>\n<tr>'
+            + "".join(f"<th>{coluna}\n</th>" for coluna in colunas)
+            + "</tr>\n"
+        )
+
+        for nome in jogos:
+            estudio = aleatorio.choice(ESTUDIOS)
+            celulas = [
+                f'<i><a href="/wiki/{html.escape(nome.replace(" ", "_"), quote=True)}" '
+                f'title="{html.escape(nome, quote=True)}">{html.escape(nome)}</a></i>',
+                html.escape(estudio),
+                html.escape(aleatorio.choice((estudio, *ESTUDIOS))),
+                f"{aleatorio.randint(2006, 2024)}"
+                + (
+                    f'<sup class="reference"><a href="#cite_note-{validas}">[{validas}]'
+                    "</a></sup>"
+                    if aleatorio.random() < 0.2
+                    else ""
+                ),
+                aleatorio.choice(("Sim", "Não", "Console")),
+                "" if aleatorio.random() < 0.5 else f"[{aleatorio.randint(1, 99)}]",
+            ]
+            sorteio = aleatorio.random()
+            if sorteio < 0.02:
+                celulas.append("Notas")  # Célula a mais.
+            elif sorteio < 0.04:
+                celulas.pop()  # Célula a menos.
+            else:
+                validas += 1
+            arquivo.write(
+                "<tr>"
+                + "".join(f"<td>{celula}\n</td>" for celula in celulas)
+                + "</tr>\n"
+            )
+
+        arquivo.write("</tbody>\n</table>\n</body>\n</html>\n")
+
+    return validas
+
+
+def gerar_usuarios(caminho, quantidade, catalogo, semente=42):
+    """
+    Gera um arquivo de usuários sintético, no formato de `INFwebNet_Data.json`.
+
+    Os jogos dos usuários são pares [jogo, plataforma], na maioria tirados do `catalogo` (e,
+    portanto, associados por `associar_jogos_usuarios`); alguns usuários têm campos vazios,
+    como no arquivo original.
+
+    Args:
+        caminho (str): Arquivo de saída.
+        quantidade (int): Quantidade de usuários.
+        catalogo (list): Pares (jogo, plataforma) existentes nas páginas.
+        semente (int): Semente do gerador aleatório.
+    """
+    aleatorio = random.Random(semente)
+    hoje = date(2024, 12, 31)
+
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("[")
+        for posicao in range(quantidade):
+            nome = aleatorio.choice(NOMES)
+            nascimento = date.fromordinal(
+                aleatorio.randint(
+                    date(1950, 1, 1).toordinal(), date(2010, 12, 31).toordinal()
+                )
+            )
+            estado = aleatorio.choice(tuple(CIDADES))
+            jogos = [
+                (
+                    list(aleatorio.choice(catalogo))
+                    if aleatorio.random() < 0.9
+                    else [f"Jogo Inexistente {aleatorio.randint(1, 999)}", "PC"]
+                )
+                for _ in range(aleatorio.randint(0, 5))
+            ]
+            usuario = {
+                "id": f"{posicao:08x}",
+                "nome": nome,
+                "sobrenome": aleatorio.choice(SOBRENOMES),
+                "email": (
+                    f"{nome.lower()}{posicao}@example.com"
+                    if aleatorio.random() < 0.9
+                    else ""
+                ),
+                "idade": float(hoje.year - nascimento.year),
+                "data de nascimento": (
+                    nascimento.isoformat() if aleatorio.random() < 0.95 else ""
+                ),
+                "cidade": aleatorio.choice(CIDADES[estado]),
+                "estado": estado if aleatorio.random() < 0.98 else "",
+                "hobbies": aleatorio.sample(HOBBIES, aleatorio.randint(0, 4)),
+                "linguagens de programação": aleatorio.sample(
+                    LINGUAGENS, aleatorio.randint(0, 5)
+                ),
+                "jogos": jogos,
+                "ano nascimento": nascimento.year,
+            }
+            arquivo.write(("," if posicao else "") + "\n    ")
+            arquivo.write(json.dumps(usuario, ensure_ascii=False))
+        arquivo.write("\n]")
+
+
+def _gravar_tabela_usuarios(df_usuarios, arquivo_banco=ARQUIVO_BANCO):
+    # A tabela 'Usuarios' consultada por `consultar_usuarios_por_jogos` (fora da medição).
+    conexao = sqlite3.connect(arquivo_banco)
+    with conexao:
+        conexao.execute("DROP TABLE IF EXISTS Usuarios")
+        conexao.execute(
+            "CREATE TABLE Usuarios (id TEXT, nome TEXT, sobrenome TEXT, jogos TEXT)"
+        )
+        conexao.executemany(
+            "INSERT INTO Usuarios VALUES (?, ?, ?, ?)",
+            (
+                (
+                    id_usuario,
+                    nome,
+                    sobrenome,
+                    json.dumps(
+                        (
+                            [list(jogo) for jogo in jogos]
+                            if isinstance(jogos, list)
+                            else []
+                        ),
+                        ensure_ascii=False,
+                    ),
+                )
+                for id_usuario, nome, sobrenome, jogos in zip(
+                    df_usuarios["id"],
+                    df_usuarios["nome"],
+                    df_usuarios["sobrenome"],
+                    df_usuarios["jogos"],
+                )
+            ),
+        )
+    conexao.close()
+
+
+def metadados():
+    """
+    Returns:
+        dict: Commit atual (se houver um repositório git), data e versões, para identificar uma
+        execução do benchmark.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+    }
+
+
+class _Medidor:
+    # Executa as etapas, guardando o tempo de cada uma; a saída delas na tela é descartada.
+    def __init__(self, escala):
+        self.escala = escala
+        self.resultados = []
+
+    def medir(self, etapa, funcao, *argumentos, linhas=None, **opcoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            valor = funcao(*argumentos, **opcoes)
+            segundos = time.perf_counter() - inicio
+
+        if linhas is None:
+            try:
+                linhas = len(valor)
+            except TypeError:
+                pass
+        self.resultados.append(
+            {
+                "escala": self.escala,
+                "etapa": etapa,
+                "segundos": segundos,
+                "linhas": linhas,
+            }
+        )
+        return valor
+
+
+def _medir_escala(escala, jogos_por_pagina, semente, consultas):
+    # As funções de main.py usam caminhos relativos: roda dentro de um diretório temporário.
+    medidor = _Medidor(escala)
+
+    nomes = nomes_jogos(jogos_por_pagina, semente)
+    caminhos = []
+    for plataforma in PLATAFORMAS:
+        caminho = f"plataforma_{plataforma.replace(' ', '_')}.html"
+        gerar_pagina_wikitable(caminho, plataforma, nomes, semente)
+        caminhos.append(caminho)
+    catalogo = [(nome, plataforma) for plataforma in PLATAFORMAS for nome in nomes]
+    gerar_usuarios("INFwebNet_Data.json", escala, catalogo, semente)
+
+    df_usuarios = medidor.medir("carregar_dados", main.carregar_dados)
+    medidor.medir("carregar_dados (tipado)", main.carregar_dados, tipado=True)
+    jogos = medidor.medir(
+        "ColunaListas.de_listas",
+        ColunaListas.de_listas,
+        df_usuarios["jogos"],
+        campos=2,
+    )
+    medidor.medir(
+        "extrair_plataformas",
+        main.extrair_plataformas,
+        df_usuarios,
+        jogos,
+        linhas=len(df_usuarios),
+    )
+
+    dados_jogos = None
+    for backend in backends_html.BACKENDS:
+        if backend == "lxml" and backends_html.lxml is None:
+            continue
+        dados_jogos = medidor.medir(
+            f"parsear_paginas ({backend})",
+            main.parsear_paginas,
+            caminhos,
+            backend,
+        )
+        medidor.resultados[-1]["linhas"] = sum(
+            len(plataforma["jogos"]) for plataforma in dados_jogos
+        )
+    linhas_catalogo = medidor.resultados[-1]["linhas"]
+
+    medidor.medir(
+        "exportar_dados_jogos",
+        main.exportar_dados_jogos,
+        dados_jogos,
+        linhas=linhas_catalogo,
+    )
+    medidor.medir(
+        "associar_jogos_usuarios",
+        main.associar_jogos_usuarios,
+        df_usuarios,
+        dados_jogos,
+        jogos=jogos,
+    )
+
+    medidor.medir(
+        "atualizar_banco_dados (substituir)",
+        main.atualizar_banco_dados,
+        dados_jogos,
+        linhas=linhas_catalogo,
+    )
+    with sqlite3.connect(ARQUIVO_BANCO) as conexao:
+        conexao.execute("DROP TABLE IF EXISTS Jogos_Plataformas")
+    conexao.close()
+    for rodada in ("inicial", "sem mudanças"):
+        medidor.medir(
+            f"atualizar_banco_dados (incremental, {rodada})",
+            main.atualizar_banco_dados,
+            dados_jogos,
+            "incremental",
+            linhas=linhas_catalogo,
+        )
+    medidor.medir("exportar_catalogo", main.exportar_catalogo, dados_jogos)
+
+    _gravar_tabela_usuarios(df_usuarios)
+    consultados = [
+        nome for nome, _ in random.Random(semente).sample(catalogo, consultas)
+    ]
+    medidor.medir(
+        "atualizar_indice_jogos_usuarios",
+        main.atualizar_indice_jogos_usuarios,
+        linhas=len(df_usuarios),
+    )
+    encontrados = medidor.medir(
+        "consultar_usuarios_por_jogos",
+        main.consultar_usuarios_por_jogos,
+        consultados,
+    )
+    medidor.resultados[-1]["linhas"] = sum(
+        len(ocorrencias) for ocorrencias in encontrados.values()
+    )
+
+    return medidor.resultados
+
+
+def executar_benchmark(
+    escalas=ESCALAS, jogos_por_pagina=JOGOS_POR_PAGINA, semente=42, consultas=100
+):
+    """
+    Mede cada etapa do pipeline do AT em dados sintéticos de vários tamanhos.
+
+    Para cada escala (quantidade de usuários), as páginas das plataformas e o arquivo de
+    usuários são gerados em um diretório temporário, e as funções de `main.py` são executadas
+    na ordem do programa, sem os downloads: carregamento, plataformas, parsing com cada
+    backend, exportação, associação, banco (substituição e sincronização incremental), catálogo
+    e índice de jogos (construção e consultas).
+
+    Args:
+        escalas (tuple): Quantidades de usuários.
+        jogos_por_pagina (int): Quantidade de jogos na tabela de cada plataforma.
+        semente (int): Semente dos geradores.
+        consultas (int): Quantidade de jogos consultados em `consultar_usuarios_por_jogos`.
+
+    Returns:
+        dict: Os `metadados`, os parâmetros e uma lista de medições (escala, etapa, segundos e
+        linhas processadas).
+    """
+    resultados = []
+    diretorio_original = os.getcwd()
+
+    for escala in escalas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                resultados.extend(
+                    _medir_escala(escala, jogos_por_pagina, semente, consultas)
+                )
+            finally:
+                # Os engines são guardados pelo caminho relativo do banco.
+                descartar_engines()
+                os.chdir(diretorio_original)
+
+    return {
+        "projeto": "renato_redoglia_DR4_AT",
+        **metadados(),
+        "semente": semente,
+        "escalas": list(escalas),
+        "jogos_por_pagina": jogos_por_pagina,
+        "resultados": resultados,
+    }
+
+
+def comparar_resultados(anterior, atual, tolerancia=0.2):
+    """
+    Compara duas execuções do benchmark, etapa a etapa.
+
+    Args:
+        anterior (dict): Resultado de uma execução anterior (ex.: de outro commit).
+        atual (dict): Resultado da execução atual.
+        tolerancia (float): Aumento relativo de tempo a partir do qual a etapa é uma regressão.
+
+    Returns:
+        list: Um dicionário por (escala, etapa) presente nas duas execuções, com os tempos, a
+        razão atual/anterior e se houve regressão.
+    """
+    tempos_anteriores = {
+        (medicao["escala"], medicao["etapa"]): medicao["segundos"]
+        for medicao in anterior["resultados"]
+    }
+
+    comparacao = []
+    for medicao in atual["resultados"]:
+        chave = (medicao["escala"], medicao["etapa"])
+        if chave not in tempos_anteriores:
+            continue
+        razao = medicao["segundos"] / max(tempos_anteriores[chave], 1e-9)
+        comparacao.append(
+            {
+                "escala": medicao["escala"],
+                "etapa": medicao["etapa"],
+                "anterior_s": tempos_anteriores[chave],
+                "atual_s": medicao["segundos"],
+                "razao": razao,
+                "regressao": razao > 1 + tolerancia,
+            }
+        )
+    return comparacao
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark das etapas do AT em dados sintéticos."
+    )
+    argumentos.add_argument(
+        "--escalas",
+        nargs="+",
+        type=int,
+        default=list(ESCALAS),
+        help="Quantidades de usuários (ex.: 1000 100000 10000000).",
+    )
+    argumentos.add_argument("--jogos-por-pagina", type=int, default=JOGOS_POR_PAGINA)
+    argumentos.add_argument("--consultas", type=int, default=100)
+    argumentos.add_argument("--semente", type=int, default=42)
+    argumentos.add_argument("--saida", default="benchmark_at.json")
+    argumentos.add_argument(
+        "--comparar",
+        metavar="ARQUIVO",
+        help="Resultado anterior (JSON) com o qual comparar esta execução.",
+    )
+    argumentos.add_argument("--tolerancia", type=float, default=0.2)
+    args = argumentos.parse_args()
+
+    resultado = executar_benchmark(
+        tuple(args.escalas), args.jogos_por_pagina, args.semente, args.consultas
+    )
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=4)
+
+    for medicao in resultado["resultados"]:
+        print(
+            f"{medicao['escala']:>10} {medicao['etapa']:<48} {medicao['segundos']:>9.3f} s"
+        )
+    print(f"\nResultados gravados em '{args.saida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        for item in comparar_resultados(anterior, resultado, args.tolerancia):
+            marca = "  REGRESSÃO" if item["regressao"] else ""
+            print(
+                f"{item['escala']:>10} {item['etapa']:<48} {item['anterior_s']:>9.3f} s -> "
+                f"{item['atual_s']:>9.3f} s ({item['razao']:.2f}x){marca}"
+            )
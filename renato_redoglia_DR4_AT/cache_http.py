@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+
+
+class CacheHTTP:
+    """
+    Cache HTTP em disco, indexado por URL, baseado em GET condicional.
+
+    Para cada URL é guardado o arquivo salvo e os cabeçalhos ETag e Last-Modified da última
+    resposta. Nas requisições seguintes são enviados If-None-Match/If-Modified-Since; uma
+    resposta 304 conta como acerto e o arquivo já salvo é reutilizado sem ser reescrito.
+    """
+
+    def __init__(self, arquivo_indice="cache_http.json"):
+        """
+        Args:
+            arquivo_indice (str): Arquivo JSON com o índice URL -> arquivo, ETag e Last-Modified.
+        """
+        self.arquivo_indice = arquivo_indice
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+
+        try:
+            with open(arquivo_indice, encoding="utf-8") as f:
+                self.entradas = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entradas = {}
+
+    def cabecalhos_condicionais(self, url):
+        """
+        Monta os cabeçalhos de GET condicional para uma URL já vista.
+
+        Args:
+            url (str): A URL a ser requisitada.
+
+        Returns:
+            dict: Os cabeçalhos If-None-Match/If-Modified-Since, ou um dicionário vazio se a URL
+            não estiver no cache ou se o arquivo salvo não existir mais.
+        """
+        with self._trava:
+            entrada = self.entradas.get(url)
+
+        if not entrada or not os.path.exists(entrada["arquivo"]):
+            return {}
+
+        cabecalhos = {}
+        if entrada.get("etag"):
+            cabecalhos["If-None-Match"] = entrada["etag"]
+        if entrada.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+        return cabecalhos
+
+    def registrar_acerto(self, url):
+        """
+        Contabiliza uma resposta 304 e retorna o arquivo salvo para a URL.
+
+        Args:
+            url (str): A URL que respondeu 304.
+
+        Returns:
+            str: O caminho do arquivo já salvo.
+        """
+        with self._trava:
+            self.acertos += 1
+            return self.entradas[url]["arquivo"]
+
+    def registrar_falha(self, url, arquivo, cabecalhos_resposta):
+        """
+        Contabiliza uma resposta completa e guarda seus validadores para a próxima execução.
+
+        Args:
+            url (str): A URL baixada.
+            arquivo (str): O arquivo onde o corpo da resposta foi salvo.
+            cabecalhos_resposta: Os cabeçalhos da resposta (ETag e Last-Modified são lidos).
+        """
+        with self._trava:
+            self.falhas += 1
+            self.entradas[url] = {
+                "arquivo": arquivo,
+                "etag": cabecalhos_resposta.get("ETag"),
+                "last_modified": cabecalhos_resposta.get("Last-Modified"),
+            }
+
+    def salvar(self):
+        """
+        Grava o índice do cache em disco de forma atômica.
+        """
+        with self._trava:
+            arquivo_temporario = f"{self.arquivo_indice}.tmp"
+            with open(arquivo_temporario, "w", encoding="utf-8") as f:
+                json.dump(self.entradas, f, ensure_ascii=False, indent=4)
+            os.replace(arquivo_temporario, self.arquivo_indice)
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: As quantidades de acertos e falhas do cache nesta execução.
+        """
+        with self._trava:
+            return {"acertos": self.acertos, "falhas": self.falhas}
@@ -0,0 +1,109 @@
+import argparse
+import glob
+import hashlib
+import os
+import pickle
+
+from backends_html import VERSAO_EXTRACAO
+
+
+class CacheParse:
+    """
+    Cache em disco dos resultados do parsing das páginas de plataformas.
+
+    Cada entrada é indexada pelo hash SHA-256 do conteúdo do arquivo HTML e pela versão da
+    extração (`VERSAO_EXTRACAO`), e guarda o título da página e a lista de jogos em pickle.
+    Páginas que não mudaram são lidas do cache sem passar pelo parser.
+    """
+
+    def __init__(self, diretorio=".cache_parse"):
+        """
+        Args:
+            diretorio (str): Diretório onde as entradas do cache são gravadas.
+        """
+        self.diretorio = diretorio
+
+    def chave(self, conteudo):
+        """
+        Args:
+            conteudo (bytes): O conteúdo bruto do arquivo HTML.
+
+        Returns:
+            str: A chave da entrada para esse conteúdo na versão atual da extração.
+        """
+        return f"{hashlib.sha256(conteudo).hexdigest()}-v{VERSAO_EXTRACAO}"
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.pickle")
+
+    def obter(self, chave):
+        """
+        Args:
+            chave (str): Chave retornada por `chave`.
+
+        Returns:
+            tuple: O título da página e a lista de jogos, ou None se a entrada não existir.
+        """
+        try:
+            with open(self._caminho(chave), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def guardar(self, chave, titulo, jogos):
+        """
+        Grava uma entrada de forma atômica, de modo que processos paralelos possam compartilhar o cache.
+
+        Args:
+            chave (str): Chave retornada por `chave`.
+            titulo (str): O título da página.
+            jogos (list): A lista de jogos extraída.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        caminho = self._caminho(chave)
+        arquivo_temporario = f"{caminho}.{os.getpid()}.tmp"
+        try:
+            with open(arquivo_temporario, "wb") as f:
+                pickle.dump((titulo, jogos), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(arquivo_temporario, caminho)
+        finally:
+            if os.path.exists(arquivo_temporario):
+                os.remove(arquivo_temporario)
+
+    def invalidar(self):
+        """
+        Remove todas as entradas do cache.
+
+        Returns:
+            int: A quantidade de entradas removidas.
+        """
+        removidas = 0
+        for caminho in glob.glob(os.path.join(self.diretorio, "*.pickle")):
+            os.remove(caminho)
+            removidas += 1
+        return removidas
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Gerencia o cache do parsing das páginas de plataformas."
+    )
+    argumentos.add_argument("--diretorio", default=".cache_parse")
+    argumentos.add_argument(
+        "--invalidar",
+        action="store_true",
+        help="Remove todas as entradas do cache.",
+    )
+    args = argumentos.parse_args()
+
+    cache = CacheParse(args.diretorio)
+
+    if args.invalidar:
+        print(f"{cache.invalidar()} entrada(s) removida(s) de '{args.diretorio}'.")
+    else:
+        entradas = glob.glob(os.path.join(args.diretorio, "*.pickle"))
+        tamanho = sum(os.path.getsize(entrada) for entrada in entradas)
+        print(
+            f"{len(entradas)} entrada(s) em '{args.diretorio}' ({tamanho / 1024:.1f} KiB)."
+        )
@@ -0,0 +1,306 @@
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import get_context
+
+import pandas as pd
+
+VALOR_PADRAO = "Não Informado"
+
+# Tipo de cada coluna dos usuários. Colunas de texto ("object" ou "category") ausentes ou vazias
+# recebem VALOR_PADRAO; as numéricas e de data ficam nulas (pd.NA / NaT) e as de lista, vazias.
+ESQUEMA_USUARIOS = {
+    "id": "object",
+    "nome": "object",
+    "sobrenome": "object",
+    "email": "object",
+    "idade": "Int16",
+    "data de nascimento": "datetime64[ns]",
+    "cidade": "category",
+    "estado": "category",
+    "hobbies": "list",
+    "linguagens de programação": "list",
+    "jogos": "list",
+    "ano nascimento": "Int16",
+}
+
+_DECODIFICADOR = json.JSONDecoder()
+
+
+@contextmanager
+def _coleta_pausada():
+    # A decodificação cria milhões de dicts e listas de uma vez; com o coletor de lixo ligado,
+    # cada geração cheia dispara uma varredura de todos esses objetos (nenhum deles é lixo).
+    estava_ligado = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if estava_ligado:
+            gc.enable()
+
+
+def ler_registros_json(arquivo, tamanho_bloco=1 << 20):
+    """
+    Lê os objetos de um arquivo JSON um a um, sem carregar o arquivo inteiro em memória.
+
+    Aceita tanto uma lista JSON (`[{...}, {...}]`) quanto um objeto por linha (JSON Lines).
+    O arquivo é lido em blocos e cada objeto é decodificado com `JSONDecoder.raw_decode`
+    assim que estiver completo no buffer.
+
+    Args:
+        arquivo (str): Caminho do arquivo.
+        tamanho_bloco (int): Quantidade de caracteres lidos por vez.
+
+    Yields:
+        dict: Cada registro do arquivo.
+
+    Raises:
+        json.JSONDecodeError: Se o arquivo não for JSON válido.
+    """
+    with open(arquivo, encoding="utf-8") as f:
+        buffer = ""
+        posicao = 0
+        fim_arquivo = False
+        dentro_lista = None
+
+        while True:
+            # Pula espaços e separadores entre os registros.
+            while posicao < len(buffer) and buffer[posicao] in " \t\r\n,":
+                posicao += 1
+
+            if posicao < len(buffer):
+                if dentro_lista is None:
+                    dentro_lista = buffer[posicao] == "["
+                    if dentro_lista:
+                        posicao += 1
+                        continue
+
+                if dentro_lista and buffer[posicao] == "]":
+                    return
+
+                try:
+                    registro, posicao = _DECODIFICADOR.raw_decode(buffer, posicao)
+                    yield registro
+                    continue
+                except json.JSONDecodeError:
+                    # Registro incompleto no buffer: lê mais um bloco, a menos que o arquivo
+                    # tenha acabado (nesse caso o JSON é inválido).
+                    if fim_arquivo:
+                        raise
+
+            elif fim_arquivo:
+                if dentro_lista:
+                    raise json.JSONDecodeError(
+                        "Lista JSON não terminada", buffer, posicao
+                    )
+                return
+
+            bloco = f.read(tamanho_bloco)
+            fim_arquivo = not bloco
+            buffer = buffer[posicao:] + bloco
+            posicao = 0
+
+
+def aplicar_esquema(df, esquema=ESQUEMA_USUARIOS):
+    """
+    Converte um DataFrame de registros brutos para os tipos do esquema e preenche os padrões.
+
+    Os padrões das colunas de texto são preenchidos de uma só vez, sobre o bloco de colunas de
+    texto inteiro; colunas do esquema ausentes no arquivo são criadas já com o padrão.
+
+    Args:
+        df (pd.DataFrame): DataFrame montado a partir dos registros do arquivo.
+        esquema (dict): Coluna -> tipo ("object", "category", "Int16", "datetime64[ns]", "list").
+
+    Returns:
+        pd.DataFrame: Um novo DataFrame com as colunas do esquema, na ordem do esquema, seguidas
+        das colunas extras do arquivo.
+    """
+    df = df.reindex(columns=[*esquema, *(c for c in df.columns if c not in esquema)])
+
+    texto = [c for c, tipo in esquema.items() if tipo in ("object", "category")]
+    valores_texto = df[texto]
+    df[texto] = valores_texto.mask(
+        valores_texto.isna() | (valores_texto == ""), VALOR_PADRAO
+    )
+
+    for coluna, tipo in esquema.items():
+        if tipo == "category":
+            df[coluna] = df[coluna].astype("category")
+        elif tipo == "list":
+            # Valores ausentes viram listas vazias novas (nunca a mesma lista compartilhada).
+            if df[coluna].isna().any():
+                df[coluna] = [
+                    valor if isinstance(valor, list) else [] for valor in df[coluna]
+                ]
+        elif tipo.startswith("datetime"):
+            df[coluna] = pd.to_datetime(df[coluna], errors="coerce", format="%Y-%m-%d")
+        elif tipo != "object":
+            df[coluna] = pd.to_numeric(df[coluna], errors="coerce").astype(tipo)
+
+    return df
+
+
+def iterar_usuarios(arquivo, linhas_por_lote=20_000, esquema=ESQUEMA_USUARIOS):
+    """
+    Lê um arquivo de usuários em lotes já tipados, para arquivos maiores que a memória.
+
+    Args:
+        arquivo (str): Arquivo JSON (lista ou JSON Lines).
+        linhas_por_lote (int): Quantidade de usuários por DataFrame.
+        esquema (dict): Esquema aplicado a cada lote (ver `aplicar_esquema`).
+
+    Yields:
+        pd.DataFrame: Um lote de usuários.
+    """
+    registros = ler_registros_json(arquivo)
+
+    while True:
+        with _coleta_pausada():
+            lote = list(islice(registros, linhas_por_lote))
+            if not lote:
+                return
+            df = aplicar_esquema(pd.DataFrame.from_records(lote), esquema)
+        yield df
+
+
+def carregar_usuarios(arquivo, linhas_por_lote=20_000, esquema=ESQUEMA_USUARIOS):
+    """
+    Carrega um arquivo de usuários inteiro com os tipos do esquema.
+
+    Args:
+        arquivo (str): Arquivo JSON (lista ou JSON Lines).
+        linhas_por_lote (int): Tamanho dos lotes usados na leitura.
+        esquema (dict): Esquema dos usuários (ver `aplicar_esquema`).
+
+    Returns:
+        pd.DataFrame: Os usuários, com índice de 0 a n-1.
+    """
+    lotes = list(iterar_usuarios(arquivo, linhas_por_lote, esquema))
+    if not lotes:
+        return aplicar_esquema(pd.DataFrame(), esquema)
+    if len(lotes) == 1:
+        return lotes[0]
+
+    df = pd.concat(lotes, ignore_index=True)
+    # Lotes com categorias diferentes são concatenados como object; volta para category.
+    for coluna, tipo in esquema.items():
+        if tipo == "category":
+            df[coluna] = df[coluna].astype("category")
+    return df
+
+
+def _gerar_usuarios_sinteticos(arquivo_base, arquivo_saida, quantidade, semente):
+    with open(arquivo_base, encoding="utf-8") as f:
+        base = json.load(f)
+
+    aleatorio = random.Random(semente)
+    with open(arquivo_saida, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for posicao in range(quantidade):
+            usuario = dict(aleatorio.choice(base))
+            usuario["id"] = f"{posicao:08x}"
+            if aleatorio.random() < 0.1:
+                usuario["email"] = ""
+            f.write(("," if posicao else "") + json.dumps(usuario, ensure_ascii=False))
+        f.write("\n]")
+
+
+def _medir_carregamento(carregador, arquivo):
+    # Executado em um processo novo: o pico de RSS (ru_maxrss) é do processo inteiro, então a
+    # diferença para o valor antes da carga é o custo da carga.
+    import resource
+
+    if carregador == "original":
+        from main import carregar_dados
+
+        def carregar():
+            return len(carregar_dados(arquivo))
+
+    elif carregador == "esquema":
+
+        def carregar():
+            return len(carregar_usuarios(arquivo))
+
+    else:
+
+        def carregar():
+            return sum(len(lote) for lote in iterar_usuarios(arquivo))
+
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    linhas = carregar()
+    segundos = time.perf_counter() - inicio
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "carregador": carregador,
+        "linhas": linhas,
+        "segundos": segundos,
+        "pico_rss_mb": (rss_pico - rss_inicial) / 1024,
+    }
+
+
+def benchmark_carregamento(
+    quantidades_usuarios=(10_000, 100_000, 500_000),
+    arquivo_base="INFwebNet_Data.json",
+    semente=42,
+):
+    """
+    Compara `carregar_dados` com o carregador tipado e com a leitura em lotes.
+
+    Cada medição roda em um processo novo, para que o pico de RSS de uma não afete a outra.
+
+    Args:
+        quantidades_usuarios (tuple): Quantidades de usuários dos arquivos sintéticos.
+        arquivo_base (str): Arquivo de onde os usuários sintéticos são sorteados.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list: Um dicionário por (quantidade, carregador) com o tempo e o pico de RSS adicional.
+    """
+    resultados = []
+
+    for quantidade in quantidades_usuarios:
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "usuarios.json")
+            _gerar_usuarios_sinteticos(arquivo_base, arquivo, quantidade, semente)
+            megabytes = os.path.getsize(arquivo) / (1024 * 1024)
+
+            for carregador in ("original", "esquema", "lotes"):
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=get_context("spawn")
+                ) as executor:
+                    medicao = executor.submit(
+                        _medir_carregamento, carregador, arquivo
+                    ).result()
+
+                medicao.update({"usuarios": quantidade, "megabytes": megabytes})
+                resultados.append(medicao)
+
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark do carregamento dos dados de usuários."
+    )
+    argumentos.add_argument(
+        "--usuarios", nargs="+", type=int, default=[10_000, 100_000, 500_000]
+    )
+    args = argumentos.parse_args()
+
+    for resultado in benchmark_carregamento(args.usuarios):
+        print(
+            f"{resultado['usuarios']:>8} usuários ({resultado['megabytes']:.1f} MB)  "
+            f"{resultado['carregador']:<9} {resultado['segundos']:>7.2f} s  "
+            f"pico de RSS +{resultado['pico_rss_mb']:.0f} MB"
+        )
@@ -0,0 +1,415 @@
+import argparse
+import json
+
+import pandas as pd
+
+from banco import obter_engine, transacao_sqlite
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+TABELA_CATALOGO = "Catalogo_Jogos"
+ARQUIVO_PARQUET = "catalogo_jogos.parquet"
+
+# Cada coluna tipada do catálogo é preenchida com o primeiro cabeçalho presente (e não vazio)
+# dentre os usados nas wikitables das plataformas.
+CABECALHOS_TEXTO = {
+    "titulo": ["Jogo", "Título"],
+    "desenvolvedor": [
+        "Desenvolvedor(es)",
+        "Desenvolvedor",
+        "Desenvolvedora",
+        "Desenvolvedor/Publicador",
+        "Desenvolvedor\\Editora",
+    ],
+    "publicadora": [
+        "Publicador",
+        "Publicadora",
+        "Desenvolvedor/Publicador",
+        "Desenvolvedor\\Editora",
+    ],
+    "exclusividade": ["Exclusivo"],
+}
+CABECALHOS_LANCAMENTO = ["Lançamento inicial", "Lançamento", "Ano"]
+CABECALHOS_REGIOES = {
+    "ano_japao": ["Japão"],
+    "ano_europa": ["Europa"],
+    "ano_america_norte": ["América do Norte", "América Do Norte"],
+    "ano_brasil": ["Brasil"],
+}
+CABECALHOS_ANO_ORIGINAL = ["Lanç. Original"]
+
+# "Janeiro", "jan", "Fev", "março"...: as três primeiras letras identificam o mês.
+MESES = {
+    mes: numero
+    for numero, mes in enumerate(
+        [
+            "jan",
+            "fev",
+            "mar",
+            "abr",
+            "mai",
+            "jun",
+            "jul",
+            "ago",
+            "set",
+            "out",
+            "nov",
+            "dez",
+        ],
+        start=1,
+    )
+}
+
+COLUNAS_CATALOGO = {
+    "plataforma": "TEXT NOT NULL",
+    "nome_jogo": "TEXT NOT NULL",
+    "titulo": "TEXT",
+    "desenvolvedor": "TEXT COLLATE NOCASE",
+    "publicadora": "TEXT COLLATE NOCASE",
+    "exclusividade": "TEXT",
+    "exclusivo": "INTEGER",
+    "data_lancamento": "TEXT",
+    "ano_lancamento": "INTEGER",
+    "ano_japao": "INTEGER",
+    "ano_europa": "INTEGER",
+    "ano_america_norte": "INTEGER",
+    "ano_brasil": "INTEGER",
+    "ano_original": "INTEGER",
+    "outros_campos": "TEXT",
+}
+
+INDICES_CATALOGO = {
+    "idx_catalogo_plataforma_exclusivo_ano": "(plataforma, exclusivo, ano_lancamento)",
+    "idx_catalogo_ano": "(ano_lancamento)",
+    "idx_catalogo_desenvolvedor": "(desenvolvedor)",
+}
+
+
+def _coalescer(brutos, cabecalhos):
+    coluna = pd.Series(pd.NA, index=brutos.index, dtype="string")
+    for cabecalho in cabecalhos:
+        if cabecalho in brutos.columns:
+            valores = brutos[cabecalho].astype("string").str.strip().replace("", pd.NA)
+            coluna = coluna.fillna(valores)
+    return coluna
+
+
+def _extrair_ano(texto):
+    return pd.to_numeric(
+        texto.str.extract(r"\b((?:19|20)\d{2})\b", expand=False), errors="coerce"
+    ).astype("Int16")
+
+
+def _extrair_data(texto):
+    # Formatos encontrados: "2008-11-18AN:18 de novembro de 2008", "05/Set/2019" e
+    # "23 de março de 2007".
+    iso = texto.str.extract(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+    barra = texto.str.extract(r"^(\d{1,2})/([A-Za-zç]{3})/(\d{4})")
+    extenso = texto.str.extract(r"(\d{1,2}) de ([A-Za-zç]+) de (\d{4})")
+
+    def mes(nomes):
+        return nomes.str.lower().str[:3].map(MESES)
+
+    partes = pd.DataFrame(
+        {
+            "year": iso[0].fillna(barra[2]).fillna(extenso[2]),
+            "month": iso[1].astype(float).fillna(mes(barra[1])).fillna(mes(extenso[1])),
+            "day": iso[2].fillna(barra[0]).fillna(extenso[0]),
+        }
+    ).apply(pd.to_numeric, errors="coerce")
+
+    completas = partes.notna().all(axis=1)
+    datas = pd.to_datetime(partes.fillna(1).astype(int), errors="coerce")
+    return datas.where(completas)
+
+
+def montar_catalogo(dados_jogos_extraidos):
+    """
+    Converte os jogos extraídos em um DataFrame com uma coluna tipada por campo do catálogo.
+
+    Os cabeçalhos das wikitables (que mudam de uma plataforma para outra) são unificados em
+    colunas como 'desenvolvedor', 'exclusivo' (booleano), 'data_lancamento' (data) e
+    'ano_lancamento' e anos por região (inteiros). Cabeçalhos sem coluna correspondente ficam
+    em 'outros_campos', em JSON.
+
+    Args:
+        dados_jogos_extraidos (list): Lista de dicionários com os jogos extraídos por plataforma.
+
+    Returns:
+        pd.DataFrame: Uma linha por jogo de cada plataforma.
+    """
+    plataformas = []
+    nomes_jogos = []
+    dados_jogos = []
+    for plataforma in dados_jogos_extraidos:
+        for jogo in plataforma["jogos"]:
+            plataformas.append(plataforma["plataforma"])
+            nomes_jogos.append(jogo["nome_jogo"])
+            dados_jogos.append(jogo["dados_jogo"])
+
+    brutos = pd.DataFrame.from_records(dados_jogos)
+    catalogo = pd.DataFrame(
+        {
+            "plataforma": pd.Categorical(plataformas),
+            "nome_jogo": pd.array(nomes_jogos, dtype="string"),
+        }
+    )
+
+    for coluna, cabecalhos in CABECALHOS_TEXTO.items():
+        catalogo[coluna] = _coalescer(brutos, cabecalhos)
+
+    exclusividade = catalogo["exclusividade"].str.lower()
+    catalogo["exclusivo"] = (exclusividade != "não").astype("boolean")
+
+    lancamento = _coalescer(brutos, CABECALHOS_LANCAMENTO)
+    catalogo["data_lancamento"] = _extrair_data(lancamento)
+
+    for coluna, cabecalhos in CABECALHOS_REGIOES.items():
+        catalogo[coluna] = _extrair_ano(_coalescer(brutos, cabecalhos))
+    catalogo["ano_original"] = _extrair_ano(_coalescer(brutos, CABECALHOS_ANO_ORIGINAL))
+
+    # Sem lançamento geral (caso das tabelas do PlayStation 4), vale o ano regional mais antigo.
+    catalogo["ano_lancamento"] = (
+        _extrair_ano(lancamento)
+        .fillna(catalogo[list(CABECALHOS_REGIOES)].min(axis=1, skipna=True))
+        .astype("Int16")
+    )
+
+    mapeados = set(CABECALHOS_LANCAMENTO + CABECALHOS_ANO_ORIGINAL)
+    for cabecalhos in (*CABECALHOS_TEXTO.values(), *CABECALHOS_REGIOES.values()):
+        mapeados.update(cabecalhos)
+    outros = brutos.drop(columns=[c for c in brutos.columns if c in mapeados])
+    catalogo["outros_campos"] = pd.array(
+        [
+            json.dumps(
+                {
+                    campo: valor
+                    for campo, valor in linha.items()
+                    if isinstance(valor, str)
+                },
+                ensure_ascii=False,
+            )
+            # Sem colunas, `to_dict("records")` devolve uma lista vazia, não um dict por linha.
+            for linha in (
+                outros.to_dict("records") if len(outros.columns) else [{}] * len(outros)
+            )
+        ],
+        dtype="string",
+    )
+
+    return catalogo[list(COLUNAS_CATALOGO)]
+
+
+def gravar_catalogo_sqlite(catalogo, engine=None):
+    """
+    Recria a tabela 'Catalogo_Jogos' com colunas tipadas e índices, em uma única transação.
+
+    Args:
+        catalogo (pd.DataFrame): Catálogo retornado por `montar_catalogo`.
+        engine (sqlalchemy.Engine, optional): Engine do banco; por padrão, o engine compartilhado.
+
+    Returns:
+        int: A quantidade de linhas gravadas.
+    """
+    engine = engine or obter_engine()
+
+    linhas = catalogo.astype(object).where(catalogo.notna(), None)
+    linhas["data_lancamento"] = [
+        None if data is None else data.date().isoformat()
+        for data in linhas["data_lancamento"]
+    ]
+    linhas["exclusivo"] = [
+        None if valor is None else int(valor) for valor in linhas["exclusivo"]
+    ]
+
+    definicao = ", ".join(
+        f"{coluna} {tipo}" for coluna, tipo in COLUNAS_CATALOGO.items()
+    )
+    marcadores = ", ".join("?" for _ in COLUNAS_CATALOGO)
+
+    with transacao_sqlite(engine) as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABELA_CATALOGO}")
+        cursor.execute(f"CREATE TABLE {TABELA_CATALOGO} ({definicao})")
+        cursor.executemany(
+            f"INSERT INTO {TABELA_CATALOGO} VALUES ({marcadores})",
+            linhas.itertuples(index=False, name=None),
+        )
+        for nome, colunas in INDICES_CATALOGO.items():
+            cursor.execute(f"CREATE INDEX {nome} ON {TABELA_CATALOGO} {colunas}")
+
+    return len(linhas)
+
+
+def _exigir_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "A exportação para Parquet requer o pacote 'pyarrow' (pip install pyarrow)."
+        )
+
+
+def gravar_catalogo_parquet(catalogo, arquivo=ARQUIVO_PARQUET, linhas_por_grupo=1024):
+    """
+    Grava o catálogo em Parquet, ordenado por plataforma e ano de lançamento.
+
+    A ordenação faz com que cada row group cubra poucas plataformas e anos, e as estatísticas
+    de mínimo/máximo de cada grupo permitem pular grupos inteiros na leitura com filtro.
+
+    Args:
+        catalogo (pd.DataFrame): Catálogo retornado por `montar_catalogo`.
+        arquivo (str): Caminho do arquivo Parquet.
+        linhas_por_grupo (int): Quantidade de linhas por row group.
+
+    Raises:
+        ImportError: Se o pyarrow não estiver instalado.
+    """
+    _exigir_pyarrow()
+
+    ordenado = catalogo.sort_values(
+        ["plataforma", "ano_lancamento"], na_position="last", kind="stable"
+    )
+    tabela = pa.Table.from_pandas(ordenado, preserve_index=False)
+    pq.write_table(tabela, arquivo, row_group_size=linhas_por_grupo)
+
+
+def exportar_catalogo(
+    dados_jogos_extraidos, engine=None, arquivo_parquet=ARQUIVO_PARQUET
+):
+    """
+    Monta o catálogo tipado e o grava no SQLite e, se o pyarrow estiver instalado, em Parquet.
+
+    Args:
+        dados_jogos_extraidos (list): Lista de dicionários com os jogos extraídos por plataforma.
+        engine (sqlalchemy.Engine, optional): Engine do banco; por padrão, o engine compartilhado.
+        arquivo_parquet (str, optional): Arquivo Parquet; None desativa a exportação Parquet.
+
+    Returns:
+        pd.DataFrame: O catálogo montado.
+    """
+    catalogo = montar_catalogo(dados_jogos_extraidos)
+
+    linhas = gravar_catalogo_sqlite(catalogo, engine)
+    print(f"Tabela '{TABELA_CATALOGO}' gravada com {linhas} jogos.")
+
+    if arquivo_parquet is not None:
+        if pa is None:
+            print("pyarrow não instalado: exportação para Parquet ignorada.")
+        else:
+            gravar_catalogo_parquet(catalogo, arquivo_parquet)
+            print(f"Catálogo exportado para '{arquivo_parquet}'.")
+
+    return catalogo
+
+
+def consultar_catalogo_sqlite(
+    conn, plataforma=None, exclusivo=None, ano_lancamento=None, desenvolvedor=None
+):
+    """
+    Filtra a tabela 'Catalogo_Jogos' pelas colunas tipadas (filtros None são ignorados).
+
+    Args:
+        conn (sqlalchemy.Connection): Conexão aberta com o banco.
+        plataforma (str, optional): Nome exato da plataforma.
+        exclusivo (bool, optional): Se o jogo é exclusivo.
+        ano_lancamento (int, optional): Ano de lançamento.
+        desenvolvedor (str, optional): Desenvolvedor (sem diferenciar maiúsculas).
+
+    Returns:
+        pd.DataFrame: Os jogos encontrados.
+    """
+    condicoes = []
+    parametros = {}
+    for coluna, valor in (
+        ("plataforma", plataforma),
+        ("exclusivo", None if exclusivo is None else int(exclusivo)),
+        ("ano_lancamento", ano_lancamento),
+        ("desenvolvedor", desenvolvedor),
+    ):
+        if valor is not None:
+            condicoes.append(f"{coluna} = :{coluna}")
+            parametros[coluna] = valor
+
+    consulta = f"SELECT * FROM {TABELA_CATALOGO}"
+    if condicoes:
+        consulta += " WHERE " + " AND ".join(condicoes)
+
+    return pd.read_sql_query(consulta, conn, params=parametros)
+
+
+def consultar_catalogo_parquet(
+    arquivo=ARQUIVO_PARQUET,
+    plataforma=None,
+    exclusivo=None,
+    ano_lancamento=None,
+    desenvolvedor=None,
+    colunas=None,
+):
+    """
+    Filtra o catálogo em Parquet com predicate pushdown (filtros None são ignorados).
+
+    O filtro é repassado ao leitor do pyarrow, que descarta row groups pelas estatísticas e só
+    decodifica as colunas pedidas.
+
+    Args:
+        arquivo (str): Caminho do arquivo Parquet.
+        plataforma (str, optional): Nome exato da plataforma.
+        exclusivo (bool, optional): Se o jogo é exclusivo.
+        ano_lancamento (int, optional): Ano de lançamento.
+        desenvolvedor (str, optional): Nome exato do desenvolvedor.
+        colunas (list, optional): Colunas a ler; por padrão, todas.
+
+    Returns:
+        pd.DataFrame: Os jogos encontrados.
+
+    Raises:
+        ImportError: Se o pyarrow não estiver instalado.
+    """
+    _exigir_pyarrow()
+
+    filtro = None
+    for coluna, valor in (
+        ("plataforma", plataforma),
+        ("exclusivo", exclusivo),
+        ("ano_lancamento", ano_lancamento),
+        ("desenvolvedor", desenvolvedor),
+    ):
+        if valor is not None:
+            condicao = ds.field(coluna) == valor
+            filtro = condicao if filtro is None else filtro & condicao
+
+    return (
+        ds.dataset(arquivo, format="parquet")
+        .to_table(columns=colunas, filter=filtro)
+        .to_pandas()
+    )
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Exporta e consulta o catálogo tipado de jogos."
+    )
+    argumentos.add_argument("--dados", default="dados_jogos_plataformas.json")
+    argumentos.add_argument("--parquet", default=ARQUIVO_PARQUET)
+    argumentos.add_argument("--plataforma")
+    argumentos.add_argument("--exclusivo", choices=["sim", "nao"])
+    argumentos.add_argument("--ano", type=int)
+    args = argumentos.parse_args()
+
+    if args.plataforma or args.exclusivo or args.ano:
+        exclusivo = None if args.exclusivo is None else args.exclusivo == "sim"
+        print(
+            consultar_catalogo_parquet(
+                args.parquet,
+                plataforma=args.plataforma,
+                exclusivo=exclusivo,
+                ano_lancamento=args.ano,
+                colunas=["plataforma", "nome_jogo", "desenvolvedor", "ano_lancamento"],
+            ).to_string()
+        )
+    else:
+        with open(args.dados, encoding="utf-8") as f:
+            exportar_catalogo(json.load(f), arquivo_parquet=args.parquet)
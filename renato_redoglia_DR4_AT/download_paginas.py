@@ -0,0 +1,282 @@
+import gzip
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+URL_BASE_WIKIPEDIA = "https://pt.wikipedia.org/wiki/"
+
+USER_AGENT = "INFwebNet/1.0 (projeto acadêmico; urllib/http.client)"
+
+MAXIMO_REDIRECIONAMENTOS = 5
+
+
+class ErroHTTP(Exception):
+    """
+    Exceção para respostas HTTP sem sucesso após esgotar as tentativas.
+    """
+
+    def __init__(self, code, reason):
+        self.code = code
+        self.reason = reason
+        super().__init__(f"{code} - {reason}")
+
+
+class ErroConexao(Exception):
+    """
+    Exceção para falhas de rede (conexão recusada, timeout, DNS) após esgotar as tentativas.
+    """
+
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__(str(reason))
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP com conexões keep-alive reutilizadas por host, timeout e novas tentativas.
+
+    Cada thread mantém suas próprias conexões (uma por host), pois `http.client` não é
+    thread-safe. Respostas 5xx e falhas de rede são repetidas com backoff exponencial.
+    """
+
+    def __init__(self, timeout=30, tentativas=3, backoff=0.5):
+        """
+        Args:
+            timeout (float): Timeout, em segundos, de cada requisição.
+            tentativas (int): Quantidade máxima de tentativas por URL.
+            backoff (float): Espera inicial, em segundos, entre tentativas; dobra a cada nova tentativa.
+
+        Raises:
+            ValueError: Se `tentativas` for menor que 1.
+        """
+        if tentativas < 1:
+            raise ValueError(
+                f"A quantidade de tentativas precisa ser pelo menos 1 (recebido: {tentativas})."
+            )
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self._local = threading.local()
+        self._todas_conexoes = []
+        self._trava = threading.Lock()
+
+    def _conexao(self, esquema, host):
+        conexoes = getattr(self._local, "conexoes", None)
+        if conexoes is None:
+            conexoes = self._local.conexoes = {}
+
+        chave = (esquema, host)
+        if chave not in conexoes:
+            classe = (
+                http.client.HTTPSConnection
+                if esquema == "https"
+                else http.client.HTTPConnection
+            )
+            conexoes[chave] = classe(host, timeout=self.timeout)
+            with self._trava:
+                self._todas_conexoes.append(conexoes[chave])
+
+        return conexoes[chave]
+
+    def _descartar_conexao(self, esquema, host):
+        conexao = self._local.conexoes.pop((esquema, host), None)
+        if conexao is not None:
+            conexao.close()
+
+    def _requisitar(self, url, cabecalhos):
+        partes = urlsplit(url)
+        caminho = partes.path or "/"
+        if partes.query:
+            caminho = f"{caminho}?{partes.query}"
+
+        conexao = self._conexao(partes.scheme, partes.netloc)
+        try:
+            conexao.request("GET", caminho, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            corpo = resposta.read()
+        except (http.client.HTTPException, OSError):
+            self._descartar_conexao(partes.scheme, partes.netloc)
+            raise
+
+        if resposta.will_close:
+            self._descartar_conexao(partes.scheme, partes.netloc)
+
+        if resposta.getheader("Content-Encoding", "").lower() == "gzip":
+            corpo = gzip.decompress(corpo)
+
+        return resposta.status, resposta.reason, resposta.headers, corpo
+
+    def obter(self, url, cabecalhos=None):
+        """
+        Faz um GET, seguindo redirecionamentos e repetindo respostas 5xx e falhas de rede.
+
+        Args:
+            url (str): A URL a baixar.
+            cabecalhos (dict, optional): Cabeçalhos extras da requisição.
+
+        Returns:
+            tuple: O status HTTP, os cabeçalhos da resposta e o corpo em bytes. Respostas 2xx e 304
+            são devolvidas normalmente.
+
+        Raises:
+            ErroHTTP: Para respostas 4xx, ou 5xx depois de esgotar as tentativas.
+            ErroConexao: Para falhas de rede depois de esgotar as tentativas.
+        """
+        cabecalhos = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "gzip",
+            **(cabecalhos or {}),
+        }
+
+        for tentativa in range(self.tentativas):
+            if tentativa:
+                time.sleep(self.backoff * 2 ** (tentativa - 1))
+
+            url_atual = url
+            try:
+                for _ in range(MAXIMO_REDIRECIONAMENTOS + 1):
+                    status, reason, headers, corpo = self._requisitar(
+                        url_atual, cabecalhos
+                    )
+                    if status in (301, 302, 303, 307, 308) and headers.get("Location"):
+                        url_atual = urljoin(url_atual, headers["Location"])
+                        continue
+                    break
+            except (http.client.HTTPException, OSError) as e:
+                erro = ErroConexao(e)
+                continue
+
+            if status >= 500:
+                erro = ErroHTTP(status, reason)
+                continue
+            if status >= 400 or status in (301, 302, 303, 307, 308):
+                raise ErroHTTP(status, reason)
+
+            return status, headers, corpo
+
+        raise erro
+
+    def fechar(self):
+        """
+        Fecha todas as conexões abertas por todas as threads.
+        """
+        with self._trava:
+            for conexao in self._todas_conexoes:
+                conexao.close()
+            self._todas_conexoes = []
+
+
+def url_pagina_plataforma(plataforma, url_base=URL_BASE_WIKIPEDIA):
+    """
+    Monta a URL da lista de jogos de uma plataforma.
+
+    Args:
+        plataforma (str): Nome da plataforma.
+        url_base (str): Prefixo das URLs, por exemplo um servidor HTTP local em testes.
+
+    Returns:
+        str: A URL da página 'Lista_de_jogos_para_<plataforma>'.
+    """
+    return f"{url_base}Lista_de_jogos_para_{plataforma.replace(' ', '_')}"
+
+
+def _baixar_plataforma(cliente, plataforma, url_base, cache):
+    nome_plataforma = plataforma.replace(" ", "_")
+    url = url_pagina_plataforma(plataforma, url_base)
+
+    try:
+        cabecalhos = cache.cabecalhos_condicionais(url) if cache is not None else {}
+        status, cabecalhos_resposta, html = cliente.obter(url, cabecalhos)
+
+        if status == 304 and cabecalhos:
+            return cache.registrar_acerto(url), None
+
+        nome_arquivo = f"plataforma_{nome_plataforma}.html"
+        with open(nome_arquivo, "wb") as f:
+            f.write(html)
+
+        if cache is not None:
+            cache.registrar_falha(url, nome_arquivo, cabecalhos_resposta)
+
+        return nome_arquivo, None
+
+    except ErroHTTP as e:
+        return (
+            None,
+            f"Erro HTTP ao acessar página da plataforma {plataforma}: {e.code} - {e.reason}",
+        )
+    except ErroConexao as e:
+        return (
+            None,
+            f"Erro de URL ao acessar página da plataforma {plataforma}: {e.reason}",
+        )
+    except Exception as e:
+        return (
+            None,
+            f"Erro desconhecido ao acessar página da plataforma {plataforma}: {e}",
+        )
+
+
+def baixar_paginas_concorrente(
+    plataformas,
+    concorrencia=4,
+    url_base=URL_BASE_WIKIPEDIA,
+    timeout=30,
+    tentativas=3,
+    backoff=0.5,
+    arquivo_log_erros="erros_download.txt",
+    cache=None,
+):
+    """
+    Baixa as páginas das plataformas em paralelo, com no máximo `concorrencia` downloads simultâneos.
+
+    Args:
+        plataformas (list): Lista com os nomes das plataformas.
+        concorrencia (int): Quantidade máxima de downloads simultâneos.
+        url_base (str): Prefixo das URLs das páginas.
+        timeout (float): Timeout, em segundos, de cada requisição.
+        tentativas (int): Quantidade máxima de tentativas por página.
+        backoff (float): Espera inicial, em segundos, entre tentativas.
+        arquivo_log_erros (str): Arquivo onde os erros são registrados.
+        cache (CacheHTTP, optional): Cache de GET condicional. Páginas que respondem 304 não são
+            baixadas nem reescritas; o arquivo já salvo é retornado.
+
+    Returns:
+        list: Lista com os caminhos dos arquivos HTML salvos, na ordem das plataformas.
+    """
+    plataformas = list(plataformas)
+    cliente = ClienteHTTP(timeout=timeout, tentativas=tentativas, backoff=backoff)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            resultados = list(
+                executor.map(
+                    lambda plataforma: _baixar_plataforma(
+                        cliente, plataforma, url_base, cache
+                    ),
+                    plataformas,
+                )
+            )
+    finally:
+        cliente.fechar()
+        if cache is not None:
+            cache.salvar()
+
+    caminhos_arquivos = []
+    for nome_arquivo, erro in resultados:
+        if erro is not None:
+            with open(arquivo_log_erros, "a", encoding="utf-8") as log_f:
+                log_f.write(f"{erro}\n")
+            print(erro)
+        else:
+            caminhos_arquivos.append(nome_arquivo)
+
+    if cache is not None:
+        estatisticas = cache.estatisticas()
+        print(
+            f"Cache HTTP: {estatisticas['acertos']} acerto(s), {estatisticas['falhas']} falha(s)."
+        )
+
+    return caminhos_arquivos
@@ -0,0 +1,208 @@
+import json
+import mmap
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# URLs e e-mails em uma única expressão sobre bytes: o arquivo é varrido uma só vez. O e-mail é
+# reconhecido a partir do "@" e a parte local é lida para trás, pois uma alternativa que começa
+# com [\w-]+ seria tentada em cada posição do documento.
+REGEX_CONEXOES = re.compile(
+    rb"(?P<url>https?://[a-zA-Z0-9-._~:/?#[\]@!$&\'()*+,;=]+)"
+    rb"|@(?P<dominio>(?:[\w-]+\.)*\w[\w-]{0,66}\.[a-z]{2,6}(?:\.[a-z]{2})?)\b"
+)
+REGEX_PARTE_LOCAL = re.compile(rb"(?<![\w.-])[\w-]+(?:\.[\w-]+)*\Z")
+TAMANHO_MAXIMO_PARTE_LOCAL = 64
+
+FORMATOS = ("json", "jsonl")
+
+
+def varrer_arquivo(caminho_arquivo):
+    """
+    Varre um arquivo mapeado em memória e extrai URLs e e-mails em uma única passagem.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo a varrer.
+
+    Returns:
+        dict: As URLs e e-mails únicos do arquivo (na ordem da primeira ocorrência), o tamanho
+        em bytes, o tempo da varredura em segundos e a mensagem de erro (ou None).
+    """
+    urls = {}
+    emails = {}
+    inicio = time.perf_counter()
+
+    try:
+        tamanho = os.path.getsize(caminho_arquivo)
+
+        if tamanho:
+            with open(caminho_arquivo, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as conteudo:
+                for ocorrencia in REGEX_CONEXOES.finditer(conteudo):
+                    url = ocorrencia.group("url")
+                    if url is not None:
+                        urls.setdefault(url, None)
+                        continue
+
+                    arroba = ocorrencia.start()
+                    parte_local = REGEX_PARTE_LOCAL.search(
+                        conteudo,
+                        max(0, arroba - TAMANHO_MAXIMO_PARTE_LOCAL),
+                        arroba,
+                    )
+                    if parte_local is not None:
+                        email = (
+                            parte_local.group(0) + b"@" + ocorrencia.group("dominio")
+                        )
+                        emails.setdefault(email, None)
+
+        erro = None
+
+    except Exception as e:
+        tamanho = 0
+        erro = f"Ocorreu um erro ao processar o arquivo '{caminho_arquivo}': {e}"
+
+    return {
+        "arquivo": caminho_arquivo,
+        "urls": [url.decode("ascii") for url in urls],
+        "emails": [email.decode("ascii") for email in emails],
+        "bytes": tamanho,
+        "segundos": time.perf_counter() - inicio,
+        "erro": erro,
+    }
+
+
+class EscritorConexoes:
+    """
+    Grava URLs e e-mails em disco à medida que são encontrados, sem repetir valores.
+
+    No formato "json" o arquivo tem a mesma estrutura de `{"urls": [...], "emails": [...]}`;
+    os e-mails ficam em um arquivo temporário até as URLs terminarem. No formato "jsonl" cada
+    linha é um objeto `{"tipo", "valor", "arquivo"}`.
+    """
+
+    def __init__(self, arquivo_saida, formato="json"):
+        if formato not in FORMATOS:
+            raise ValueError(
+                f"Formato desconhecido: '{formato}'. Opções: {', '.join(FORMATOS)}."
+            )
+
+        self.formato = formato
+        self.vistos = {"url": set(), "email": set()}
+        self.totais = {"url": 0, "email": 0}
+        self.saida = open(arquivo_saida, "w", encoding="utf-8")
+        self.emails_pendentes = None
+
+        if formato == "json":
+            self.saida.write('{\n    "urls": [')
+            self.emails_pendentes = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def adicionar(self, tipo, valor, arquivo):
+        """
+        Grava um valor, caso ainda não tenha sido gravado.
+
+        Returns:
+            bool: True se o valor era novo.
+        """
+        if valor in self.vistos[tipo]:
+            return False
+
+        self.vistos[tipo].add(valor)
+        self.totais[tipo] += 1
+
+        if self.formato == "jsonl":
+            registro = {"tipo": tipo, "valor": valor, "arquivo": arquivo}
+            self.saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        elif tipo == "url":
+            separador = "," if self.totais["url"] > 1 else ""
+            self.saida.write(f"{separador}\n        {json.dumps(valor)}")
+        else:
+            self.emails_pendentes.write(json.dumps(valor) + "\n")
+
+        return True
+
+    def fechar(self):
+        if self.formato == "json":
+            self.saida.write("\n    ]," if self.totais["url"] else "],")
+            self.saida.write('\n    "emails": [')
+
+            self.emails_pendentes.seek(0)
+            for posicao, linha in enumerate(self.emails_pendentes):
+                separador = "," if posicao else ""
+                self.saida.write(f"{separador}\n        {linha.rstrip()}")
+            self.emails_pendentes.close()
+
+            self.saida.write("\n    ]\n}" if self.totais["email"] else "]\n}")
+
+        self.saida.close()
+
+
+def extrair_conexoes(
+    caminhos_arquivos, arquivo_saida, formato="json", processos=1, imprimir=True
+):
+    """
+    Extrai URLs e e-mails de vários arquivos e grava os valores únicos em disco, em streaming.
+
+    Args:
+        caminhos_arquivos (list): Lista com os caminhos dos arquivos.
+        arquivo_saida (str): Arquivo de saída.
+        formato (str): "json" (mesma estrutura de antes) ou "jsonl" (um registro por linha).
+        processos (int, optional): Quantidade de processos; 1 varre no processo atual e None usa
+            um processo por núcleo.
+        imprimir (bool): Se True, imprime as contagens e a vazão de cada arquivo.
+
+    Returns:
+        dict: O arquivo de saída, os totais de URLs e e-mails únicos e as estatísticas por arquivo.
+    """
+    escritor = EscritorConexoes(arquivo_saida, formato)
+    por_arquivo = []
+
+    executor = None
+    if processos != 1 and len(caminhos_arquivos) > 1:
+        executor = ProcessPoolExecutor(max_workers=processos)
+        varreduras = executor.map(varrer_arquivo, caminhos_arquivos)
+    else:
+        varreduras = map(varrer_arquivo, caminhos_arquivos)
+
+    try:
+        for varredura in varreduras:
+            if varredura["erro"] is not None:
+                if imprimir:
+                    print(varredura["erro"])
+                continue
+
+            for url in varredura["urls"]:
+                escritor.adicionar("url", url, varredura["arquivo"])
+            for email in varredura["emails"]:
+                escritor.adicionar("email", email, varredura["arquivo"])
+
+            megabytes = varredura["bytes"] / (1024 * 1024)
+            estatisticas = {
+                "arquivo": varredura["arquivo"],
+                "urls": len(varredura["urls"]),
+                "emails": len(varredura["emails"]),
+                "megabytes": megabytes,
+                "mb_por_segundo": megabytes / max(varredura["segundos"], 1e-9),
+            }
+            por_arquivo.append(estatisticas)
+
+            if imprimir:
+                print(
+                    f"'{estatisticas['arquivo']}': {estatisticas['urls']} URLs e "
+                    f"{estatisticas['emails']} e-mails únicos ({megabytes:.2f} MB a "
+                    f"{estatisticas['mb_por_segundo']:.1f} MB/s)."
+                )
+    finally:
+        escritor.fechar()
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "arquivo": arquivo_saida,
+        "urls": escritor.totais["url"],
+        "emails": escritor.totais["email"],
+        "por_arquivo": por_arquivo,
+    }
@@ -0,0 +1,481 @@
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from banco import obter_engine, transacao_sqlite
+
+MODOS_BUSCA = ("like", "exato", "prefixo", "token")
+
+# Expande a coluna JSON 'jogos' de um usuário em linhas (jogo, plataforma).
+_JOGOS_DO_USUARIO = """
+    SELECT {usuario}.id, json_extract(value, '$[0]'), json_extract(value, '$[1]')
+    FROM {origem}json_each(CASE WHEN json_valid({usuario}.jogos) THEN {usuario}.jogos ELSE '[]' END)
+    WHERE json_type(value) = 'array' AND json_extract(value, '$[0]') IS NOT NULL
+"""
+
+_ESQUEMA = [
+    """
+    CREATE TABLE Usuario_Jogos (
+        id INTEGER PRIMARY KEY,
+        usuario_id TEXT NOT NULL,
+        jogo TEXT NOT NULL COLLATE NOCASE,
+        plataforma TEXT COLLATE NOCASE
+    )
+    """,
+    "CREATE INDEX idx_usuario_jogos_jogo ON Usuario_Jogos (jogo)",
+    "CREATE INDEX idx_usuario_jogos_usuario ON Usuario_Jogos (usuario_id)",
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_id ON Usuarios (id)",
+    f"""
+    CREATE TRIGGER usuarios_jogos_ai AFTER INSERT ON Usuarios BEGIN
+        INSERT INTO Usuario_Jogos (usuario_id, jogo, plataforma)
+        {_JOGOS_DO_USUARIO.format(usuario="new", origem="")};
+    END
+    """,
+    """
+    CREATE TRIGGER usuarios_jogos_ad AFTER DELETE ON Usuarios BEGIN
+        DELETE FROM Usuario_Jogos WHERE usuario_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER usuarios_jogos_au AFTER UPDATE OF id, jogos ON Usuarios BEGIN
+        DELETE FROM Usuario_Jogos WHERE usuario_id = old.id;
+        INSERT INTO Usuario_Jogos (usuario_id, jogo, plataforma)
+        {_JOGOS_DO_USUARIO.format(usuario="new", origem="")};
+    END
+    """,
+]
+
+_ESQUEMA_FTS = [
+    """
+    CREATE VIRTUAL TABLE Usuario_Jogos_FTS USING fts5(
+        jogo, content='Usuario_Jogos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER usuario_jogos_fts_ai AFTER INSERT ON Usuario_Jogos BEGIN
+        INSERT INTO Usuario_Jogos_FTS (rowid, jogo) VALUES (new.id, new.jogo);
+    END
+    """,
+    """
+    CREATE TRIGGER usuario_jogos_fts_ad AFTER DELETE ON Usuario_Jogos BEGIN
+        INSERT INTO Usuario_Jogos_FTS (Usuario_Jogos_FTS, rowid, jogo)
+        VALUES ('delete', old.id, old.jogo);
+    END
+    """,
+]
+
+_OBJETOS = [
+    ("TRIGGER", "usuarios_jogos_ai"),
+    ("TRIGGER", "usuarios_jogos_ad"),
+    ("TRIGGER", "usuarios_jogos_au"),
+    ("TABLE", "Usuario_Jogos_FTS"),
+    ("TABLE", "Usuario_Jogos"),
+]
+
+
+def fts5_disponivel(cursor):
+    """
+    Returns:
+        bool: True se o SQLite em uso foi compilado com a extensão FTS5.
+    """
+    return bool(
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0]
+    )
+
+
+def indexar_jogos_usuarios(engine, fts=True):
+    """
+    (Re)constrói a tabela normalizada 'Usuario_Jogos' a partir da coluna JSON 'jogos' de 'Usuarios'.
+
+    Cria índices por jogo (sem diferenciar maiúsculas) e por usuário, um índice FTS5 opcional
+    sobre os nomes dos jogos e gatilhos que mantêm tudo atualizado quando linhas de 'Usuarios'
+    são inseridas, alteradas ou removidas. Tudo é feito em uma única transação.
+
+    Args:
+        engine (sqlalchemy.Engine): Engine do banco SQLite.
+        fts (bool): Se True e o SQLite tiver FTS5, cria o índice 'Usuario_Jogos_FTS'.
+
+    Returns:
+        int: A quantidade de pares (usuário, jogo) indexados.
+    """
+    with transacao_sqlite(engine) as cursor:
+        for tipo, nome in _OBJETOS:
+            cursor.execute(f"DROP {tipo} IF EXISTS {nome}")
+
+        for comando in _ESQUEMA:
+            cursor.execute(comando)
+
+        cursor.execute(
+            "INSERT INTO Usuario_Jogos (usuario_id, jogo, plataforma) "
+            + _JOGOS_DO_USUARIO.format(usuario="Usuarios", origem="Usuarios, ")
+            + " AND Usuarios.id IS NOT NULL"
+        )
+
+        if fts and fts5_disponivel(cursor):
+            for comando in _ESQUEMA_FTS:
+                cursor.execute(comando)
+            cursor.execute(
+                "INSERT INTO Usuario_Jogos_FTS (Usuario_Jogos_FTS) VALUES ('rebuild')"
+            )
+
+        return cursor.execute("SELECT COUNT(*) FROM Usuario_Jogos").fetchone()[0]
+
+
+def indice_atualizado(conn):
+    """
+    Verifica se 'Usuario_Jogos' existe e continua sincronizada com 'Usuarios'.
+
+    Se 'Usuarios' for recriada (por exemplo, com `to_sql(if_exists="replace")`), os gatilhos
+    somem junto com a tabela e o índice precisa ser reconstruído.
+
+    Args:
+        conn (sqlalchemy.Connection): Conexão aberta com o banco.
+
+    Returns:
+        bool: True se o índice existe e os gatilhos de sincronização estão ativos.
+    """
+    nomes = {
+        nome
+        for (nome,) in conn.execute(
+            text(
+                "SELECT name FROM sqlite_master WHERE name IN ('Usuario_Jogos', 'usuarios_jogos_ai')"
+            )
+        )
+    }
+    return nomes == {"Usuario_Jogos", "usuarios_jogos_ai"}
+
+
+def _possui_fts(conn):
+    return (
+        conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'Usuario_Jogos_FTS'")
+        ).fetchone()
+        is not None
+    )
+
+
+def _escapar_like(valor):
+    return valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _tokens(valor):
+    return re.findall(r"\w+", valor)
+
+
+def _consulta_fts(tokens):
+    # Cada palavra vira uma string FTS5 entre aspas, para que operadores (AND, NEAR, *, -)
+    # digitados no nome do jogo sejam tratados como texto.
+    return " ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def buscar_usuarios_por_jogo(conn, nome_jogo, modo="token"):
+    """
+    Busca os usuários que jogam um jogo.
+
+    Modos:
+        - "like": busca original, `LIKE '%jogo%'` sobre o texto da coluna 'jogos' (varredura completa).
+        - "exato": nome do jogo igual, sem diferenciar maiúsculas (índice de 'Usuario_Jogos').
+        - "prefixo": nome do jogo começando pelo texto informado (mesmo índice, por intervalo).
+        - "token": todas as palavras informadas presentes no nome do jogo (índice FTS5, ignorando
+          acentos; sem FTS5, cai para LIKE sobre 'Usuario_Jogos').
+
+    Args:
+        conn (sqlalchemy.Connection): Conexão aberta com o banco.
+        nome_jogo (str): O nome (ou parte do nome) do jogo.
+        modo (str): Um dos modos acima.
+
+    Returns:
+        list: Linhas (nome, sobrenome) dos usuários encontrados, uma por usuário.
+
+    Raises:
+        ValueError: Se o modo não existir.
+    """
+    if modo not in MODOS_BUSCA:
+        raise ValueError(
+            f"Modo de busca desconhecido: '{modo}'. Opções: {', '.join(MODOS_BUSCA)}."
+        )
+
+    if modo == "like":
+        return conn.execute(
+            text("SELECT nome, sobrenome FROM Usuarios WHERE jogos LIKE :jogo"),
+            {"jogo": f"%{nome_jogo}%"},
+        ).fetchall()
+
+    parametros = {}
+    if modo == "exato":
+        filtro = "SELECT usuario_id FROM Usuario_Jogos WHERE jogo = :jogo"
+        parametros["jogo"] = nome_jogo
+
+    elif modo == "prefixo":
+        filtro = (
+            "SELECT usuario_id FROM Usuario_Jogos WHERE jogo LIKE :jogo ESCAPE '\\'"
+        )
+        parametros["jogo"] = f"{_escapar_like(nome_jogo)}%"
+
+    elif _possui_fts(conn):
+        tokens = _tokens(nome_jogo)
+        if not tokens:
+            return []
+        filtro = (
+            "SELECT usuario_id FROM Usuario_Jogos WHERE id IN ("
+            "SELECT rowid FROM Usuario_Jogos_FTS WHERE Usuario_Jogos_FTS MATCH :consulta)"
+        )
+        parametros["consulta"] = _consulta_fts(tokens)
+
+    else:
+        tokens = _tokens(nome_jogo)
+        if not tokens:
+            return []
+        condicoes = []
+        for posicao, token in enumerate(tokens):
+            condicoes.append(f"jogo LIKE :token{posicao} ESCAPE '\\'")
+            parametros[f"token{posicao}"] = f"%{_escapar_like(token)}%"
+        filtro = "SELECT usuario_id FROM Usuario_Jogos WHERE " + " AND ".join(condicoes)
+
+    return conn.execute(
+        text(f"SELECT nome, sobrenome FROM Usuarios WHERE id IN ({filtro})"),
+        parametros,
+    ).fetchall()
+
+
+_FILTROS_LOTE = {
+    "exato": "JOIN Usuario_Jogos uj ON uj.jogo = c.parametro",
+    # Intervalo [prefixo, prefixo + U+10FFFF) sobre o índice de 'jogo' (com NOCASE).
+    "prefixo": (
+        "JOIN Usuario_Jogos uj "
+        "ON uj.jogo >= c.parametro AND uj.jogo < c.parametro || char(1114111)"
+    ),
+    "token": (
+        "JOIN Usuario_Jogos_FTS f ON f.Usuario_Jogos_FTS MATCH c.parametro "
+        "JOIN Usuario_Jogos uj ON uj.id = f.rowid"
+    ),
+}
+
+
+def buscar_usuarios_por_jogos(conn, nomes_jogos, modo="exato"):
+    """
+    Resolve vários nomes de jogos em uma única consulta ao índice 'Usuario_Jogos'.
+
+    Os nomes são enviados como um único parâmetro JSON e expandidos com `json_each`, de modo que
+    a quantidade de nomes não esbarra no limite de parâmetros do SQLite.
+
+    Args:
+        conn (sqlalchemy.Connection): Conexão aberta com o banco.
+        nomes_jogos (list): Os nomes de jogos consultados.
+        modo (str): "exato", "prefixo" ou "token" (ver `buscar_usuarios_por_jogo`; o modo
+            "token" exige o índice FTS5).
+
+    Returns:
+        dict: Para cada nome consultado (na ordem recebida, sem repetições), a lista de
+        ocorrências encontradas, cada uma um dicionário com as chaves 'id', 'nome', 'sobrenome',
+        'jogo' e 'plataforma'. Nomes sem ocorrências ficam com a lista vazia.
+
+    Raises:
+        ValueError: Se o modo não existir ou, no modo "token", se não houver índice FTS5.
+    """
+    if modo not in _FILTROS_LOTE:
+        raise ValueError(
+            f"Modo de busca em lote desconhecido: '{modo}'. Opções: {', '.join(_FILTROS_LOTE)}."
+        )
+    if modo == "token" and not _possui_fts(conn):
+        raise ValueError("O modo 'token' exige o índice FTS5 'Usuario_Jogos_FTS'.")
+
+    resultados = {nome: [] for nome in nomes_jogos}
+
+    consultas = []
+    for nome in resultados:
+        if modo == "token":
+            tokens = _tokens(nome)
+            if tokens:
+                consultas.append([nome, _consulta_fts(tokens)])
+        else:
+            consultas.append([nome, nome])
+
+    if not consultas:
+        return resultados
+
+    linhas = conn.execute(
+        text(
+            f"""
+            WITH c(posicao, nome_consultado, parametro) AS (
+                SELECT key, json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                FROM json_each(:consultas)
+            )
+            SELECT c.nome_consultado, u.id, u.nome, u.sobrenome, uj.jogo, uj.plataforma
+            FROM c
+            {_FILTROS_LOTE[modo]}
+            JOIN Usuarios u ON u.id = uj.usuario_id
+            ORDER BY c.posicao, uj.id
+            """
+        ),
+        {"consultas": json.dumps(consultas, ensure_ascii=False)},
+    )
+
+    for nome_consultado, id_usuario, nome, sobrenome, jogo, plataforma in linhas:
+        resultados[nome_consultado].append(
+            {
+                "id": id_usuario,
+                "nome": nome,
+                "sobrenome": sobrenome,
+                "jogo": jogo,
+                "plataforma": plataforma,
+            }
+        )
+
+    return resultados
+
+
+def _gerar_banco_sintetico(caminho, quantidade_usuarios, jogos_catalogo, semente):
+    aleatorio = random.Random(semente)
+    nomes = ["Ana", "João", "Maria", "Pedro", "Lucas", "Júlia", "Camila", "Rafael"]
+    sobrenomes = ["Silva", "Souza", "Costa", "Ribeiro", "Gomes", "Barbosa", "Dias"]
+
+    conexao = sqlite3.connect(caminho)
+    conexao.execute(
+        "CREATE TABLE Usuarios (id TEXT, nome TEXT, sobrenome TEXT, jogos TEXT)"
+    )
+    conexao.executemany(
+        "INSERT INTO Usuarios VALUES (?, ?, ?, ?)",
+        (
+            (
+                f"{posicao:08x}",
+                aleatorio.choice(nomes),
+                aleatorio.choice(sobrenomes),
+                json.dumps(
+                    aleatorio.sample(jogos_catalogo, aleatorio.randint(0, 5)),
+                    ensure_ascii=False,
+                ),
+            )
+            for posicao in range(quantidade_usuarios)
+        ),
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def benchmark_consultas(
+    quantidades_usuarios=(10_000, 100_000, 1_000_000),
+    consultas=100,
+    catalogo="dados_jogos_plataformas.json",
+    semente=42,
+):
+    """
+    Compara o tempo da busca original (LIKE) com as buscas indexadas em bancos sintéticos.
+
+    Args:
+        quantidades_usuarios (tuple): Quantidades de usuários dos bancos gerados.
+        consultas (int): Quantidade de jogos consultados em cada modo.
+        catalogo (str): Catálogo de onde vêm os pares (jogo, plataforma) dos usuários sintéticos.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list: Um dicionário por (quantidade de usuários, modo) com o tempo de indexação e o tempo
+        médio por consulta, em milissegundos.
+    """
+    with open(catalogo, encoding="utf-8") as f:
+        jogos_catalogo = sorted(
+            {
+                (jogo["nome_jogo"], plataforma["plataforma"])
+                for plataforma in json.load(f)
+                for jogo in plataforma["jogos"]
+            }
+        )
+
+    aleatorio = random.Random(semente)
+    nomes_consultados = [
+        jogo for jogo, _ in aleatorio.sample(jogos_catalogo, consultas)
+    ]
+    resultados = []
+
+    for quantidade in quantidades_usuarios:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "benchmark.db")
+            _gerar_banco_sintetico(caminho, quantidade, jogos_catalogo, semente)
+            engine = create_engine(f"sqlite:///{caminho}")
+
+            inicio = time.perf_counter()
+            indexar_jogos_usuarios(engine)
+            tempo_indexacao = time.perf_counter() - inicio
+
+            with engine.connect() as conn:
+                for modo in MODOS_BUSCA:
+                    inicio = time.perf_counter()
+                    encontrados = sum(
+                        len(buscar_usuarios_por_jogo(conn, nome, modo))
+                        for nome in nomes_consultados
+                    )
+                    tempo = time.perf_counter() - inicio
+
+                    resultados.append(
+                        {
+                            "usuarios": quantidade,
+                            "modo": modo,
+                            "indexacao_ms": tempo_indexacao * 1000,
+                            "ms_por_consulta": tempo * 1000 / consultas,
+                            "encontrados": encontrados,
+                        }
+                    )
+
+                # Todos os nomes resolvidos em uma só consulta.
+                inicio = time.perf_counter()
+                lote = buscar_usuarios_por_jogos(conn, nomes_consultados, "exato")
+                tempo = time.perf_counter() - inicio
+
+                resultados.append(
+                    {
+                        "usuarios": quantidade,
+                        "modo": "lote",
+                        "indexacao_ms": tempo_indexacao * 1000,
+                        "ms_por_consulta": tempo * 1000 / consultas,
+                        "encontrados": sum(map(len, lote.values())),
+                    }
+                )
+
+            engine.dispose()
+
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Índice de jogos por usuário e benchmark das buscas."
+    )
+    argumentos.add_argument(
+        "--indexar",
+        action="store_true",
+        help="Reconstrói o índice em INFwebNET_DB.db.",
+    )
+    argumentos.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compara a busca LIKE com as buscas indexadas em bancos sintéticos.",
+    )
+    argumentos.add_argument(
+        "--usuarios",
+        nargs="+",
+        type=int,
+        default=[10_000, 100_000, 1_000_000],
+    )
+    argumentos.add_argument("--consultas", type=int, default=100)
+    args = argumentos.parse_args()
+
+    if args.indexar:
+        total = indexar_jogos_usuarios(obter_engine())
+        print(f"{total} pares (usuário, jogo) indexados.")
+
+    if args.benchmark:
+        for resultado in benchmark_consultas(args.usuarios, args.consultas):
+            print(
+                f"{resultado['usuarios']:>9} usuários  {resultado['modo']:<8} "
+                f"{resultado['ms_por_consulta']:>9.3f} ms/consulta  "
+                f"(indexação: {resultado['indexacao_ms']:.0f} ms, "
+                f"{resultado['encontrados']} resultados)"
+            )
@@ -1,30 +1,81 @@
+import argparse
 import pandas as pd
 import json
+import os
+import sys
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from urllib.error import HTTPError, URLError
 import unicodedata
-from bs4 import BeautifulSoup
-import re
-from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import inspect
 from sqlalchemy import text
 
+# Módulos usados pelos dois projetos (TP2 e AT) ficam em ../compartilhado.
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "compartilhado")
+)
+
+from associacao_jogos import MotorAssociacaoJogos
+from backends_html import extrair_titulo_e_jogos
+from banco import obter_engine, sincronizar_jogos_plataformas
+from cache_http import CacheHTTP
+from cache_parse import CacheParse
+from carregador_usuarios import carregar_usuarios
+from catalogo_colunar import exportar_catalogo
+from download_paginas import (
+    URL_BASE_WIKIPEDIA,
+    baixar_paginas_concorrente,
+    url_pagina_plataforma,
+)
+from extrator_conexoes import extrair_conexoes
+from indice_jogos_usuarios import (
+    buscar_usuarios_por_jogo,
+    buscar_usuarios_por_jogos,
+    indexar_jogos_usuarios,
+    indice_atualizado,
+)
+from instrumentacao import adicionar_argumentos, criar_instrumentacao
+from listas_compactas import ColunaListas
+
+# Funções medidas com --metricas (e que podem ser perfiladas com --perfil).
+ETAPAS_INSTRUMENTADAS = [
+    "carregar_dados",
+    "extrair_plataformas",
+    "carregar_plataformas",
+    "baixar_paginas_wikipedia",
+    "parsear_paginas",
+    "extrair_urls_emails",
+    "exportar_dados_jogos",
+    "associar_jogos_usuarios",
+    "atualizar_banco_dados",
+    "exportar_catalogo",
+    "atualizar_indice_jogos_usuarios",
+    "consultar_usuarios_por_jogo",
+]
+
 
 # Q.1
-def carregar_dados():
+def carregar_dados(arquivo="INFwebNet_Data.json", tipado=False):
     """
     Carrega os dados de um arquivo JSON e os transforma em um DataFrame Pandas.
 
     O arquivo carregado deve conter as colunas obrigatórias. Caso alguma esteja ausente ou com valores vazios,
     ela será preenchida com "Não Informado".
 
+    Args:
+        arquivo (str): O arquivo JSON com os usuários.
+        tipado (bool): Se True, usa `carregar_usuarios`, que lê o arquivo em lotes e aplica o
+            `ESQUEMA_USUARIOS` (cidade/estado categóricos, idade e ano de nascimento inteiros
+            anuláveis, data de nascimento como data); só as colunas de texto recebem "Não Informado".
+
     Returns:
         pd.DataFrame: Um DataFrame contendo os dados normalizados e preenchidos com as colunas obrigatórias.
     """
-    arquivo = "INFwebNet_Data.json"
-
     try:
+        if tipado:
+            return carregar_usuarios(arquivo)
+
         with open(arquivo, encoding="utf-8") as f:
             dados = json.load(f)
             df = pd.DataFrame(dados)
@@ -65,7 +116,7 @@ def carregar_dados():
 
 
 # Q.2
-def extrair_plataformas(df):
+def extrair_plataformas(df, jogos=None):
     """
     Extrai as plataformas de jogos presentes no DataFrame e salva em um arquivo de texto.
 
@@ -74,14 +125,19 @@ def extrair_plataformas(df):
 
     Args:
         df (pd.DataFrame): DataFrame contendo a coluna 'jogos', onde os jogos e suas plataformas estão listados.
+        jogos (ColunaListas, optional): A coluna 'jogos' já compactada (com `campos=2`); as
+            plataformas são os códigos distintos do segundo campo.
 
     Returns:
         set: Um conjunto com as plataformas extraídas.
     """
     try:
-        plataformas = set()
+        if jogos is None:
+            jogos = ColunaListas.de_listas(df["jogos"], campos=2)
 
-        for jogos_usuario in df["jogos"]:
+        plataformas = jogos.valores_distintos(campo=1)
+
+        for jogos_usuario in jogos.nao_compactadas.values():
             if jogos_usuario != "Não Informado":
                 for jogo in jogos_usuario:
                     if len(jogo) > 1:
@@ -133,7 +189,14 @@ def carregar_plataformas():
 
 
 # Q.4 / Q.5
-def baixar_paginas_wikipedia(plataformas):
+def baixar_paginas_wikipedia(
+    plataformas,
+    concorrencia=None,
+    url_base=URL_BASE_WIKIPEDIA,
+    timeout=30,
+    tentativas=3,
+    cache=None,
+):
     """
     Baixa páginas da Wikipedia referentes às plataformas informadas.
 
@@ -141,16 +204,37 @@ def baixar_paginas_wikipedia(plataformas):
 
     Args:
         plataformas (list): Lista com os nomes das plataformas.
+        concorrencia (int, optional): Quando informado, baixa as páginas em paralelo com no máximo
+            essa quantidade de downloads simultâneos, reutilizando conexões keep-alive por host,
+            com timeout e novas tentativas com backoff para respostas 5xx.
+        url_base (str): Prefixo das URLs das páginas (por exemplo, um servidor HTTP local).
+        timeout (float): Timeout, em segundos, de cada requisição no modo concorrente.
+        tentativas (int): Quantidade máxima de tentativas por página no modo concorrente.
+        cache (CacheHTTP, optional): Cache de GET condicional (ETag/Last-Modified). Quando
+            informado, uma resposta 304 conta como acerto e o arquivo já salvo é retornado sem
+            ser reescrito. Usa o mesmo cliente do modo concorrente.
 
     Returns:
         list: Lista com os caminhos dos arquivos HTML salvos.
     """
-    caminhos_arquivos = []
     arquivo_log_erros = "erros_download.txt"
 
+    if concorrencia is not None or cache is not None:
+        return baixar_paginas_concorrente(
+            plataformas,
+            concorrencia=concorrencia or 1,
+            url_base=url_base,
+            timeout=timeout,
+            tentativas=tentativas,
+            arquivo_log_erros=arquivo_log_erros,
+            cache=cache,
+        )
+
+    caminhos_arquivos = []
+
     for plataforma in plataformas:
         nome_plataforma = plataforma.replace(" ", "_")
-        url = f"https://pt.wikipedia.org/wiki/Lista_de_jogos_para_{nome_plataforma}"
+        url = url_pagina_plataforma(plataforma, url_base)
 
         try:
             resposta = urllib.request.urlopen(url)
@@ -216,129 +300,166 @@ class ParseException(Exception):
         super().__init__(self.mensagem)
 
 
-def parsear_paginas(caminhos_arquivos_html):
+def mapear_arquivos(funcao, caminhos_arquivos, processos=1, *args):
     """
-    Faz o parsing de páginas HTML baixadas, extrai dados sobre jogos e valida o título da página.
+    Aplica uma função a cada arquivo, opcionalmente distribuindo os arquivos em um pool de processos.
 
-    A função verifica se o título da página corresponde ao nome da plataforma e, se válido, extrai
-    as tabelas de jogos disponíveis no HTML.
+    Os resultados são sempre devolvidos na ordem original dos arquivos.
 
     Args:
-        caminhos_arquivos_html (list): Lista com os caminhos para os arquivos HTML das plataformas.
+        funcao (callable): Função de nível de módulo (serializável) que recebe o caminho do arquivo.
+        caminhos_arquivos (list): Lista com os caminhos dos arquivos.
+        processos (int, optional): Quantidade de processos. 1 processa no processo atual;
+            None usa um processo por núcleo disponível.
+        *args: Argumentos extras repassados para `funcao` após o caminho.
 
     Returns:
-        list: Uma lista de dicionários contendo dados dos jogos extraídos por plataforma.
+        list: Os resultados de `funcao`, na mesma ordem de `caminhos_arquivos`.
     """
-    resultados = []
-
-    for caminho_arquivo_html in caminhos_arquivos_html:
-        try:
-            with open(caminho_arquivo_html, "r", encoding="utf-8") as f:
-                conteudo_html = f.read()
-
-            soup = BeautifulSoup(conteudo_html, "html.parser")
-            titulo_pagina = soup.title.string if soup.title else ""
-            nome_plataforma = (
-                caminho_arquivo_html.split("plataforma_")[1]
-                .split(".html")[0]
-                .replace("_", " ")
-            )
-
-            if not normalizar_string(nome_plataforma) in normalizar_string(
-                titulo_pagina
-            ):
-                raise ParseException(
-                    f"O título da página '{titulo_pagina}' não corresponde ao nome da plataforma '{nome_plataforma}'."
-                )
-
-            print(
-                f"Título da página validado com sucesso para a plataforma '{nome_plataforma}'."
+    if processos == 1 or len(caminhos_arquivos) <= 1:
+        return [funcao(caminho, *args) for caminho in caminhos_arquivos]
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(
+            executor.map(
+                funcao,
+                caminhos_arquivos,
+                *[[arg] * len(caminhos_arquivos) for arg in args],
             )
+        )
 
-            tabelas = soup.find_all("table", class_="wikitable")
-            jogos = []
 
-            for tabela in tabelas:
-                cabecalho = tabela.find("tr")
-                if not cabecalho:
-                    continue
+def _parsear_pagina(caminho_arquivo_html, backend, cache):
+    """
+    Faz o parsing de uma única página, sem escrever no console nem no log de erros.
 
-                colunas = [th.get_text(strip=True) for th in cabecalho.find_all("th")]
+    Com um `CacheParse`, páginas cujo conteúdo já foi processado são lidas do cache.
 
-                for linha in tabela.find_all("tr")[1:]:
-                    dados_jogo = {}
-                    colunas_valores = linha.find_all("td")
+    Returns:
+        tuple: O resultado da plataforma (ou None em caso de erro), as mensagens para o console
+        e a linha para o arquivo 'erros_parse.txt' (ou None).
+    """
+    try:
+        with open(caminho_arquivo_html, "rb") as f:
+            conteudo = f.read()
 
-                    if len(colunas_valores) == len(colunas):
-                        for idx, coluna_valor in enumerate(colunas_valores):
-                            campo = colunas[idx]
-                            valor = coluna_valor.get_text(strip=True)
-                            dados_jogo[campo] = valor
+        chave = cache.chave(conteudo) if cache is not None else None
+        entrada = cache.obter(chave) if cache is not None else None
 
-                        nome_jogo = dados_jogo.get("Título") or dados_jogo.get(
-                            "Jogo", "Desconhecido"
-                        )
-                        jogos.append({"nome_jogo": nome_jogo, "dados_jogo": dados_jogo})
+        if entrada is not None:
+            titulo_pagina, jogos = entrada
+        else:
+            conteudo_html = (
+                conteudo.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+            )
+            titulo_pagina, jogos = extrair_titulo_e_jogos(conteudo_html, backend)
+            if cache is not None:
+                cache.guardar(chave, titulo_pagina, jogos)
+
+        nome_plataforma = (
+            caminho_arquivo_html.split("plataforma_")[1]
+            .split(".html")[0]
+            .replace("_", " ")
+        )
 
-            resultado = {"plataforma": nome_plataforma, "jogos": jogos}
+        if not normalizar_string(nome_plataforma) in normalizar_string(titulo_pagina):
+            raise ParseException(
+                f"O título da página '{titulo_pagina}' não corresponde ao nome da plataforma '{nome_plataforma}'."
+            )
 
-            print(f"Dados extraídos para a plataforma '{nome_plataforma}'.")
-            resultados.append(resultado)
+        resultado = {"plataforma": nome_plataforma, "jogos": jogos}
+        mensagens = [
+            f"Título da página validado com sucesso para a plataforma '{nome_plataforma}'.",
+            f"Dados extraídos para a plataforma '{nome_plataforma}'.",
+        ]
+        return resultado, mensagens, None
 
-        except ParseException as e:
-            with open("erros_parse.txt", "a", encoding="utf-8") as log_f:
-                log_f.write(
-                    f"Erro ao validar o título da página '{caminho_arquivo_html}': {e.mensagem}\n"
-                )
-            print(
+    except ParseException as e:
+        return (
+            None,
+            [
                 f"Erro ao validar o título da página '{caminho_arquivo_html}': {e.mensagem}"
-            )
+            ],
+            f"Erro ao validar o título da página '{caminho_arquivo_html}': {e.mensagem}\n",
+        )
 
-        except Exception as e:
-            print(
+    except Exception as e:
+        return (
+            None,
+            [
                 f"Ocorreu um erro ao tentar parsear a página '{caminho_arquivo_html}': {e}"
-            )
-            with open("erros_parse.txt", "a", encoding="utf-8") as log_f:
-                log_f.write(
-                    f"Erro desconhecido ao tentar parsear a página '{caminho_arquivo_html}': {e}\n"
-                )
+            ],
+            f"Erro desconhecido ao tentar parsear a página '{caminho_arquivo_html}': {e}\n",
+        )
 
-    return resultados
 
+def parsear_paginas(
+    caminhos_arquivos_html, backend="html.parser", processos=1, cache=None
+):
+    """
+    Faz o parsing de páginas HTML baixadas, extrai dados sobre jogos e valida o título da página.
 
-# Q.8
-def extrair_urls_emails(caminhos_arquivos_html):
-    conexoes = {"urls": [], "emails": []}
+    A função verifica se o título da página corresponde ao nome da plataforma e, se válido, extrai
+    as tabelas de jogos disponíveis no HTML.
 
-    regex_urls = r"https?://[a-zA-Z0-9-._~:/?#[\]@!$&\'()*+,;=]+"
-    regex_emails = r"^([\w-]+(?:\.[\w-]+)*)@((?:[\w-]+\.)*\w[\w-]{0,66})\.([a-z]{2,6}(?:\.[a-z]{2})?)$"
+    Args:
+        caminhos_arquivos_html (list): Lista com os caminhos para os arquivos HTML das plataformas.
+        backend (str): Backend de parsing: "html.parser" (BeautifulSoup, padrão), "lxml" ou
+            "streaming". Todos retornam exatamente a mesma estrutura.
+        processos (int, optional): Quantidade de processos usados no parsing. 1 (padrão) processa
+            um arquivo por vez; None usa um processo por núcleo. Os erros são gravados em
+            'erros_parse.txt' pelo processo principal, na ordem dos arquivos.
+        cache (CacheParse, optional): Cache indexado pelo hash do conteúdo de cada página e pela
+            versão da extração. Páginas inalteradas não são parseadas novamente.
 
-    for caminho_arquivo_html in caminhos_arquivos_html:
-        try:
-            with open(caminho_arquivo_html, "r", encoding="utf-8") as f:
-                conteudo_html = f.read()
+    Returns:
+        list: Uma lista de dicionários contendo dados dos jogos extraídos por plataforma.
+    """
+    resultados = []
 
-            soup = BeautifulSoup(conteudo_html, "html.parser")
+    for resultado, mensagens, linha_log in mapear_arquivos(
+        _parsear_pagina, caminhos_arquivos_html, processos, backend, cache
+    ):
+        for mensagem in mensagens:
+            print(mensagem)
+
+        if linha_log is not None:
+            with open("erros_parse.txt", "a", encoding="utf-8") as log_f:
+                log_f.write(linha_log)
 
-            urls_encontradas = re.findall(regex_urls, conteudo_html)
-            conexoes["urls"].extend(urls_encontradas)
+        if resultado is not None:
+            resultados.append(resultado)
 
-            emails_encontrados = re.findall(regex_emails, conteudo_html)
-            conexoes["emails"].extend(emails_encontrados)
+    return resultados
 
-            print(
-                f"URLs e e-mails extraídos com sucesso para a plataforma '{caminho_arquivo_html}'."
-            )
 
-        except Exception as e:
-            print(
-                f"Ocorreu um erro ao processar o arquivo '{caminho_arquivo_html}': {e}"
-            )
+# Q.8
+def extrair_urls_emails(caminhos_arquivos_html, processos=1, formato="json"):
+    """
+    Extrai as URLs e os e-mails das páginas baixadas e os salva em 'conexoes_plataformas.json'.
 
-    with open("conexoes_plataformas.json", "w", encoding="utf-8") as f:
-        json.dump(conexoes, f, ensure_ascii=False, indent=4)
+    Cada arquivo é mapeado em memória e varrido uma única vez, como bytes, por uma expressão
+    regular que reconhece URLs e e-mails ao mesmo tempo. Os valores repetidos são descartados
+    e os novos são gravados à medida que aparecem, sem manter a lista completa em memória.
 
-    print("Conexões salvas em 'conexoes_plataformas.json'.")
+    Args:
+        caminhos_arquivos_html (list): Lista com os caminhos para os arquivos HTML das plataformas.
+        processos (int, optional): Quantidade de processos usados na varredura. 1 (padrão) varre
+            um arquivo por vez; None usa um processo por núcleo.
+        formato (str): "json" grava 'conexoes_plataformas.json' com as listas "urls" e "emails";
+            "jsonl" grava 'conexoes_plataformas.jsonl' com um registro por linha.
+
+    Returns:
+        dict: O arquivo gerado, as quantidades de URLs e e-mails únicos e, para cada arquivo,
+        as contagens e a vazão da varredura em MB/s.
+    """
+    arquivo = f"conexoes_plataformas.{formato}"
+
+    conexoes = extrair_conexoes(
+        caminhos_arquivos_html, arquivo, formato=formato, processos=processos
+    )
+
+    print(f"Conexões salvas em '{arquivo}'.")
     return conexoes
 
 
@@ -357,26 +478,29 @@ def exportar_dados_jogos(dados_extraidos):
 
 
 # Q.10
-def associar_jogos_usuarios(df_usuarios, dados_jogos_extraidos):
-    try:
-        df_usuarios["jogos_associados"] = None
+def associar_jogos_usuarios(df_usuarios, dados_jogos_extraidos, motor=None, jogos=None):
+    """
+    Associa os jogos de cada usuário aos jogos encontrados no catálogo extraído.
 
-        for idx, usuario in df_usuarios.iterrows():
-            jogos_associados = []
+    A associação é feita pelo `MotorAssociacaoJogos`, que indexa o catálogo por pares
+    (plataforma, jogo) uma única vez e resolve todos os usuários em uma passagem vetorizada.
 
-            for jogo_usuario, plataforma_usuario in usuario["jogos"]:
-                for plataforma in dados_jogos_extraidos:
-                    if plataforma["plataforma"].lower() == plataforma_usuario.lower():
-                        for jogo in plataforma["jogos"]:
-                            if jogo["nome_jogo"].lower() == jogo_usuario.lower():
-                                jogos_associados.append(
-                                    {
-                                        "nome_jogo": jogo_usuario,
-                                        "plataforma": plataforma_usuario,
-                                    }
-                                )
+    Args:
+        df_usuarios (pd.DataFrame): DataFrame contendo a coluna 'jogos' com pares (jogo, plataforma).
+        dados_jogos_extraidos (list): Lista de dicionários com os jogos extraídos por plataforma.
+        motor (MotorAssociacaoJogos, optional): Motor já indexado, reutilizado entre chamadas.
+            Quando omitido, um novo motor é criado a partir de `dados_jogos_extraidos`.
+        jogos (ColunaListas, optional): A coluna 'jogos' já compactada, reaproveitada de
+            `extrair_plataformas`.
 
-            df_usuarios.at[idx, "jogos_associados"] = jogos_associados
+    Returns:
+        pd.DataFrame: O DataFrame de usuários com a coluna 'jogos_associados' preenchida.
+    """
+    try:
+        if motor is None:
+            motor = MotorAssociacaoJogos(dados_jogos_extraidos)
+
+        motor.associar(df_usuarios, jogos)
 
         print("Jogos associados com sucesso!")
         return df_usuarios
@@ -387,9 +511,31 @@ def associar_jogos_usuarios(df_usuarios, dados_jogos_extraidos):
 
 
 # Q.11
-def atualizar_banco_dados(dados_jogos_extraidos):
+def atualizar_banco_dados(dados_jogos_extraidos, modo="substituir", wal=False):
+    """
+    Grava os jogos extraídos na tabela 'Jogos_Plataformas' do banco SQLite.
+
+    Args:
+        dados_jogos_extraidos (list): Lista de dicionários com os jogos extraídos por plataforma.
+        modo (str): "substituir" recria a tabela inteira com `to_sql`; "incremental" mantém uma
+            chave única (nome_plataforma, nome_jogo, ocorrencia) e, em uma única transação, só
+            insere, atualiza ou remove as linhas que mudaram.
+        wal (bool): No modo incremental, ativa o journal_mode=WAL do SQLite.
+    """
     try:
-        engine = create_engine("sqlite:///INFwebNET_DB.db")
+        engine = obter_engine()
+
+        if modo == "incremental":
+            contagens = sincronizar_jogos_plataformas(
+                engine, dados_jogos_extraidos, wal=wal
+            )
+            print(
+                "Tabela 'Jogos_Plataformas' atualizada com sucesso: "
+                f"{contagens['inseridos']} inserido(s), {contagens['atualizados']} atualizado(s), "
+                f"{contagens['removidos']} removido(s), {contagens['inalterados']} inalterado(s)."
+            )
+            return
+
         jogos_plataformas = []
 
         for plataforma in dados_jogos_extraidos:
@@ -426,27 +572,70 @@ def atualizar_banco_dados(dados_jogos_extraidos):
         print(f"Ocorreu um erro inesperado: {e}")
 
 
+def atualizar_indice_jogos_usuarios():
+    """
+    Constrói o índice 'Usuario_Jogos' (ver `indexar_jogos_usuarios`) se ele ainda não existir ou
+    se a tabela 'Usuarios' tiver sido recriada depois dele.
+
+    Returns:
+        bool: True se o índice foi (re)construído, False se já estava atualizado.
+    """
+    try:
+        engine = obter_engine()
+
+        with engine.connect() as conn:
+            atualizado = indice_atualizado(conn)
+
+        if atualizado:
+            print("Índice 'Usuario_Jogos' já está atualizado.")
+            return False
+
+        pares = indexar_jogos_usuarios(engine)
+        print(f"Índice 'Usuario_Jogos' construído: {pares} par(es) (usuário, jogo).")
+        return True
+
+    except SQLAlchemyError as e:
+        print(f"Erro ao indexar os jogos dos usuários: {e}")
+        return False
+
+
 # Q.12
-def consultar_usuarios_por_jogo():
-    nome_jogo = input("Digite o nome do jogo que deseja consultar: ").strip()
+def consultar_usuarios_por_jogo(nome_jogo=None, modo="like"):
+    """
+    Consulta os usuários que jogam um jogo.
+
+    O modo "like" é a busca original sobre o texto da coluna 'jogos'. Os demais usam o índice
+    'Usuario_Jogos', que precisa ter sido construído antes com `atualizar_indice_jogos_usuarios`;
+    a consulta em si não altera o banco.
+
+    Args:
+        nome_jogo (str, optional): O nome do jogo. Se None, é pedido ao usuário.
+        modo (str): "like", "exato", "prefixo" ou "token" (ver `buscar_usuarios_por_jogo`).
+
+    Returns:
+        list: Linhas (nome, sobrenome) dos usuários encontrados.
+    """
+    if nome_jogo is None:
+        nome_jogo = input("Digite o nome do jogo que deseja consultar: ")
+    nome_jogo = nome_jogo.strip()
 
     if not nome_jogo:
         print("O nome do jogo não pode ser vazio.")
         return []
 
     try:
-        engine = create_engine("sqlite:///INFwebNET_DB.db")
+        engine = obter_engine()
+
         with engine.connect() as conn:
-            query = text(
-                """
-                SELECT nome, sobrenome 
-                FROM Usuarios 
-                WHERE jogos LIKE :jogo
-                """
-            )
+            if modo != "like" and not indice_atualizado(conn):
+                print(
+                    "O índice 'Usuario_Jogos' não existe ou está desatualizado; "
+                    "use atualizar_indice_jogos_usuarios() antes de consultar no modo "
+                    f"'{modo}'."
+                )
+                return []
 
-            resultado = conn.execute(query, {"jogo": f"%{nome_jogo}%"})
-            usuarios = resultado.fetchall()
+            usuarios = buscar_usuarios_por_jogo(conn, nome_jogo, modo)
 
             if usuarios:
                 print(f"Usuários que jogam '{nome_jogo}':")
@@ -465,42 +654,106 @@ def consultar_usuarios_por_jogo():
         return []
 
 
-if __name__ == "__main__":
-    df_usuarios = carregar_dados()
-    print(df_usuarios)
-    print()
+def consultar_usuarios_por_jogos(nomes_jogos, modo="exato"):
+    """
+    Versão em lote de `consultar_usuarios_por_jogo`, para uso a partir de scripts.
 
-    plataformas = extrair_plataformas(df_usuarios)
-    print("Plataformas extraídas:", plataformas)
-    print()
+    Resolve todos os nomes em uma única consulta ao índice 'Usuario_Jogos' e retorna os
+    resultados em vez de imprimi-los. Erros do banco são propagados.
 
-    plataformas_carregadas = carregar_plataformas()
-    print("Plataformas carregadas:", plataformas_carregadas)
-    print()
+    Args:
+        nomes_jogos (list): Os nomes de jogos consultados.
+        modo (str): "exato", "prefixo" ou "token".
 
-    caminhos_paginas_baixadas = baixar_paginas_wikipedia(plataformas)
-    print("Caminhos para os arquivos gerados:", caminhos_paginas_baixadas)
-    print()
+    Returns:
+        dict: Para cada nome consultado, a lista de ocorrências ('id', 'nome', 'sobrenome',
+        'jogo', 'plataforma').
 
-    dados_jogos_plataformas = parsear_paginas(caminhos_paginas_baixadas)
-    print()
+    Raises:
+        RuntimeError: Se o índice não existir ou estiver desatualizado (ver
+            `atualizar_indice_jogos_usuarios`).
+    """
+    engine = obter_engine()
 
-    conexoes_plataformas = extrair_urls_emails(caminhos_paginas_baixadas)
-    print("Urls:", conexoes_plataformas["urls"][:5])
-    print("E-mails:", conexoes_plataformas["emails"][:5])
-    print()
+    with engine.connect() as conn:
+        if not indice_atualizado(conn):
+            raise RuntimeError(
+                "O índice 'Usuario_Jogos' não existe ou está desatualizado; use "
+                "atualizar_indice_jogos_usuarios() antes de consultar."
+            )
+        return buscar_usuarios_por_jogos(conn, nomes_jogos, modo)
 
-    exportar_dados_jogos(dados_jogos_plataformas)
-    print()
 
-    df_usuarios_atualizado = associar_jogos_usuarios(
-        df_usuarios, dados_jogos_plataformas
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Pipeline do AT (INFwebNET).")
+    argumentos.add_argument(
+        "--tipado",
+        action="store_true",
+        help="Carrega os usuários com o esquema tipado de carregador_usuarios.py.",
     )
-    print(df_usuarios_atualizado.iloc[50].to_dict())
-    print()
+    adicionar_argumentos(argumentos)
+    args = argumentos.parse_args()
 
-    atualizar_banco_dados(dados_jogos_plataformas)
-    print()
+    # Com --metricas ou --perfil, as funções das etapas são trocadas pelas versões medidas.
+    instrumentacao = criar_instrumentacao(args)
+    if instrumentacao is not None:
+        instrumentacao.instrumentar(globals(), ETAPAS_INSTRUMENTADAS)
 
-    consultar_usuarios_por_jogo()
-    print()
+    try:
+        df_usuarios = carregar_dados(tipado=args.tipado)
+        print(df_usuarios)
+        print()
+
+        jogos_usuarios = ColunaListas.de_listas(df_usuarios["jogos"], campos=2)
+
+        plataformas = extrair_plataformas(df_usuarios, jogos_usuarios)
+        print("Plataformas extraídas:", plataformas)
+        print()
+
+        plataformas_carregadas = carregar_plataformas()
+        print("Plataformas carregadas:", plataformas_carregadas)
+        print()
+
+        caminhos_paginas_baixadas = baixar_paginas_wikipedia(
+            plataformas, cache=CacheHTTP()
+        )
+        print("Caminhos para os arquivos gerados:", caminhos_paginas_baixadas)
+        print()
+
+        dados_jogos_plataformas = parsear_paginas(
+            caminhos_paginas_baixadas, cache=CacheParse()
+        )
+        print()
+
+        conexoes_plataformas = extrair_urls_emails(caminhos_paginas_baixadas)
+        print("Urls únicas:", conexoes_plataformas["urls"])
+        print("E-mails únicos:", conexoes_plataformas["emails"])
+        print()
+
+        exportar_dados_jogos(dados_jogos_plataformas)
+        print()
+
+        df_usuarios_atualizado = associar_jogos_usuarios(
+            df_usuarios, dados_jogos_plataformas, jogos=jogos_usuarios
+        )
+        print(df_usuarios_atualizado.iloc[50].to_dict())
+        print()
+
+        atualizar_banco_dados(dados_jogos_plataformas)
+        print()
+
+        exportar_catalogo(dados_jogos_plataformas)
+        print()
+
+        atualizar_indice_jogos_usuarios()
+        print()
+
+        consultar_usuarios_por_jogo()
+        print()
+    finally:
+        if instrumentacao is not None and args.metricas:
+            instrumentacao.exportar(args.metricas, args.formato_metricas)
+        if args.perfil and not instrumentacao.relatorios_perfil:
+            print(
+                f"\nA etapa '{args.perfil}' não foi executada: nenhum perfil gravado."
+            )
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do projeto são importados pelo nome, como quando main.py roda do diretório dele.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
@@ -0,0 +1,94 @@
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from banco import TABELA_JOGOS_PLATAFORMAS, sincronizar_jogos_plataformas
+
+
+def _catalogo(*jogos):
+    # jogos: (plataforma, nome, dados)
+    plataformas = {}
+    for plataforma, nome, dados in jogos:
+        plataformas.setdefault(plataforma, []).append(
+            {"nome_jogo": nome, "dados_jogo": dados}
+        )
+    return [
+        {"plataforma": plataforma, "jogos": lista}
+        for plataforma, lista in plataformas.items()
+    ]
+
+
+def _linhas(arquivo):
+    with sqlite3.connect(arquivo) as conexao:
+        return sorted(
+            conexao.execute(
+                f"SELECT nome_plataforma, nome_jogo, dados_jogo FROM {TABELA_JOGOS_PLATAFORMAS}"
+            )
+        )
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    return str(tmp_path / "INFwebNET_DB.db")
+
+
+@pytest.fixture
+def engine(arquivo):
+    engine = create_engine(f"sqlite:///{arquivo}")
+    yield engine
+    engine.dispose()
+
+
+def test_sincronizar_so_grava_o_que_mudou(arquivo, engine):
+    catalogo = _catalogo(("PS5", "Astro Bot", {"ano": 2024}), ("PC", "Doom", {}))
+    assert sincronizar_jogos_plataformas(engine, catalogo) == {
+        "inseridos": 2,
+        "atualizados": 0,
+        "removidos": 0,
+        "inalterados": 0,
+    }
+    assert sincronizar_jogos_plataformas(engine, catalogo)["inalterados"] == 2
+
+    catalogo = _catalogo(("PS5", "Astro Bot", {"ano": 2025}), ("PC", "Quake", {}))
+    assert sincronizar_jogos_plataformas(engine, catalogo, tamanho_lote=1) == {
+        "inseridos": 1,
+        "atualizados": 1,
+        "removidos": 1,
+        "inalterados": 0,
+    }
+    assert _linhas(arquivo) == [
+        ("PC", "Quake", "{}"),
+        ("PS5", "Astro Bot", json.dumps({"ano": 2025})),
+    ]
+
+
+def test_jogos_repetidos_na_mesma_plataforma_sao_mantidos(arquivo, engine):
+    catalogo = _catalogo(("PC", "Doom", {"ano": 1993}), ("PC", "Doom", {"ano": 2016}))
+    assert sincronizar_jogos_plataformas(engine, catalogo)["inseridos"] == 2
+    assert len(_linhas(arquivo)) == 2
+
+    catalogo = _catalogo(("PC", "Doom", {"ano": 1993}))
+    contagens = sincronizar_jogos_plataformas(engine, catalogo)
+    assert contagens["removidos"] == 1 and contagens["inalterados"] == 1
+    assert _linhas(arquivo) == [("PC", "Doom", json.dumps({"ano": 1993}))]
+
+
+def test_migra_tabela_gravada_com_to_sql(arquivo, engine):
+    pd.DataFrame(
+        {
+            "nome_plataforma": ["PC", "PC", "PS5"],
+            "nome_jogo": ["Doom", "Doom", "Astro Bot"],
+            "dados_jogo": [json.dumps({"ano": 1993}), json.dumps({"ano": 2016}), "{}"],
+        }
+    ).to_sql(TABELA_JOGOS_PLATAFORMAS, engine, index=False)
+
+    catalogo = _catalogo(
+        ("PC", "Doom", {"ano": 1993}),
+        ("PC", "Doom", {"ano": 2016}),
+        ("PS5", "Astro Bot", {}),
+    )
+    assert sincronizar_jogos_plataformas(engine, catalogo)["inalterados"] == 3
+    assert len(_linhas(arquivo)) == 3
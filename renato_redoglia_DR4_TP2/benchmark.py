@@ -0,0 +1,460 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from unittest import mock
+
+import pandas as pd
+
+import main
+from cadastro_lote import carregar_lote
+from diario import DiarioInfnetianos
+from indice_nomes import PRIMEIROS_NOMES, SOBRENOMES
+from ingestao import ler_usuarios_novos
+from processamento_em_blocos import processar_em_blocos
+
+ESCALAS = (1_000, 10_000, 100_000)
+
+# Formatos de data dos usuários novos, com pesos parecidos com os do arquivo original: os três
+# primeiros são os reconhecidos por `ingestao.FORMATOS_DATA`; os demais viram NaT.
+FORMATOS_DATA = (
+    ("%Y-%m-%d", 90),
+    ("%b %d, %Y", 2),
+    ("%d/%m/%y", 2),
+    ("%d.%m.%Y", 1),
+    ("%d/%m/%Y", 1),
+    ("", 4),
+)
+CIDADES = {
+    "RJ": ("Rio de Janeiro", "Niterói", "Volta Redonda"),
+    "SP": ("São Paulo", "Campinas", "Santos"),
+    "MG": ("Belo Horizonte", "Juiz de Fora", "Uberlândia"),
+    "PE": ("Recife", "Olinda"),
+    "CE": ("Fortaleza",),
+    "RS": ("Porto Alegre", "Caxias do Sul"),
+    "SC": ("Florianópolis", "Itajaí", "Joinville"),
+    "GO": ("Goiânia",),
+}
+HOBBIES = (
+    "leitura cozinhar música cinema pintura futebol natação fotografia ciclismo xadrez "
+    "dança corrida jardinagem viagens"
+).split()
+LINGUAGENS = (
+    "Python",
+    "Java",
+    "C#",
+    "Go",
+    "PHP",
+    "Ruby",
+    "Kotlin",
+    "JavaScript",
+    "C++",
+)
+JOGOS = (
+    ("Minecraft", "PC"),
+    ("Overwatch", "PC"),
+    ("Apex Legends", "PC"),
+    ("The Last of Us", "PlayStation 4"),
+    ("Halo 5: Guardians", "Xbox One"),
+    ("Mario Kart 8 Deluxe", "Nintendo Switch"),
+    ("Uncharted 3: Drake's Deception", "PlayStation 3"),
+    ("FIFA 23", "PlayStation 4"),
+)
+
+
+def _literal(valores, aleatorio):
+    # Literal Python de uma lista, às vezes com aspas duplas (como no arquivo original).
+    if aleatorio.random() < 0.05:
+        return "[" + ", ".join(json.dumps(valor) for valor in valores) + "]"
+    return repr(list(valores))
+
+
+def _local(aleatorio):
+    estado = aleatorio.choice(tuple(CIDADES))
+    cidade = aleatorio.choice(CIDADES[estado])
+    sorteio = aleatorio.random()
+    if sorteio < 0.01:
+        estado = ""  # Vai para a partição de quarentena.
+    elif sorteio < 0.02:
+        estado = estado.lower()
+    return cidade, estado
+
+
+def gerar_usuarios_novos(caminho, linhas, semente=42):
+    """
+    Gera um arquivo de usuários novos sintético, no formato de `dados_usuarios_novos.txt`.
+
+    O arquivo é delimitado por ";", com datas de nascimento em vários formatos (inclusive
+    formatos não reconhecidos e datas vazias), idades às vezes vazias e listas em literais
+    Python, às vezes vazias ou com aspas duplas.
+
+    Args:
+        caminho (str): Arquivo de saída.
+        linhas (int): Quantidade de usuários.
+        semente (int): Semente do gerador aleatório (o arquivo é sempre o mesmo para a mesma
+            semente).
+    """
+    aleatorio = random.Random(semente)
+    formatos, pesos = zip(*FORMATOS_DATA)
+    hoje = date(2024, 12, 31)
+
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";")
+        escritor.writerow(
+            [
+                "id",
+                "nome",
+                "sobrenome",
+                "email",
+                "idade",
+                "data de nascimento",
+                "cidade",
+                "estado",
+                "hobbies",
+                "linguagens de programação",
+                "jogos",
+            ]
+        )
+        for posicao in range(linhas):
+            nome = aleatorio.choice(PRIMEIROS_NOMES)
+            nascimento = date.fromordinal(
+                aleatorio.randint(
+                    date(1950, 1, 1).toordinal(), date(2010, 12, 31).toordinal()
+                )
+            )
+            formato = aleatorio.choices(formatos, pesos)[0]
+            idade = hoje.year - nascimento.year
+            cidade, estado = _local(aleatorio)
+
+            escritor.writerow(
+                [
+                    f"{posicao:08x}",
+                    nome,
+                    " ".join(aleatorio.sample(SOBRENOMES, 2)),
+                    f"usuario{posicao}@example.com" if aleatorio.random() < 0.9 else "",
+                    f"{idade:.1f}" if aleatorio.random() < 0.9 else "",
+                    nascimento.strftime(formato) if formato else "",
+                    cidade,
+                    estado,
+                    _literal(
+                        aleatorio.sample(HOBBIES, aleatorio.randint(0, 5)), aleatorio
+                    ),
+                    _literal(
+                        aleatorio.sample(LINGUAGENS, aleatorio.randint(0, 5)), aleatorio
+                    ),
+                    repr(aleatorio.sample(JOGOS, aleatorio.randint(0, 3))),
+                ]
+            )
+
+
+def gerar_rede(caminho, linhas, semente=42):
+    """
+    Gera um arquivo da rede sintético, no formato de `rede_INFNET_atualizado.txt` (delimitado
+    por "?", com uma quantidade variável de amigos no fim de cada linha).
+
+    Args:
+        caminho (str): Arquivo de saída.
+        linhas (int): Quantidade de infnetianos.
+        semente (int): Semente do gerador aleatório.
+    """
+    aleatorio = random.Random(semente)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("nome?idade?cidade?estado?amigos\n")
+        for _ in range(linhas):
+            cidade, estado = _local(aleatorio)
+            campos = [
+                aleatorio.choice(PRIMEIROS_NOMES),
+                str(aleatorio.randint(14, 75)),
+                cidade,
+                estado,
+                *aleatorio.sample(PRIMEIROS_NOMES, aleatorio.randint(0, 4)),
+            ]
+            arquivo.write("?".join(campos) + "\n")
+
+
+def metadados():
+    """
+    Returns:
+        dict: Commit atual (se houver um repositório git), data e versões, para identificar uma
+        execução do benchmark.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+    }
+
+
+class _Medidor:
+    # Executa as etapas, guardando o tempo de cada uma; a saída delas na tela é descartada.
+    def __init__(self, escala):
+        self.escala = escala
+        self.resultados = []
+
+    def medir(self, etapa, funcao, *argumentos, linhas=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            valor = funcao(*argumentos)
+            segundos = time.perf_counter() - inicio
+
+        self.resultados.append(
+            {
+                "escala": self.escala,
+                "etapa": etapa,
+                "segundos": segundos,
+                "linhas": linhas if linhas is not None else _tamanho(valor),
+            }
+        )
+        return valor
+
+
+def _tamanho(valor):
+    try:
+        return len(valor)
+    except TypeError:
+        return None
+
+
+def _medir_escala(escala, semente, ano_referencia):
+    # Metade dos usuários em cada arquivo bruto; as etapas de main.py usam caminhos relativos,
+    # então rodam dentro de um diretório temporário com ./brutos e ./gerados.
+    medidor = _Medidor(escala)
+    linhas_rede = escala // 2
+
+    gerar_rede("./brutos/rede_INFNET_atualizado.txt", linhas_rede, semente)
+    gerar_usuarios_novos(
+        "./brutos/dados_usuarios_novos.txt", escala - linhas_rede, semente
+    )
+
+    linhas = medidor.medir("abrir_portas", main.abrir_portas)
+    infnetianos = medidor.medir("estruturar_dados", main.estruturar_dados, linhas)
+
+    diario = medidor.medir(
+        "cadastro (DiarioInfnetianos.criar)",
+        DiarioInfnetianos.criar,
+        "./gerados/INFwebNET.json",
+        infnetianos,
+        linhas=len(infnetianos),
+    )
+    with mock.patch("builtins.input", return_value=""):
+        cadastro = medidor.medir(
+            "inserir_infnetianos", main.inserir_infnetianos, diario, None
+        )
+    medidor.medir(
+        "carregar_lote",
+        carregar_lote,
+        diario,
+        enumerate(
+            (
+                {**registro, "id": None, "jogos": [], "hobbies": []}
+                for registro in cadastro[:1000]
+            ),
+            start=1,
+        ),
+        linhas=min(len(cadastro), 1000),
+    )
+    diario.fechar()
+
+    medidor.medir(
+        "ler_usuarios_novos",
+        ler_usuarios_novos,
+        "./brutos/dados_usuarios_novos.txt",
+    )
+    organizados = medidor.medir("organizar", main.organizar, cadastro, ano_referencia)
+    completos = medidor.medir(
+        "completar_dados", main.completar_dados, organizados, ano_referencia
+    )
+    infnetianos_df = medidor.medir("guardar", main.guardar, completos)
+
+    medidor.medir(
+        "selecionar_grupos",
+        main.selecionar_grupos,
+        infnetianos_df,
+        linhas=len(infnetianos_df),
+    )
+    trending = medidor.medir(
+        "contar_trending",
+        main.contar_trending,
+        infnetianos_df,
+        linhas=len(infnetianos_df),
+    )
+    indice_datas = medidor.medir("indexar_datas", main.indexar_datas, infnetianos_df)
+    indice_nomes = medidor.medir("indexar_nomes", main.indexar_nomes, infnetianos_df)
+
+    medidor.medir(
+        "filtrar_por_ano_nascimento",
+        main.filtrar_por_ano_nascimento,
+        infnetianos_df,
+        indice_datas,
+        2000,
+        2010,
+        False,
+    )
+    with mock.patch("builtins.input", return_value=""):
+        medidor.medir(
+            "buscar_infnetiano",
+            main.buscar_infnetiano,
+            infnetianos_df,
+            indice_nomes,
+            "João",
+            linhas=len(indice_nomes.buscar("João")),
+        )
+    medidor.medir(
+        "linguagens_trending",
+        main.linguagens_trending,
+        trending,
+        linhas=len(infnetianos_df),
+    )
+
+    resultado = medidor.medir(
+        "processar_em_blocos",
+        processar_em_blocos,
+        "./brutos/rede_INFNET_atualizado.txt",
+        "./brutos/dados_usuarios_novos.txt",
+        "./gerados/em_blocos",
+        ano_referencia,
+    )
+    medidor.resultados[-1]["linhas"] = resultado["registros"]
+
+    return medidor.resultados
+
+
+def executar_benchmark(escalas=ESCALAS, semente=42, ano_referencia=2024):
+    """
+    Mede cada etapa do pipeline do TP2 em dados sintéticos de vários tamanhos.
+
+    Para cada escala, os dois arquivos brutos são gerados (metade dos usuários em cada um) em um
+    diretório temporário e as etapas de `main.py` são executadas em sequência, sem as perguntas
+    pelo teclado; o modo em blocos (`processar_em_blocos`) é medido por inteiro no fim.
+
+    Args:
+        escalas (tuple): Quantidades de usuários.
+        semente (int): Semente dos geradores.
+        ano_referencia (int): Ano usado nas estimativas de data de nascimento (fixo, para que os
+            resultados não dependam da data da execução).
+
+    Returns:
+        dict: Os `metadados`, os parâmetros e uma lista de medições (escala, etapa, segundos e
+        linhas processadas).
+    """
+    resultados = []
+    diretorio_original = os.getcwd()
+
+    for escala in escalas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.makedirs(os.path.join(diretorio, "brutos"))
+            os.makedirs(os.path.join(diretorio, "gerados"))
+            os.chdir(diretorio)
+            try:
+                resultados.extend(_medir_escala(escala, semente, ano_referencia))
+            finally:
+                os.chdir(diretorio_original)
+
+    return {
+        "projeto": "renato_redoglia_DR4_TP2",
+        **metadados(),
+        "semente": semente,
+        "escalas": list(escalas),
+        "resultados": resultados,
+    }
+
+
+def comparar_resultados(anterior, atual, tolerancia=0.2):
+    """
+    Compara duas execuções do benchmark, etapa a etapa.
+
+    Args:
+        anterior (dict): Resultado de uma execução anterior (ex.: de outro commit).
+        atual (dict): Resultado da execução atual.
+        tolerancia (float): Aumento relativo de tempo a partir do qual a etapa é uma regressão.
+
+    Returns:
+        list: Um dicionário por (escala, etapa) presente nas duas execuções, com os tempos, a
+        razão atual/anterior e se houve regressão.
+    """
+    tempos_anteriores = {
+        (medicao["escala"], medicao["etapa"]): medicao["segundos"]
+        for medicao in anterior["resultados"]
+    }
+
+    comparacao = []
+    for medicao in atual["resultados"]:
+        chave = (medicao["escala"], medicao["etapa"])
+        if chave not in tempos_anteriores:
+            continue
+        razao = medicao["segundos"] / max(tempos_anteriores[chave], 1e-9)
+        comparacao.append(
+            {
+                "escala": medicao["escala"],
+                "etapa": medicao["etapa"],
+                "anterior_s": tempos_anteriores[chave],
+                "atual_s": medicao["segundos"],
+                "razao": razao,
+                "regressao": razao > 1 + tolerancia,
+            }
+        )
+    return comparacao
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark das etapas do TP2 em dados sintéticos."
+    )
+    argumentos.add_argument(
+        "--escalas",
+        nargs="+",
+        type=int,
+        default=list(ESCALAS),
+        help="Quantidades de usuários (ex.: 1000 100000 10000000).",
+    )
+    argumentos.add_argument("--semente", type=int, default=42)
+    argumentos.add_argument("--saida", default="benchmark_tp2.json")
+    argumentos.add_argument(
+        "--comparar",
+        metavar="ARQUIVO",
+        help="Resultado anterior (JSON) com o qual comparar esta execução.",
+    )
+    argumentos.add_argument("--tolerancia", type=float, default=0.2)
+    args = argumentos.parse_args()
+
+    resultado = executar_benchmark(tuple(args.escalas), args.semente)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=4)
+
+    for medicao in resultado["resultados"]:
+        print(
+            f"{medicao['escala']:>10} {medicao['etapa']:<36} {medicao['segundos']:>9.3f} s"
+        )
+    print(f"\nResultados gravados em '{args.saida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        for item in comparar_resultados(anterior, resultado, args.tolerancia):
+            marca = "  REGRESSÃO" if item["regressao"] else ""
+            print(
+                f"{item['escala']:>10} {item['etapa']:<36} {item['anterior_s']:>9.3f} s -> "
+                f"{item['atual_s']:>9.3f} s ({item['razao']:.2f}x){marca}"
+            )
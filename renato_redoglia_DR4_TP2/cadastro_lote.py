@@ -0,0 +1,346 @@
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import islice
+
+from diario import DiarioInfnetianos
+from ingestao import ler_literal
+
+IDADE_MINIMA = 0
+IDADE_MAXIMA = 120
+MAXIMO_ITENS = 5  # Hobbies e jogos por infnetiano, como em `atualizar_infnetiano`.
+CAMPOS_TEXTO = ("nome", "cidade", "estado")
+FORMATOS = ("ndjson", "csv")
+MAXIMO_ERROS_RELATORIO = 20
+
+
+def detectar_formato(caminho):
+    """
+    Args:
+        caminho (str): Caminho do arquivo ("-" para a entrada padrão).
+
+    Returns:
+        str: "csv" para arquivos .csv e .txt; "ndjson" para os demais (inclusive a entrada
+        padrão).
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    return "csv" if extensao in (".csv", ".txt") else "ndjson"
+
+
+def ler_registros(arquivo, formato):
+    """
+    Lê os registros de um arquivo aberto, um de cada vez.
+
+    No NDJSON, cada linha não vazia é um objeto JSON. No CSV (delimitado por ";", com
+    cabeçalho, como `dados_usuarios_novos.txt`), as colunas de lista aceitam o literal Python
+    (`['a', 'b']`, `[('jogo', 'plataforma')]`) ou, para hobbies e linguagens, os valores
+    separados por vírgula, como no cadastro pelo teclado.
+
+    Args:
+        arquivo: O arquivo, aberto em modo texto.
+        formato (str): "ndjson" ou "csv".
+
+    Yields:
+        tuple: (número da linha, registro); o registro é None se a linha não puder ser lida.
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    if formato == "ndjson":
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except json.JSONDecodeError:
+                yield numero, None
+    elif formato == "csv":
+        leitor = csv.DictReader(arquivo, delimiter=";")
+        for registro in leitor:
+            yield leitor.line_num, registro
+    else:
+        raise ValueError(
+            f"Formato não suportado: '{formato}'. Opções: {', '.join(FORMATOS)}."
+        )
+
+
+def _lista(valor):
+    if valor is None or valor == "":
+        return []
+    if isinstance(valor, str):
+        if valor.lstrip().startswith("["):
+            return ler_literal(valor)
+        return [item.strip() for item in valor.split(",")]
+    if not isinstance(valor, (list, tuple)):
+        raise ValueError(f"esperada uma lista, recebido {type(valor).__name__}")
+    return valor
+
+
+def _jogo(jogo):
+    if isinstance(jogo, dict):
+        jogo = (jogo.get("nome"), jogo.get("plataforma"))
+    if (
+        not isinstance(jogo, (list, tuple))
+        or len(jogo) != 2
+        or not all(isinstance(parte, str) and parte.strip() for parte in jogo)
+    ):
+        raise ValueError(f"jogo inválido: {jogo!r}")
+    return {"nome": jogo[0].strip(), "plataforma": jogo[1].strip()}
+
+
+def _presente(registro, campo):
+    # Campos ausentes, nulos ou vazios (células vazias no CSV) não foram informados.
+    return registro.get(campo) not in (None, "")
+
+
+def validar_registro(registro, atualizacao=False):
+    """
+    Valida um registro e o converte para o formato do cadastro ampliado.
+
+    Em uma inclusão, nome, idade, cidade e estado são obrigatórios e as listas ausentes ficam
+    vazias. Em uma atualização, todos os campos são opcionais e só os informados entram no
+    registro convertido: os demais mantêm o valor atual, como as respostas em branco em
+    `atualizar_infnetiano`.
+
+    Args:
+        registro (dict): O registro lido.
+        atualizacao (bool): Se o registro atualiza um infnetiano já cadastrado.
+
+    Returns:
+        tuple: (registro convertido, None) ou (None, motivo da rejeição).
+    """
+    if not isinstance(registro, dict):
+        return None, "linha ilegível"
+
+    convertido = {}
+    if registro.get("id"):
+        convertido["id"] = str(registro["id"])
+
+    for campo in CAMPOS_TEXTO:
+        if atualizacao and not _presente(registro, campo):
+            continue
+        valor = registro.get(campo)
+        if not isinstance(valor, str) or not valor.strip():
+            return None, f"'{campo}' ausente ou vazio"
+        convertido[campo] = valor.strip()
+
+    if not atualizacao or _presente(registro, "idade"):
+        try:
+            idade = float(registro.get("idade"))
+        except (TypeError, ValueError):
+            return None, "'idade' não é um número"
+        if not math.isfinite(idade) or idade != int(idade):
+            return None, "'idade' não é um número inteiro"
+        if not IDADE_MINIMA <= idade <= IDADE_MAXIMA:
+            return None, f"'idade' fora do intervalo {IDADE_MINIMA}-{IDADE_MAXIMA}"
+        convertido["idade"] = int(idade)
+
+    listas = {}
+    try:
+        for campo in ("hobbies", "linguagens de programação", "jogos"):
+            if atualizacao and not _presente(registro, campo):
+                continue
+            listas[campo] = _lista(registro.get(campo))
+        if "jogos" in listas:
+            listas["jogos"] = [_jogo(jogo) for jogo in listas["jogos"]]
+    except (ValueError, SyntaxError, TypeError) as erro:
+        return None, f"lista inválida ({erro})"
+
+    for campo in ("hobbies", "linguagens de programação"):
+        if campo in listas and not all(
+            isinstance(valor, str) for valor in listas[campo]
+        ):
+            return None, f"'{campo}' precisa ser uma lista de textos"
+    if len(listas.get("hobbies", ())) > MAXIMO_ITENS:
+        return None, f"mais de {MAXIMO_ITENS} hobbies"
+    if len(listas.get("jogos", ())) > MAXIMO_ITENS:
+        return None, f"mais de {MAXIMO_ITENS} jogos"
+
+    for campo in ("hobbies", "linguagens de programação"):
+        if campo in listas:
+            convertido[campo] = [valor.strip() for valor in listas[campo]]
+    if "jogos" in listas:
+        convertido["jogos"] = listas["jogos"]
+    return convertido, None
+
+
+def carregar_lote(diario, registros, tamanho_lote=1000):
+    """
+    Valida e grava registros no cadastro, um lote de cada vez.
+
+    Cada lote é validado por inteiro e os registros aceitos são gravados com
+    `DiarioInfnetianos.gravar_lote`: uma escrita e um `fsync` por lote. Registros com o id de
+    um infnetiano já cadastrado atualizam só os campos informados desse infnetiano (ver
+    `validar_registro`).
+
+    Args:
+        diario (DiarioInfnetianos): O cadastro.
+        registros: Pares (número da linha, registro), como os de `ler_registros`.
+        tamanho_lote (int): Quantidade de registros por lote.
+
+    Returns:
+        dict: Quantidades de aceitos e rejeitados, o tempo em segundos, os registros por
+        segundo e as primeiras rejeições, como pares (linha, motivo).
+    """
+    registros = iter(registros)
+    aceitos = rejeitados = 0
+    erros = []
+
+    inicio = time.perf_counter()
+    while lote := list(islice(registros, tamanho_lote)):
+        validos = []
+        for numero, registro in lote:
+            atualizacao = (
+                isinstance(registro, dict)
+                and bool(registro.get("id"))
+                and diario.obter(str(registro["id"])) is not None
+            )
+            convertido, motivo = validar_registro(registro, atualizacao)
+            if motivo is None:
+                validos.append(convertido)
+                continue
+            rejeitados += 1
+            if len(erros) < MAXIMO_ERROS_RELATORIO:
+                erros.append((numero, motivo))
+
+        diario.gravar_lote(validos)
+        aceitos += len(validos)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "aceitos": aceitos,
+        "rejeitados": rejeitados,
+        "segundos": segundos,
+        "registros_por_segundo": (aceitos + rejeitados) / segundos if segundos else 0.0,
+        "erros": erros,
+    }
+
+
+def carregar_arquivo(diario, caminho, formato=None, tamanho_lote=1000):
+    """
+    `carregar_lote` a partir de um arquivo NDJSON ou CSV ("-" para a entrada padrão).
+
+    Args:
+        diario (DiarioInfnetianos): O cadastro.
+        caminho (str): Caminho do arquivo.
+        formato (str, optional): "ndjson" ou "csv"; por padrão, pela extensão do arquivo.
+        tamanho_lote (int): Quantidade de registros por lote.
+
+    Returns:
+        dict: O relatório de `carregar_lote`.
+    """
+    formato = formato or detectar_formato(caminho)
+    if caminho == "-":
+        return carregar_lote(diario, ler_registros(sys.stdin, formato), tamanho_lote)
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        return carregar_lote(diario, ler_registros(arquivo, formato), tamanho_lote)
+
+
+def exibir_relatorio(relatorio):
+    """
+    Mostra o resumo de uma carga na tela.
+    """
+    print(
+        f"{relatorio['aceitos']} registro(s) aceito(s), {relatorio['rejeitados']} "
+        f"rejeitado(s) em {relatorio['segundos']:.2f} s "
+        f"({relatorio['registros_por_segundo']:.0f} registros/s)."
+    )
+    for numero, motivo in relatorio["erros"]:
+        print(f"  linha {numero}: {motivo}")
+    if relatorio["rejeitados"] > len(relatorio["erros"]):
+        print(f"  ... e mais {relatorio['rejeitados'] - len(relatorio['erros'])}.")
+
+
+def _gerar_registros(quantidade, semente):
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        yield {
+            "nome": aleatorio.choice(("Ana", "João", "Maria", "Pedro", "Júlia")),
+            "idade": aleatorio.randint(15, 70),
+            "cidade": aleatorio.choice(("Rio de Janeiro", "Recife", "Curitiba")),
+            "estado": aleatorio.choice(("RJ", "PE", "PR")),
+            "hobbies": aleatorio.sample(("leitura", "cinema", "futebol", "xadrez"), 2),
+            "linguagens de programação": ["Python"],
+            "jogos": [{"nome": "Minecraft", "plataforma": "PC"}],
+        }
+
+
+def benchmark_lote(registros=20_000, tamanho_lote=1000):
+    """
+    Compara um `inserir` mais `sincronizar` por registro (como no cadastro pelo teclado) com a
+    carga em lotes, em um cadastro temporário.
+
+    Args:
+        registros (int): Quantidade de registros sintéticos.
+        tamanho_lote (int): Quantidade de registros por lote.
+
+    Returns:
+        dict: Os registros por segundo de cada forma de carga.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "INFwebNET.json")
+
+        with DiarioInfnetianos.criar(caminho, []) as diario:
+            inicio = time.perf_counter()
+            for registro in _gerar_registros(registros, semente=42):
+                convertido, _ = validar_registro(registro)
+                diario.inserir(convertido)
+                diario.sincronizar()
+            por_registro = registros / (time.perf_counter() - inicio)
+
+        with DiarioInfnetianos.criar(caminho, []) as diario:
+            relatorio = carregar_lote(
+                diario,
+                enumerate(_gerar_registros(registros, semente=42), start=1),
+                tamanho_lote,
+            )
+
+    return {
+        "registros": registros,
+        "por_registro_rps": por_registro,
+        "em_lotes_rps": relatorio["registros_por_segundo"],
+    }
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Carga em lote de infnetianos a partir de NDJSON ou CSV."
+    )
+    argumentos.add_argument(
+        "arquivo",
+        nargs="?",
+        help='Arquivo NDJSON ou CSV ("-" para a entrada padrão).',
+    )
+    argumentos.add_argument("--formato", choices=FORMATOS)
+    argumentos.add_argument("--cadastro", default="./gerados/INFwebNET.json")
+    argumentos.add_argument("--tamanho-lote", type=int, default=1000)
+    argumentos.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="REGISTROS",
+        help="Compara a carga registro a registro com a carga em lotes.",
+    )
+    args = argumentos.parse_args()
+
+    if args.benchmark:
+        resultado = benchmark_lote(args.benchmark, args.tamanho_lote)
+        print(
+            f"{resultado['registros']} registros: um por vez "
+            f"{resultado['por_registro_rps']:.0f} registros/s, em lotes "
+            f"{resultado['em_lotes_rps']:.0f} registros/s "
+            f"({resultado['em_lotes_rps'] / resultado['por_registro_rps']:.1f}x)."
+        )
+    elif args.arquivo:
+        with DiarioInfnetianos(args.cadastro) as diario:
+            exibir_relatorio(
+                carregar_arquivo(diario, args.arquivo, args.formato, args.tamanho_lote)
+            )
+            diario.compactar()
+    else:
+        argumentos.error("informe o arquivo ou --benchmark.")
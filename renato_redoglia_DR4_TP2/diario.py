@@ -0,0 +1,308 @@
+import json
+import os
+import secrets
+import threading
+
+
+def _fsync_diretorio(caminho):
+    # Garante que a troca de nomes feita por os.replace também chegue ao disco.
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descritor = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_DIRECTORY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+def _gravar_atomico(caminho, conteudo):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    _fsync_diretorio(caminho)
+
+
+def _gravar_snapshot(caminho, registros):
+    conteudo = json.dumps(registros, ensure_ascii=False, indent=4, default=str)
+    _gravar_atomico(caminho, conteudo.encode("utf-8"))
+
+
+def _com_id(registro, identificador):
+    # O id vai como primeiro campo e substitui o "id" do registro, que pode ser vazio ou None.
+    return {
+        "id": identificador,
+        **{campo: valor for campo, valor in registro.items() if campo != "id"},
+    }
+
+
+def _arquivo_diario_padrao(arquivo_snapshot):
+    return os.path.splitext(arquivo_snapshot)[0] + ".diario.jsonl"
+
+
+class DiarioInfnetianos:
+    """
+    Cadastro de infnetianos guardado como um snapshot JSON mais um diário de alterações.
+
+    O snapshot é a lista de registros (o mesmo formato de `INFwebNET.json`). Cada inserção ou
+    atualização é acrescentada ao diário, um arquivo JSON Lines com um evento por linha,
+    identificado pelo "id" do registro: o custo de escrita de uma alteração não depende do
+    tamanho do cadastro. Os `fsync` são feitos em lotes de `eventos_por_fsync` eventos (ou em
+    `sincronizar`).
+
+    `compactar` grava um snapshot novo com o estado atual e esvazia o diário. O snapshot é
+    gravado em um arquivo temporário e trocado com `os.replace`, então uma queda no meio da
+    gravação deixa o snapshot anterior intacto; uma linha incompleta no fim do diário (queda no
+    meio de um evento) é descartada na leitura. Como os eventos são idempotentes, reaplicar o
+    diário sobre um snapshot que já os contém não muda o resultado.
+    """
+
+    def __init__(self, arquivo_snapshot, arquivo_diario=None, eventos_por_fsync=32):
+        """
+        Args:
+            arquivo_snapshot (str): Arquivo JSON com a lista de registros.
+            arquivo_diario (str, optional): Arquivo do diário; por padrão, o nome do snapshot
+                com a extensão ".diario.jsonl".
+            eventos_por_fsync (int): Quantidade de eventos entre dois `fsync` do diário.
+        """
+        self.arquivo_snapshot = arquivo_snapshot
+        self.arquivo_diario = arquivo_diario or _arquivo_diario_padrao(arquivo_snapshot)
+        self.eventos_por_fsync = eventos_por_fsync
+
+        self._trava = threading.RLock()
+        self._trava_compactacao = threading.Lock()
+        self._registros = {}
+        self._pendentes = 0
+        self._diario = None
+        self._carregar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self):
+        return len(self._registros)
+
+    def _carregar(self):
+        if os.path.exists(self.arquivo_snapshot):
+            with open(self.arquivo_snapshot, encoding="utf-8") as arquivo:
+                for registro in json.load(arquivo):
+                    identificador = registro.get("id") or secrets.token_hex(4)
+                    self._registros[identificador] = _com_id(registro, identificador)
+
+        valido_ate = 0
+        if os.path.exists(self.arquivo_diario):
+            with open(self.arquivo_diario, "rb") as arquivo:
+                for linha in arquivo:
+                    if not linha.endswith(b"\n"):
+                        break  # Última linha incompleta: evento interrompido por uma queda.
+                    self._aplicar(json.loads(linha))
+                    valido_ate += len(linha)
+
+        self._diario = open(self.arquivo_diario, "ab")
+        self._diario.truncate(valido_ate)
+
+    def _aplicar(self, evento):
+        identificador = evento["id"]
+        if evento["op"] == "inserir":
+            self._registros[identificador] = dict(evento["registro"])
+        else:
+            registro = self._registros.setdefault(identificador, {"id": identificador})
+            registro.update(evento["alteracoes"])
+
+    def _anexar(self, *eventos):
+        # Todos os eventos vão em uma única escrita no diário.
+        linhas = "".join(
+            json.dumps(evento, ensure_ascii=False, default=str) + "\n"
+            for evento in eventos
+        )
+        with self._trava:
+            self._diario.write(linhas.encode("utf-8"))
+            self._diario.flush()
+            for evento in eventos:
+                self._aplicar(evento)
+            self._pendentes += len(eventos)
+            if self._pendentes >= self.eventos_por_fsync:
+                self.sincronizar()
+
+    def registros(self):
+        """
+        Returns:
+            list: Cópias dos registros, na ordem de inserção.
+        """
+        with self._trava:
+            return [dict(registro) for registro in self._registros.values()]
+
+    def obter(self, identificador):
+        """
+        Returns:
+            dict: Cópia do registro com esse id, ou None se não existir.
+        """
+        with self._trava:
+            registro = self._registros.get(identificador)
+            return None if registro is None else dict(registro)
+
+    def inserir(self, registro):
+        """
+        Acrescenta (ou substitui) um registro.
+
+        Args:
+            registro (dict): O registro; sem "id", recebe um novo.
+
+        Returns:
+            str: O id do registro.
+        """
+        identificador = registro.get("id") or secrets.token_hex(4)
+        self._anexar(
+            {
+                "op": "inserir",
+                "id": identificador,
+                "registro": _com_id(registro, identificador),
+            }
+        )
+        return identificador
+
+    def atualizar(self, identificador, alteracoes):
+        """
+        Altera campos de um registro (que é criado, se ainda não existir).
+
+        Args:
+            identificador (str): O id do registro.
+            alteracoes (dict): Campos novos ou alterados.
+        """
+        alteracoes = {
+            campo: valor for campo, valor in alteracoes.items() if campo != "id"
+        }
+        self._anexar({"op": "atualizar", "id": identificador, "alteracoes": alteracoes})
+
+    def gravar_lote(self, registros):
+        """
+        Grava um lote de registros com uma única escrita no diário e um único `fsync`.
+
+        Registros sem "id", ou com um id ainda não cadastrado, são inseridos; os demais
+        atualizam o registro existente, como `atualizar`.
+
+        Args:
+            registros (list): Os registros.
+
+        Returns:
+            list: O id de cada registro, na mesma ordem.
+        """
+        eventos = []
+        with self._trava:
+            for registro in registros:
+                identificador = registro.get("id")
+                if identificador and identificador in self._registros:
+                    alteracoes = {
+                        campo: valor
+                        for campo, valor in registro.items()
+                        if campo != "id"
+                    }
+                    eventos.append(
+                        {
+                            "op": "atualizar",
+                            "id": identificador,
+                            "alteracoes": alteracoes,
+                        }
+                    )
+                else:
+                    identificador = identificador or secrets.token_hex(4)
+                    eventos.append(
+                        {
+                            "op": "inserir",
+                            "id": identificador,
+                            "registro": _com_id(registro, identificador),
+                        }
+                    )
+
+            if eventos:
+                self._anexar(*eventos)
+                self.sincronizar()
+        return [evento["id"] for evento in eventos]
+
+    def sincronizar(self):
+        """
+        Força a gravação em disco (`fsync`) dos eventos ainda não sincronizados.
+        """
+        with self._trava:
+            if self._pendentes:
+                self._diario.flush()
+                os.fsync(self._diario.fileno())
+                self._pendentes = 0
+
+    @classmethod
+    def criar(cls, arquivo_snapshot, registros, **opcoes):
+        """
+        Cria um cadastro novo: grava o snapshot com `registros` e esvazia o diário.
+
+        Args:
+            arquivo_snapshot (str): Arquivo JSON do snapshot (substituído se existir).
+            registros (list): Os registros; os que não têm "id" recebem um novo.
+            **opcoes: Demais argumentos de `DiarioInfnetianos`.
+
+        Returns:
+            DiarioInfnetianos: O cadastro.
+        """
+        registros = [
+            _com_id(registro, registro.get("id") or secrets.token_hex(4))
+            for registro in registros
+        ]
+        _gravar_snapshot(arquivo_snapshot, registros)
+        _gravar_atomico(
+            opcoes.get("arquivo_diario") or _arquivo_diario_padrao(arquivo_snapshot),
+            b"",
+        )
+        return cls(arquivo_snapshot, **opcoes)
+
+    def compactar(self):
+        """
+        Grava o estado atual como snapshot e tira do diário os eventos já incluídos nele.
+
+        A gravação do snapshot acontece fora da trava: inserções e atualizações feitas enquanto
+        isso continuam no diário.
+        """
+        with self._trava_compactacao:
+            with self._trava:
+                self.sincronizar()
+                registros = self.registros()
+                deslocamento = self._diario.seek(0, os.SEEK_END)
+
+            _gravar_snapshot(self.arquivo_snapshot, registros)
+            with self._trava:
+                self._descartar_diario_ate(deslocamento)
+
+    def compactar_em_segundo_plano(self):
+        """
+        Executa `compactar` em uma thread.
+
+        Returns:
+            threading.Thread: A thread (use `join` para esperar o fim da compactação).
+        """
+        thread = threading.Thread(target=self.compactar, name="compactacao-diario")
+        thread.start()
+        return thread
+
+    def _descartar_diario_ate(self, deslocamento):
+        # Mantém só os eventos gravados depois de `deslocamento` (durante a compactação).
+        self._diario.flush()
+        with open(self.arquivo_diario, "rb") as arquivo:
+            arquivo.seek(deslocamento)
+            restante = arquivo.read()
+
+        self._diario.close()
+        _gravar_atomico(self.arquivo_diario, restante)
+        self._diario = open(self.arquivo_diario, "ab")
+        self._pendentes = 0
+
+    def fechar(self):
+        """
+        Sincroniza e fecha o diário.
+        """
+        with self._trava:
+            if self._diario is not None and not self._diario.closed:
+                self.sincronizar()
+                self._diario.close()
@@ -0,0 +1,153 @@
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def _datas_primeiro_de_janeiro(anos):
+    # Ano -> 1º de janeiro daquele ano, direto em datetime64 (sem passar por texto).
+    return (
+        (np.asarray(anos, dtype="int64") - 1970)
+        .astype("datetime64[Y]")
+        .astype("datetime64[ns]")
+    )
+
+
+def enriquecer_infnetianos(df, ano_referencia=None):
+    """
+    Completa idade, data de nascimento e ano de nascimento dos infnetianos com operações sobre
+    colunas inteiras.
+
+    - Sem idade e com data de nascimento: a idade vem da data, a fonte mais precisa.
+    - Sem data de nascimento e com idade: a data é estimada como 1º de janeiro do ano de
+      nascimento (simplificação comum com dados incompletos).
+    - "ano nascimento" é o ano de referência menos a idade (já completada); sem idade nem data,
+      as três colunas ficam nulas.
+
+    Args:
+        df (pd.DataFrame): Infnetianos com as colunas 'idade' e 'data de nascimento'.
+        ano_referencia (int, optional): Ano usado no cálculo das idades; por padrão, o atual.
+
+    Returns:
+        pd.DataFrame: Uma cópia de `df` com 'idade' (float, NaN se desconhecida),
+        'data de nascimento' (datetime64, NaT se desconhecida) e 'ano nascimento' (Int64).
+    """
+    if ano_referencia is None:
+        ano_referencia = datetime.now().year
+
+    df = df.copy()
+    idades = pd.to_numeric(df["idade"], errors="coerce").to_numpy(
+        dtype="float64", copy=True
+    )
+    datas = pd.to_datetime(
+        df["data de nascimento"], errors="coerce", cache=False
+    ).to_numpy(dtype="datetime64[ns]", copy=True)
+
+    sem_idade = np.isnan(idades) & ~np.isnat(datas)
+    anos_das_datas = datas[sem_idade].astype("datetime64[Y]").astype("int64") + 1970
+    idades[sem_idade] = ano_referencia - anos_das_datas
+
+    com_idade = ~np.isnan(idades)
+    anos = np.zeros(len(idades), dtype="int64")
+    anos[com_idade] = ano_referencia - idades[com_idade]
+
+    sem_data = np.isnat(datas) & com_idade
+    datas[sem_data] = _datas_primeiro_de_janeiro(anos[sem_data])
+
+    df["idade"] = idades
+    df["data de nascimento"] = datas
+    df["ano nascimento"] = pd.arrays.IntegerArray(anos, ~com_idade)
+    return df
+
+
+def _enriquecer_linha_a_linha(df, ano_referencia):
+    # Os passos 8 e 9 originais (com apply por linha), mantidos como referência para o benchmark.
+    df = df.copy()
+    df["ano nascimento"] = (ano_referencia - df["idade"].fillna(0)).astype(int)
+
+    def completando_idade(x):
+        if pd.isna(x["idade"]) and pd.notna(x["data de nascimento"]):
+            return int(ano_referencia - x["data de nascimento"].year)
+        else:
+            return x["idade"]
+
+    df["idade"] = df.apply(completando_idade, axis=1)
+
+    def completando_data_de_nascimento(x):
+        if pd.isna(x["data de nascimento"]) and pd.notna(x["idade"]):
+            return datetime(x["ano nascimento"], 1, 1)
+        else:
+            return x["data de nascimento"]
+
+    df["data de nascimento"] = df.apply(completando_data_de_nascimento, axis=1)
+    return df
+
+
+def _gerar_infnetianos_sinteticos(linhas, semente, ano_referencia):
+    gerador = np.random.default_rng(semente)
+    idades = gerador.integers(15, 70, linhas).astype("float64")
+    datas = _datas_primeiro_de_janeiro(ano_referencia - idades) + gerador.integers(
+        0, 365, linhas
+    ).astype("timedelta64[D]")
+
+    # Um terço sem idade, um terço sem data e 1% sem nenhum dos dois.
+    sorteio = gerador.random(linhas)
+    idades[sorteio < 0.34] = np.nan
+    datas[(sorteio >= 0.34) & (sorteio < 0.67)] = np.datetime64("NaT")
+    datas[sorteio >= 0.99] = np.datetime64("NaT")
+    idades[sorteio >= 0.99] = np.nan
+
+    return pd.DataFrame({"idade": idades, "data de nascimento": datas})
+
+
+def benchmark_enriquecimento(linhas=1_000_000, semente=42):
+    """
+    Compara o enriquecimento por colunas com o `apply` por linha dos passos 8 e 9 originais.
+
+    Args:
+        linhas (int): Quantidade de infnetianos sintéticos.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        dict: Os tempos, em segundos, e se idades e datas completadas são iguais.
+    """
+    ano_referencia = datetime.now().year
+    df = _gerar_infnetianos_sinteticos(linhas, semente, ano_referencia)
+
+    inicio = time.perf_counter()
+    colunar = enriquecer_infnetianos(df, ano_referencia)
+    tempo_colunar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    original = _enriquecer_linha_a_linha(df, ano_referencia)
+    tempo_original = time.perf_counter() - inicio
+
+    iguais = np.array_equal(
+        original["idade"].astype("float64"), colunar["idade"], equal_nan=True
+    ) and pd.to_datetime(original["data de nascimento"]).equals(
+        colunar["data de nascimento"]
+    )
+
+    return {
+        "linhas": linhas,
+        "linha_a_linha_s": tempo_original,
+        "colunar_s": tempo_colunar,
+        "iguais": iguais,
+    }
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark do enriquecimento de idades e datas de nascimento."
+    )
+    argumentos.add_argument("--linhas", type=int, default=1_000_000)
+    args = argumentos.parse_args()
+
+    resultado = benchmark_enriquecimento(args.linhas)
+    print(
+        f"{resultado['linhas']} linhas: linha a linha {resultado['linha_a_linha_s']:.2f} s, "
+        f"colunar {resultado['colunar_s'] * 1000:.1f} ms; "
+        f"resultados {'iguais' if resultado['iguais'] else 'DIFERENTES'}."
+    )
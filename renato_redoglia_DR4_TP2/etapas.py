@@ -0,0 +1,360 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+ARQUIVO_ESTADO = "estado.json"
+
+
+def _hash_arquivo(caminho):
+    # None se o arquivo não existir.
+    try:
+        with open(caminho, "rb") as arquivo:
+            return hashlib.file_digest(arquivo, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+class Etapa:
+    """
+    Uma etapa do pipeline: uma função com entradas e saídas declaradas.
+
+    A função recebe os valores das `entradas` como argumentos posicionais, na ordem declarada, e
+    devolve o valor da saída (uma saída), uma tupla na ordem de `saidas` (várias) ou nada.
+    """
+
+    def __init__(
+        self,
+        nome,
+        funcao,
+        entradas=(),
+        saidas=(),
+        arquivos=(),
+        produz=(),
+        console=False,
+        codigo=(),
+        versao=1,
+        apos=(),
+    ):
+        """
+        Args:
+            nome (str): Nome da etapa (único no grafo).
+            funcao (callable): A função da etapa.
+            entradas (tuple): Nomes dos valores recebidos.
+            saidas (tuple): Nomes dos valores devolvidos.
+            arquivos (tuple): Arquivos lidos pela etapa; o conteúdo entra na assinatura.
+            produz (tuple): Arquivos gravados pela etapa; a etapa só é pulada se eles continuarem
+                iguais aos da última execução.
+            console (bool): Etapa que lê do teclado ou escreve na tela. Nunca é pulada e roda em
+                série com as demais etapas de console, na ordem declarada.
+            codigo (tuple): Funções ou módulos usados pela etapa cujo código-fonte também entra
+                na assinatura.
+            versao (int): Versão manual da etapa, para invalidar o cache sem mudar o código.
+            apos (tuple): Nomes de etapas anteriores que precisam terminar antes desta, sem
+                passar valores (ex.: uma etapa que ainda lê um valor que esta altera no lugar).
+        """
+        self.nome = nome
+        self.funcao = funcao
+        self.entradas = tuple(entradas)
+        self.saidas = tuple(saidas)
+        self.arquivos = tuple(arquivos)
+        self.produz = tuple(produz)
+        self.console = console
+        self.codigo = tuple(codigo)
+        self.versao = versao
+        self.apos = tuple(apos)
+
+    def __repr__(self):
+        return f"Etapa({self.nome!r})"
+
+    def hash_codigo(self):
+        """
+        Returns:
+            str: Hash do código-fonte da função (e de `codigo`) e da versão da etapa.
+        """
+        h = hashlib.sha256(f"{self.nome}:v{self.versao}".encode("utf-8"))
+        for objeto in (self.funcao, *self.codigo):
+            h.update(inspect.getsource(objeto).encode("utf-8"))
+        return h.hexdigest()
+
+    def executar(self, argumentos):
+        """
+        Returns:
+            dict: Os valores das saídas, por nome.
+        """
+        resultado = self.funcao(*argumentos)
+        if len(self.saidas) == 0:
+            return {}
+        if len(self.saidas) == 1:
+            return {self.saidas[0]: resultado}
+        return dict(zip(self.saidas, resultado))
+
+
+class GrafoEtapas:
+    """
+    Executa um grafo de etapas, passando os valores entre elas em memória.
+
+    Cada etapa começa assim que as etapas que produzem as suas entradas terminam. As etapas que
+    não são de console rodam em paralelo, em um pool de threads; as de console rodam uma de cada
+    vez, na ordem declarada, para que as perguntas e as mensagens saiam na mesma ordem de sempre.
+
+    Uma etapa que não é de console é pulada quando a sua assinatura (hash do código, das entradas
+    e dos arquivos lidos) é igual à da última execução e os arquivos que ela produz não mudaram:
+    as saídas são lidas do cache em `diretorio`. O hash de um valor é o SHA-256 do seu pickle;
+    valores que não podem ser serializados fazem a etapa rodar sempre.
+    """
+
+    def __init__(
+        self, etapas, diretorio="./gerados/.etapas", max_workers=None, refazer=False
+    ):
+        """
+        Args:
+            etapas (list): As etapas, em uma ordem em que cada entrada é produzida por uma
+                etapa anterior (ou é um valor inicial de `executar`).
+            diretorio (str): Diretório do cache das saídas e do estado das assinaturas.
+            max_workers (int, optional): Threads para as etapas que não são de console.
+            refazer (bool): Ignora o cache e executa todas as etapas.
+
+        Raises:
+            ValueError: Se houver etapas com o mesmo nome ou saídas produzidas por duas etapas.
+        """
+        self.etapas = list(etapas)
+        self.diretorio = diretorio
+        self.max_workers = max_workers
+        self.refazer = refazer
+        self.situacao = {}
+
+        self._produtor = {}
+        nomes = set()
+        for etapa in self.etapas:
+            if etapa.nome in nomes:
+                raise ValueError(f"Etapa repetida: '{etapa.nome}'.")
+            nomes.add(etapa.nome)
+            for saida in etapa.saidas:
+                if saida in self._produtor:
+                    raise ValueError(
+                        f"A saída '{saida}' é produzida por '{self._produtor[saida].nome}' "
+                        f"e por '{etapa.nome}'."
+                    )
+                self._produtor[saida] = etapa
+
+        self._trava = threading.Lock()
+        self._valores = {}
+        self._hashes = {}
+        self._estado = {}
+
+    def _caminho_cache(self, etapa):
+        return os.path.join(self.diretorio, f"{etapa.nome}.pickle")
+
+    def _ler_estado(self):
+        try:
+            with open(
+                os.path.join(self.diretorio, ARQUIVO_ESTADO), encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _gravar_estado(self):
+        with self._trava:
+            conteudo = json.dumps(self._estado, indent=4, sort_keys=True)
+        _gravar_atomico(
+            os.path.join(self.diretorio, ARQUIVO_ESTADO), conteudo.encode("utf-8")
+        )
+
+    def _hash_valor(self, nome):
+        with self._trava:
+            if nome in self._hashes:
+                return self._hashes[nome]
+            valor = self._valores[nome]
+        try:
+            hash_valor = hashlib.sha256(
+                pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            ).hexdigest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            hash_valor = None
+        with self._trava:
+            return self._hashes.setdefault(nome, hash_valor)
+
+    def _assinatura(self, etapa):
+        # None quando alguma entrada não pode ser serializada: a etapa roda sempre.
+        h = hashlib.sha256(etapa.hash_codigo().encode("utf-8"))
+        for entrada in etapa.entradas:
+            hash_entrada = self._hash_valor(entrada)
+            if hash_entrada is None:
+                return None
+            h.update(f"{entrada}={hash_entrada}".encode("utf-8"))
+        for caminho in etapa.arquivos:
+            h.update(f"{caminho}={_hash_arquivo(caminho)}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _reaproveitar(self, etapa, assinatura):
+        # As saídas do cache, ou None se a etapa precisar rodar.
+        anterior = self._estado.get(etapa.nome)
+        if self.refazer or anterior is None or anterior["assinatura"] != assinatura:
+            return None
+        if any(
+            _hash_arquivo(caminho) != anterior["produz"].get(caminho)
+            for caminho in etapa.produz
+        ):
+            return None
+
+        try:
+            with open(self._caminho_cache(etapa), "rb") as f:
+                serializadas = pickle.load(f)
+            saidas = {nome: pickle.loads(serializadas[nome]) for nome in etapa.saidas}
+        except (FileNotFoundError, EOFError, KeyError, pickle.UnpicklingError):
+            return None
+
+        with self._trava:
+            self._hashes.update(anterior["saidas"])
+        return saidas
+
+    def _guardar(self, etapa, assinatura, saidas):
+        serializadas = {}
+        try:
+            for nome, valor in saidas.items():
+                serializadas[nome] = pickle.dumps(
+                    valor, protocol=pickle.HIGHEST_PROTOCOL
+                )
+        except (pickle.PicklingError, TypeError, AttributeError):
+            with self._trava:
+                self._estado.pop(etapa.nome, None)
+            return
+
+        hashes = {
+            nome: hashlib.sha256(conteudo).hexdigest()
+            for nome, conteudo in serializadas.items()
+        }
+        _gravar_atomico(
+            self._caminho_cache(etapa),
+            pickle.dumps(serializadas, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        with self._trava:
+            self._hashes.update(hashes)
+            self._estado[etapa.nome] = {
+                "assinatura": assinatura,
+                "saidas": hashes,
+                "produz": {caminho: _hash_arquivo(caminho) for caminho in etapa.produz},
+            }
+
+    def _rodar(self, etapa):
+        with self._trava:
+            argumentos = [self._valores[entrada] for entrada in etapa.entradas]
+        if etapa.console:
+            self.situacao[etapa.nome] = "executada"
+            return etapa.executar(argumentos)
+
+        assinatura = self._assinatura(etapa)
+        if assinatura is not None:
+            saidas = self._reaproveitar(etapa, assinatura)
+            if saidas is not None:
+                self.situacao[etapa.nome] = "reaproveitada"
+                return saidas
+
+        saidas = etapa.executar(argumentos)
+        if assinatura is None:
+            with self._trava:
+                self._estado.pop(etapa.nome, None)
+        else:
+            self._guardar(etapa, assinatura, saidas)
+        self.situacao[etapa.nome] = "executada"
+        return saidas
+
+    def _validar(self, valores):
+        disponiveis = set(valores)
+        anteriores = set()
+        for etapa in self.etapas:
+            desconhecidas = [nome for nome in etapa.apos if nome not in anteriores]
+            if desconhecidas:
+                raise ValueError(
+                    f"A etapa '{etapa.nome}' deve rodar após {', '.join(desconhecidas)}, que "
+                    "não é uma etapa anterior."
+                )
+            anteriores.add(etapa.nome)
+
+            faltando = [
+                entrada for entrada in etapa.entradas if entrada not in disponiveis
+            ]
+            if faltando:
+                raise ValueError(
+                    f"A etapa '{etapa.nome}' usa {', '.join(faltando)}, que não é produzido "
+                    "por nenhuma etapa anterior nem foi passado como valor inicial."
+                )
+            disponiveis.update(etapa.saidas)
+
+    def executar(self, valores=None):
+        """
+        Executa o grafo.
+
+        Args:
+            valores (dict, optional): Valores iniciais, por nome.
+
+        Returns:
+            dict: Todos os valores (iniciais e produzidos), por nome.
+
+        Raises:
+            ValueError: Se alguma entrada não tiver de onde vir ou se `apos` citar uma etapa
+                que não foi declarada antes.
+        """
+        valores = dict(valores or {})
+        self._validar(valores)
+
+        self._valores = valores
+        self._hashes = {}
+        self._estado = self._ler_estado()
+        self.situacao = {}
+
+        dependencias = {
+            etapa.nome: {
+                self._produtor[entrada].nome
+                for entrada in etapa.entradas
+                if entrada in self._produtor
+            }
+            | set(etapa.apos)
+            for etapa in self.etapas
+        }
+        pendentes = list(self.etapas)
+        concluidas = set()
+        em_execucao = {}
+
+        paralelo = ThreadPoolExecutor(self.max_workers, thread_name_prefix="etapa")
+        console = ThreadPoolExecutor(1, thread_name_prefix="etapa-console")
+        try:
+            while pendentes or em_execucao:
+                console_pendente = False
+                for etapa in list(pendentes):
+                    if etapa.console and console_pendente:
+                        continue
+                    if not dependencias[etapa.nome] <= concluidas:
+                        console_pendente |= etapa.console
+                        continue
+
+                    executor = console if etapa.console else paralelo
+                    em_execucao[executor.submit(self._rodar, etapa)] = etapa
+                    pendentes.remove(etapa)
+
+                prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for futuro in prontas:
+                    etapa = em_execucao.pop(futuro)
+                    saidas = futuro.result()
+                    with self._trava:
+                        self._valores.update(saidas)
+                    concluidas.add(etapa.nome)
+        finally:
+            paralelo.shutdown(cancel_futures=True)
+            console.shutdown(cancel_futures=True)
+            self._gravar_estado()
+
+        return self._valores
@@ -0,0 +1,218 @@
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+
+def _ordinal(data):
+    # Data -> dias desde 1970-01-01 (None se a data for nula ou inválida).
+    data = pd.to_datetime(data, errors="coerce")
+    if pd.isna(data):
+        return None
+    return int(np.datetime64(data, "D").astype("int64"))
+
+
+def limites_periodo(periodo):
+    """
+    Primeiro e último dia de um período, no formato de ordinais (dias desde 1970-01-01).
+
+    Args:
+        periodo: Um ano (int ou "AAAA"), um mês ("AAAA-MM") ou um dia ("AAAA-MM-DD", `date`,
+            `datetime` ou `pd.Timestamp`).
+
+    Returns:
+        tuple: (primeiro dia, último dia) do período.
+
+    Raises:
+        ValueError: Se o período não estiver em um dos formatos aceitos.
+    """
+    if isinstance(periodo, (int, np.integer)):
+        periodo = str(periodo)
+    if isinstance(periodo, str):
+        partes = periodo.strip().split("-")
+        if not 1 <= len(partes) <= 3 or not all(parte.isdigit() for parte in partes):
+            raise ValueError(
+                f"Período inválido: '{periodo}'. Use AAAA, AAAA-MM ou AAAA-MM-DD."
+            )
+        unidade = ("Y", "M", "D")[len(partes) - 1]
+        inicio = np.datetime64("-".join(partes), unidade)
+        fim = inicio + np.timedelta64(1, unidade)
+        return (
+            int(inicio.astype("datetime64[D]").astype("int64")),
+            int(fim.astype("datetime64[D]").astype("int64")) - 1,
+        )
+
+    ordinal = _ordinal(periodo) if isinstance(periodo, date) else None
+    if ordinal is None:
+        raise ValueError(f"Período inválido: {periodo!r}.")
+    return ordinal, ordinal
+
+
+class IndiceDatas:
+    """
+    Índice de datas de nascimento para consultas por intervalo.
+
+    As datas ficam em um array ordenado de ordinais (dias desde 1970-01-01, int64), acompanhado
+    da permutação das chaves (ex.: índices do DataFrame) na mesma ordem. Um intervalo de anos,
+    meses ou dias vira dois `searchsorted` e uma fatia. Datas nulas não entram no índice.
+    """
+
+    def __init__(self, ordinais, chaves):
+        """
+        Args:
+            ordinais (np.ndarray): Ordinais das datas, em ordem crescente.
+            chaves (np.ndarray): A chave de cada ordinal.
+        """
+        self._ordinais = ordinais
+        self._chaves = chaves
+        self._ordinal_da_chave = dict(zip(chaves.tolist(), ordinais.tolist()))
+
+    @classmethod
+    def de_serie(cls, datas):
+        """
+        Monta o índice de uma coluna de datas, usando o índice da coluna como chave.
+
+        Args:
+            datas (pd.Series): Datas (datetime64 ou texto "AAAA-MM-DD").
+
+        Returns:
+            IndiceDatas: O índice.
+        """
+        dias = pd.to_datetime(datas, errors="coerce").to_numpy(dtype="datetime64[D]")
+        validas = ~np.isnat(dias)
+
+        ordinais = dias[validas].astype("int64")
+        chaves = datas.index.to_numpy()[validas]
+        ordem = np.argsort(ordinais, kind="stable")
+        return cls(ordinais[ordem], chaves[ordem])
+
+    def __len__(self):
+        return len(self._ordinais)
+
+    def remover(self, chave):
+        """
+        Tira uma chave do índice (nada acontece se ela não estiver indexada).
+        """
+        ordinal = self._ordinal_da_chave.pop(chave, None)
+        if ordinal is None:
+            return
+
+        inicio = np.searchsorted(self._ordinais, ordinal, "left")
+        fim = np.searchsorted(self._ordinais, ordinal, "right")
+        posicao = inicio + np.flatnonzero(self._chaves[inicio:fim] == chave)[0]
+        self._ordinais = np.delete(self._ordinais, posicao)
+        self._chaves = np.delete(self._chaves, posicao)
+
+    def atualizar(self, chave, data):
+        """
+        Indexa a data de uma chave nova ou troca a data de uma chave já indexada.
+
+        Args:
+            chave: Identificador do registro.
+            data: A data de nascimento (nula tira a chave do índice).
+        """
+        ordinal = _ordinal(data)
+        if self._ordinal_da_chave.get(chave) == ordinal and ordinal is not None:
+            return
+        self.remover(chave)
+        if ordinal is None:
+            return
+
+        posicao = np.searchsorted(self._ordinais, ordinal, "right")
+        self._ordinais = np.insert(self._ordinais, posicao, ordinal)
+        self._chaves = np.insert(self._chaves, posicao, chave)
+        self._ordinal_da_chave[chave] = ordinal
+
+    def intervalo(self, inicio=None, fim=None):
+        """
+        Chaves com data de nascimento entre dois períodos, inclusive.
+
+        Ex.: `intervalo(2000, 2010)`, `intervalo("1990-05", "1990-08")` ou
+        `intervalo("1990-05-01", "1990-05-10")`.
+
+        Args:
+            inicio (optional): Período inicial (ver `limites_periodo`); sem ele, desde o início.
+            fim (optional): Período final, incluído por inteiro; sem ele, até o fim.
+
+        Returns:
+            np.ndarray: As chaves, em ordem crescente.
+        """
+        esquerda = (
+            0
+            if inicio is None
+            else np.searchsorted(self._ordinais, limites_periodo(inicio)[0], "left")
+        )
+        direita = (
+            len(self._ordinais)
+            if fim is None
+            else np.searchsorted(self._ordinais, limites_periodo(fim)[1], "right")
+        )
+        return np.sort(self._chaves[esquerda:direita])
+
+
+def benchmark_intervalos(
+    linhas=1_000_000, consultas=((2000, 2010), (1990, 1990)), semente=42
+):
+    """
+    Compara o filtro original (`pd.to_datetime` na coluna + duas máscaras) com `IndiceDatas`.
+
+    Args:
+        linhas (int): Quantidade de datas sintéticas (texto "AAAA-MM-DD", com 2% nulas).
+        consultas (tuple): Pares (ano inicial, ano final).
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list: Um dicionário por consulta com a quantidade de resultados e os tempos (ms).
+    """
+    gerador = np.random.default_rng(semente)
+    dias = gerador.integers(
+        np.datetime64("1950-01-01").astype("int64"),
+        np.datetime64("2015-12-31").astype("int64"),
+        linhas,
+    ).astype("datetime64[D]")
+    datas = pd.Series(np.datetime_as_string(dias), dtype=object)
+    datas[gerador.random(linhas) < 0.02] = np.nan
+
+    inicio = time.perf_counter()
+    indice = IndiceDatas.de_serie(datas)
+    construcao_s = time.perf_counter() - inicio
+
+    resultados = []
+    for ano_inicial, ano_final in consultas:
+        inicio = time.perf_counter()
+        anos = pd.to_datetime(datas).dt.year
+        mascara = datas.index[(anos >= ano_inicial) & (anos <= ano_final)]
+        mascara_ms = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        chaves = indice.intervalo(ano_inicial, ano_final)
+        indice_ms = (time.perf_counter() - inicio) * 1000
+
+        resultados.append(
+            {
+                "consulta": (ano_inicial, ano_final),
+                "construcao_s": construcao_s,
+                "resultados": len(chaves),
+                "iguais": np.array_equal(mascara.to_numpy(), chaves),
+                "mascara_ms": mascara_ms,
+                "indice_ms": indice_ms,
+            }
+        )
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark das consultas por ano de nascimento."
+    )
+    argumentos.add_argument("--linhas", type=int, default=1_000_000)
+    args = argumentos.parse_args()
+
+    for resultado in benchmark_intervalos(args.linhas):
+        print(
+            f"{resultado['consulta']}: máscaras {resultado['mascara_ms']:.1f} ms, índice "
+            f"{resultado['indice_ms']:.2f} ms ({resultado['resultados']} resultados, "
+            f"{'iguais' if resultado['iguais'] else 'DIFERENTES'})"
+        )
@@ -0,0 +1,254 @@
+import argparse
+import bisect
+import random
+import time
+import unicodedata
+from collections import defaultdict
+from itertools import chain
+
+import pandas as pd
+
+_FIM_PREFIXO = "\U0010ffff"
+
+
+def normalizar_nome(nome):
+    """
+    Forma de comparação de um nome: decomposição NFD sem os acentos, em casefold.
+
+    Ex.: "João" e "JOAO" viram "joao".
+
+    Args:
+        nome (str): O nome.
+
+    Returns:
+        str: O nome normalizado ("" para valores que não são texto).
+    """
+    if not isinstance(nome, str):
+        return ""
+    decomposto = unicodedata.normalize("NFD", nome)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+def _trigramas(texto):
+    return {texto[posicao : posicao + 3] for posicao in range(len(texto) - 2)}
+
+
+class IndiceNomes:
+    """
+    Índice de nomes para buscas sem diferença de acentos e de maiúsculas/minúsculas.
+
+    Os nomes são agrupados pela forma normalizada (`normalizar_nome`): cada nome distinto guarda
+    o conjunto de chaves (ex.: índices do DataFrame) que o usam. Sobre os nomes distintos há uma
+    lista ordenada, para buscas por prefixo com `bisect`, e um índice de trigramas, para buscas
+    por trecho: a consulta só é comparada com os nomes que contêm todos os seus trigramas.
+
+    Inserções, atualizações e remoções mexem só nas entradas da chave afetada.
+    """
+
+    def __init__(self):
+        self._nome_da_chave = {}
+        self._chaves_do_nome = {}
+        self._nomes_ordenados = []
+        self._trigramas = defaultdict(set)
+
+    @classmethod
+    def de_serie(cls, nomes):
+        """
+        Monta o índice de uma coluna de nomes, usando o índice da coluna como chave.
+
+        Args:
+            nomes (pd.Series): Os nomes (ex.: `df["nome"]`).
+
+        Returns:
+            IndiceNomes: O índice.
+        """
+        indice = cls()
+        codigos, distintos = pd.factorize(nomes, use_na_sentinel=False)
+        normalizados = [normalizar_nome(nome) for nome in distintos]
+
+        for chave, codigo in zip(nomes.index.tolist(), codigos.tolist()):
+            normalizado = normalizados[codigo]
+            indice._nome_da_chave[chave] = normalizado
+            indice._chaves_do_nome.setdefault(normalizado, set()).add(chave)
+
+        indice._nomes_ordenados = sorted(indice._chaves_do_nome)
+        for normalizado in indice._nomes_ordenados:
+            for trigrama in _trigramas(normalizado):
+                indice._trigramas[trigrama].add(normalizado)
+        return indice
+
+    def __len__(self):
+        return len(self._nome_da_chave)
+
+    def adicionar(self, chave, nome):
+        """
+        Indexa o nome de uma chave nova ou troca o nome de uma chave já indexada.
+
+        Args:
+            chave: Identificador do registro (hasheável e ordenável, ex.: o índice no DataFrame).
+            nome (str): O nome.
+        """
+        normalizado = normalizar_nome(nome)
+        if self._nome_da_chave.get(chave) == normalizado:
+            return
+        self.remover(chave)
+
+        self._nome_da_chave[chave] = normalizado
+        chaves = self._chaves_do_nome.get(normalizado)
+        if chaves is None:
+            chaves = self._chaves_do_nome[normalizado] = set()
+            bisect.insort(self._nomes_ordenados, normalizado)
+            for trigrama in _trigramas(normalizado):
+                self._trigramas[trigrama].add(normalizado)
+        chaves.add(chave)
+
+    def remover(self, chave):
+        """
+        Tira uma chave do índice (nada acontece se ela não estiver indexada).
+        """
+        normalizado = self._nome_da_chave.pop(chave, None)
+        if normalizado is None:
+            return
+
+        chaves = self._chaves_do_nome[normalizado]
+        chaves.discard(chave)
+        if chaves:
+            return
+
+        del self._chaves_do_nome[normalizado]
+        del self._nomes_ordenados[
+            bisect.bisect_left(self._nomes_ordenados, normalizado)
+        ]
+        for trigrama in _trigramas(normalizado):
+            nomes = self._trigramas[trigrama]
+            nomes.discard(normalizado)
+            if not nomes:
+                del self._trigramas[trigrama]
+
+    def _chaves(self, nomes):
+        return sorted(chain.from_iterable(self._chaves_do_nome[nome] for nome in nomes))
+
+    def buscar_prefixo(self, prefixo):
+        """
+        Args:
+            prefixo (str): Início do nome (acentos e maiúsculas são ignorados).
+
+        Returns:
+            list: As chaves cujos nomes começam com o prefixo, em ordem crescente.
+        """
+        consulta = normalizar_nome(prefixo)
+        inicio = bisect.bisect_left(self._nomes_ordenados, consulta)
+        fim = bisect.bisect_left(self._nomes_ordenados, consulta + _FIM_PREFIXO)
+        return self._chaves(self._nomes_ordenados[inicio:fim])
+
+    def buscar(self, trecho):
+        """
+        Args:
+            trecho (str): Trecho do nome, em qualquer posição (acentos e maiúsculas são ignorados).
+
+        Returns:
+            list: As chaves cujos nomes contêm o trecho, em ordem crescente.
+        """
+        consulta = normalizar_nome(trecho)
+
+        if len(consulta) < 3:
+            # Sem trigramas na consulta: compara com os nomes distintos, não com os registros.
+            candidatos = self._nomes_ordenados
+        else:
+            conjuntos = sorted(
+                (
+                    self._trigramas.get(trigrama, set())
+                    for trigrama in _trigramas(consulta)
+                ),
+                key=len,
+            )
+            candidatos = conjuntos[0].intersection(*conjuntos[1:])
+
+        return self._chaves(nome for nome in candidatos if consulta in nome)
+
+
+PRIMEIROS_NOMES = (
+    "João Ana Maria José Luís Luiz Márcio Lúcia Íris Antônio Conceição Pedro Paulo Carla Júlia "
+    "Luíza Vitória Sérgio Mônica Fábio Cláudia Rogério Tânia Otávio Inês Raúl Cecília Benício"
+).split()
+SOBRENOMES = (
+    "Silva Souza Oliveira Pereira Lima Gonçalves Araújo Ribeiro Simões Conceição Fernandes "
+    "Gomes Martins Rocha Brandão Guimarães Magalhães Assunção Damião Romão Sebastião Falcão "
+    "Antunes Patrício Valério Cândido Estêvão Glória Tavares Paixão"
+).split()
+
+
+def benchmark_busca(
+    usuarios=1_000_000,
+    consultas=("joao", "Conceição", "Antonio Guimarães", "ines falcao", "lu"),
+    semente=42,
+):
+    """
+    Compara `str.contains` sobre a coluna inteira com `IndiceNomes.buscar`.
+
+    Os nomes sintéticos combinam um nome e dois sobrenomes comuns, com acentos. O tempo do índice
+    cresce com a quantidade de resultados (as chaves são devolvidas ordenadas); a localização
+    dos nomes em si não depende da quantidade de usuários.
+
+    Args:
+        usuarios (int): Quantidade de nomes.
+        consultas (tuple): Trechos buscados.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list: Um dicionário por consulta com a quantidade de resultados e os tempos (ms).
+    """
+    aleatorio = random.Random(semente)
+    nomes = pd.Series(
+        [
+            " ".join(
+                (
+                    aleatorio.choice(PRIMEIROS_NOMES),
+                    aleatorio.choice(SOBRENOMES),
+                    aleatorio.choice(SOBRENOMES),
+                )
+            )
+            for _ in range(usuarios)
+        ]
+    )
+
+    inicio = time.perf_counter()
+    indice = IndiceNomes.de_serie(nomes)
+    construcao_s = time.perf_counter() - inicio
+
+    resultados = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        varredura = nomes.index[nomes.str.contains(consulta, case=False, regex=False)]
+        varredura_ms = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        chaves = indice.buscar(consulta)
+        indice_ms = (time.perf_counter() - inicio) * 1000
+
+        resultados.append(
+            {
+                "consulta": consulta,
+                "construcao_s": construcao_s,
+                "resultados_varredura": len(varredura),
+                "resultados_indice": len(chaves),
+                "varredura_ms": varredura_ms,
+                "indice_ms": indice_ms,
+            }
+        )
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark da busca por nome.")
+    argumentos.add_argument("--usuarios", type=int, default=1_000_000)
+    argumentos.add_argument("--consultas", nargs="+")
+    args = argumentos.parse_args()
+
+    consultas = args.consultas or benchmark_busca.__defaults__[1]
+    for resultado in benchmark_busca(args.usuarios, consultas):
+        print(
+            f"{resultado['consulta']!r:>8}: str.contains {resultado['varredura_ms']:8.1f} ms "
+            f"({resultado['resultados_varredura']} resultados), índice "
+            f"{resultado['indice_ms']:8.3f} ms ({resultado['resultados_indice']} resultados)"
+        )
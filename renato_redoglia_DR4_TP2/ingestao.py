@@ -0,0 +1,267 @@
+import argparse
+import ast
+import csv
+import os
+import random
+import re
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Formatos aceitos para a data de nascimento: o padrão identifica o formato de cada linha e o
+# formato do strptime converte todas as linhas do grupo de uma vez.
+FORMATOS_DATA = {
+    "iso": (r"\d{4}-\d{1,2}-\d{1,2}", "%Y-%m-%d"),
+    "mes_abreviado": (r"[A-Za-z]{3} \d{1,2}, \d{4}", "%b %d, %Y"),
+    "barras": (r"\d{1,2}/\d{1,2}/\d{2}", "%d/%m/%y"),
+}
+REGEX_FORMATO_DATA = "^(?:{})$".format(
+    "|".join(f"(?P<{nome}>{padrao})" for nome, (padrao, _) in FORMATOS_DATA.items())
+)
+
+COLUNAS_LISTA = ["hobbies", "linguagens de programação", "jogos"]
+
+# Strings entre aspas simples ou duplas, sem escapes (strings com barra invertida ficam para o
+# ast.literal_eval).
+_REGEX_STRING = re.compile(r"'([^'\\\n]*)'|\"([^\"\\\n]*)\"")
+_REGEX_LISTA_STRINGS = re.compile(r"\[(?:s(?:,s)*,?)?\]")
+_REGEX_LISTA_PARES = re.compile(r"\[(?:\(s,s\)(?:,\(s,s\))*,?)?\]")
+
+
+def ler_literal(texto):
+    """
+    Converte o texto de uma lista Python de strings ou de pares de strings no valor correspondente.
+
+    Os formatos comuns (`['a', 'b']` e `[('a', 'b'), ...]`) são reconhecidos por expressões
+    regulares: as strings são extraídas e o que sobra precisa ser exatamente o esqueleto da
+    lista. Qualquer outro texto vai para `ast.literal_eval`, que também nunca executa código.
+
+    Args:
+        texto (str): O literal.
+
+    Returns:
+        list: A lista de strings ou de tuplas (jogo, plataforma).
+
+    Raises:
+        ValueError, SyntaxError: Se o texto não for um literal Python válido.
+    """
+    strings = [
+        ocorrencia.group(ocorrencia.lastindex)
+        for ocorrencia in _REGEX_STRING.finditer(texto)
+    ]
+    esqueleto = "".join(_REGEX_STRING.sub("s", texto).split())
+
+    if _REGEX_LISTA_STRINGS.fullmatch(esqueleto):
+        return strings
+    if _REGEX_LISTA_PARES.fullmatch(esqueleto):
+        return list(zip(strings[::2], strings[1::2]))
+
+    return ast.literal_eval(texto)
+
+
+def ler_literais(textos):
+    """
+    Aplica `ler_literal` a uma coluna, convertendo cada texto distinto uma única vez.
+
+    Args:
+        textos (pd.Series): Coluna com os literais.
+
+    Returns:
+        list: Uma lista nova por linha (linhas com o mesmo texto não compartilham o objeto).
+    """
+    codigos, distintos = pd.factorize(textos)
+    valores = [ler_literal(texto) for texto in distintos]
+    return [list(valores[codigo]) for codigo in codigos]
+
+
+def converter_datas(textos):
+    """
+    Converte datas de nascimento em vários formatos com uma passada de expressão regular.
+
+    Cada linha é classificada em um dos `FORMATOS_DATA` por `REGEX_FORMATO_DATA` e cada grupo
+    é convertido em bloco. Textos vazios, em outros formatos ou datas inválidas viram NaT.
+
+    Args:
+        textos (pd.Series): Coluna de datas em texto.
+
+    Returns:
+        pd.Series: Coluna datetime64.
+    """
+    grupos = textos.str.extract(REGEX_FORMATO_DATA)
+    datas = pd.Series(pd.NaT, index=textos.index, dtype="datetime64[ns]")
+
+    for nome, (_, formato) in FORMATOS_DATA.items():
+        linhas = grupos[nome].notna()
+        if linhas.any():
+            datas[linhas] = pd.to_datetime(
+                grupos.loc[linhas, nome], format=formato, errors="coerce"
+            )
+
+    return datas
+
+
+def ler_usuarios_novos(caminho):
+    """
+    Lê o arquivo de usuários novos (delimitado por ";") em um DataFrame, coluna a coluna.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+
+    Returns:
+        pd.DataFrame: Os usuários, com 'idade' numérica (NaN quando vazia), 'data de nascimento'
+        em datetime64 (NaT quando vazia ou inválida) e as colunas de lista já convertidas.
+    """
+    df = pd.read_csv(
+        caminho, sep=";", dtype=str, keep_default_na=False, encoding="utf-8"
+    )
+    return _converter_colunas(df)
+
+
+def ler_usuarios_novos_em_blocos(caminho, tamanho_bloco=100_000):
+    """
+    Lê o arquivo de usuários novos em blocos de linhas, com as mesmas conversões de
+    `ler_usuarios_novos`.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+        tamanho_bloco (int): Quantidade de linhas por bloco.
+
+    Yields:
+        pd.DataFrame: Os usuários de cada bloco, com o índice contínuo entre os blocos.
+    """
+    with pd.read_csv(
+        caminho,
+        sep=";",
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+        chunksize=tamanho_bloco,
+    ) as leitor:
+        for bloco in leitor:
+            yield _converter_colunas(bloco)
+
+
+def _converter_colunas(df):
+    df["idade"] = np.trunc(pd.to_numeric(df["idade"].where(df["idade"] != "")))
+    df["data de nascimento"] = converter_datas(df["data de nascimento"])
+    for coluna in COLUNAS_LISTA:
+        df[coluna] = ler_literais(df[coluna])
+
+    return df
+
+
+def _ler_usuarios_novos_linha_a_linha(caminho):
+    # A leitura original do passo 7, mantida como referência para o benchmark.
+    infnetianos = []
+    with open(caminho, "r", encoding="utf-8") as arquivo_txt:
+        leitor_csv = csv.DictReader(arquivo_txt, delimiter=";")
+
+        for linha in leitor_csv:
+            idade = None if linha["idade"] == "" else int(float(linha["idade"]))
+
+            data_de_nascimento = None
+            for formato in ["%Y-%m-%d", "%b %d, %Y", "%d/%m/%y", "%Y-%m-%d"]:
+                try:
+                    data_de_nascimento = datetime.strptime(
+                        linha["data de nascimento"], formato
+                    )
+                except ValueError:
+                    continue
+
+            infnetianos.append(
+                {
+                    "id": linha["id"],
+                    "nome": linha["nome"],
+                    "sobrenome": linha["sobrenome"],
+                    "email": linha["email"],
+                    "idade": idade,
+                    "data de nascimento": data_de_nascimento,
+                    "cidade": linha["cidade"],
+                    "estado": linha["estado"],
+                    "hobbies": ast.literal_eval(linha["hobbies"]),
+                    "linguagens de programação": ast.literal_eval(
+                        linha["linguagens de programação"]
+                    ),
+                    "jogos": ast.literal_eval(linha["jogos"]),
+                }
+            )
+    return pd.DataFrame(infnetianos)
+
+
+def _gerar_arquivo_sintetico(caminho_base, caminho_saida, linhas, semente):
+    with open(caminho_base, encoding="utf-8") as f:
+        leitor = csv.DictReader(f, delimiter=";")
+        colunas = leitor.fieldnames
+        base = list(leitor)
+
+    aleatorio = random.Random(semente)
+    formatos = ["%Y-%m-%d", "%Y-%m-%d", "%Y-%m-%d", "%b %d, %Y", "%d/%m/%y", ""]
+
+    with open(caminho_saida, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas, delimiter=";")
+        escritor.writeheader()
+        for posicao in range(linhas):
+            linha = dict(aleatorio.choice(base))
+            linha["id"] = f"{posicao:08x}"
+            formato = aleatorio.choice(formatos)
+            data = datetime(aleatorio.randint(1960, 2010), aleatorio.randint(1, 12), 1)
+            linha["data de nascimento"] = data.strftime(formato) if formato else ""
+            escritor.writerow(linha)
+
+
+def benchmark_ingestao(
+    linhas=1_000_000, caminho_base="./brutos/dados_usuarios_novos.txt"
+):
+    """
+    Compara a leitura linha a linha do passo 7 com `ler_usuarios_novos` em um arquivo sintético.
+
+    Args:
+        linhas (int): Quantidade de linhas do arquivo sintético.
+        caminho_base (str): Arquivo de onde as linhas sintéticas são sorteadas.
+
+    Returns:
+        dict: Os tempos, em segundos, de cada leitura e se os resultados são iguais.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "usuarios_novos.txt")
+        _gerar_arquivo_sintetico(caminho_base, caminho, linhas, semente=42)
+
+        inicio = time.perf_counter()
+        original = _ler_usuarios_novos_linha_a_linha(caminho)
+        tempo_original = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        colunar = ler_usuarios_novos(caminho)
+        tempo_colunar = time.perf_counter() - inicio
+
+    iguais = (
+        original["data de nascimento"].equals(colunar["data de nascimento"])
+        and original["idade"].equals(colunar["idade"])
+        and all(original[coluna].equals(colunar[coluna]) for coluna in COLUNAS_LISTA)
+    )
+
+    return {
+        "linhas": linhas,
+        "linha_a_linha_s": tempo_original,
+        "colunar_s": tempo_colunar,
+        "iguais": iguais,
+    }
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Benchmark da leitura dos usuários novos."
+    )
+    argumentos.add_argument("--linhas", type=int, default=1_000_000)
+    args = argumentos.parse_args()
+
+    resultado = benchmark_ingestao(args.linhas)
+    print(
+        f"{resultado['linhas']} linhas: linha a linha {resultado['linha_a_linha_s']:.2f} s, "
+        f"colunar {resultado['colunar_s']:.2f} s "
+        f"({resultado['linha_a_linha_s'] / resultado['colunar_s']:.1f}x); "
+        f"resultados {'iguais' if resultado['iguais'] else 'DIFERENTES'}."
+    )
@@ -1,32 +1,66 @@
 from datetime import datetime
+import argparse
 import csv
-import json
+import os
 import secrets
-import ast
-from collections import Counter
+import sys
 
 import pandas as pd
 
+# Módulos usados pelos dois projetos (TP2 e AT) ficam em ../compartilhado.
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "compartilhado")
+)
+
+import enriquecimento
+import ingestao
+from cadastro_lote import carregar_arquivo, exibir_relatorio
+from diario import DiarioInfnetianos
+from enriquecimento import enriquecer_infnetianos
+from etapas import Etapa, GrafoEtapas
+from indice_datas import IndiceDatas
+from indice_nomes import IndiceNomes
+from instrumentacao import adicionar_argumentos, criar_instrumentacao
+from ingestao import ler_usuarios_novos
+from particionamento import exportar_particoes
+from processamento_em_blocos import TAMANHO_BLOCO, processar_em_blocos
+from trending import ContadoresTrending
+
+# O pipeline é um grafo de etapas (ver etapas.py): cada etapa recebe os valores de que precisa
+# das etapas anteriores, em memória, e as etapas sem interação com o usuário são puladas quando
+# as suas entradas e o seu código não mudaram desde a última execução.
+
+
 # 1. Abrindo as Portas
-infnetianos = []
+def abrir_portas():
+    infnetianos = []
 
-with open("./brutos/rede_INFNET_atualizado.txt", "r", encoding="utf-8") as arquivo_txt:
-    for linha in arquivo_txt:
-        [nome, idade, cidade, estado, *resto] = linha.strip().split("?")
-        infnetianos.append([nome, idade, cidade, estado])
+    with open(
+        "./brutos/rede_INFNET_atualizado.txt", "r", encoding="utf-8"
+    ) as arquivo_txt:
+        for linha in arquivo_txt:
+            [nome, idade, cidade, estado, *resto] = linha.strip().split("?")
+            infnetianos.append([nome, idade, cidade, estado])
 
-with open("./gerados/INFwebNet.csv", "w", newline="", encoding="utf-8") as arquivo_csv:
-    csv.writer(arquivo_csv).writerows(infnetianos)
+    with open(
+        "./gerados/INFwebNet.csv", "w", newline="", encoding="utf-8"
+    ) as arquivo_csv:
+        csv.writer(arquivo_csv).writerows(infnetianos)
+
+    return infnetianos
 
-# 2. Estruturando os Dados
-infnetianos = []
 
-with open("./gerados/INFwebNet.csv", "r", encoding="utf-8") as arquivo_csv:
-    leitor_csv = csv.DictReader(arquivo_csv)
+# 2. Estruturando os Dados
+def estruturar_dados(linhas):
+    # A primeira linha é o cabeçalho, como no CSV gravado em ./gerados/INFwebNet.csv. Os ids são
+    # gerados aqui para que continuem os mesmos enquanto o arquivo de origem não mudar.
+    cabecalho, *registros = linhas
+    infnetianos = []
 
-    for linha in leitor_csv:
+    for linha in (dict(zip(cabecalho, registro)) for registro in registros):
         infnetianos.append(
             {
+                "id": secrets.token_hex(4),
                 "nome": linha["nome"],
                 "idade": int(linha["idade"]),
                 "cidade": linha["cidade"],
@@ -34,64 +68,77 @@ with open("./gerados/INFwebNet.csv", "r", encoding="utf-8") as arquivo_csv:
             }
         )
 
-with open("./gerados/INFwebNET.json", "w", encoding="utf-8") as arquivo_json:
-    json.dump(infnetianos, arquivo_json, ensure_ascii=False, indent=4)
+    return infnetianos
+
 
 # 3. Cadastro Simplificado
-print("** Cadastro Simplificado **")
-with open("./gerados/INFwebNET.json", "r", encoding="utf-8") as arquivo_json:
-    infnetianos = json.load(arquivo_json)
+def cadastro_simplificado(infnetianos, lote, formato_lote):
+    # O cadastro fica em ./gerados/INFwebNET.json (snapshot) mais um diário de alterações: cada
+    # inserção ou atualização acrescenta uma linha ao diário, em vez de regravar o arquivo inteiro.
+    diario = DiarioInfnetianos.criar("./gerados/INFwebNET.json", infnetianos)
 
-while True:
-    cadastrar_infnetiano = input('\nDigite "sim" para inserir um novo infnetiano: ')
+    if lote:
+        # Carga em lote (ver cadastro_lote.py): substitui os cadastros e a atualização pelo
+        # teclado. Registros com o id de um infnetiano já cadastrado atualizam esse infnetiano.
+        print("** Cadastro em Lote **")
+        exibir_relatorio(carregar_arquivo(diario, lote, formato_lote))
+        print("\n** Fim do Cadastro em Lote **\n")
+        return diario
 
-    if cadastrar_infnetiano != "sim":
-        print("\n** Fim do Cadastro Simplificado **\n")
-        break
+    print("** Cadastro Simplificado **")
 
-    infnetiano = {
-        "nome": input("Nome: "),
-        "idade": int(input("Idade: ")),
-        "cidade": input("Cidade: "),
-        "estado": input("Estado: "),
-    }
+    while True:
+        cadastrar_infnetiano = input('\nDigite "sim" para inserir um novo infnetiano: ')
 
-    infnetianos.append(infnetiano)
+        if cadastrar_infnetiano != "sim":
+            print("\n** Fim do Cadastro Simplificado **\n")
+            break
+
+        infnetiano = {
+            "nome": input("Nome: "),
+            "idade": int(input("Idade: ")),
+            "cidade": input("Cidade: "),
+            "estado": input("Estado: "),
+        }
+
+        diario.inserir(infnetiano)
+
+    diario.sincronizar()
+    return diario
 
-with open("./gerados/INFwebNET.json", "w", encoding="utf-8") as arquivo_json:
-    json.dump(infnetianos, arquivo_json, ensure_ascii=False, indent=4)
 
 # 4. Análise com Pandas
-with open("./gerados/INFwebNET.json", "r", encoding="utf-8") as arquivo_json:
-    infnetianos = json.load(arquivo_json)
+def analise_pandas(diario):
+    infnetianos = diario.registros()
 
-infnetianos_df = pd.DataFrame(infnetianos)
-infnetianos_idade_media = infnetianos_df["idade"].mean()
+    infnetianos_df = pd.DataFrame(infnetianos)
+    infnetianos_idade_media = infnetianos_df["idade"].mean()
 
-print("**")
-print(f"\nA média de idade dos infnetianos é {infnetianos_idade_media:.2f}")
-print("\n**\n")
+    print("**")
+    print(f"\nA média de idade dos infnetianos é {infnetianos_idade_media:.2f}")
+    print("\n**\n")
 
 
 # 5. Ampliando as Informações
-def inserir_infnetianos():
-    print("** Cadastro Ampliado **")
-    with open("./gerados/INFwebNET.json", "r", encoding="utf-8") as arquivo_json:
-        infnetianos = json.load(arquivo_json)
+def inserir_infnetianos(diario, lote):
+    diario.gravar_lote(
+        [
+            {
+                "id": infnetiano["id"],
+                "hobbies": [],
+                "linguagens de programação": [],
+                "jogos": [],
+            }
+            for infnetiano in diario.registros()
+            if "jogos" not in infnetiano
+        ]
+    )
 
-    infnetianos = [
-        {
-            "nome": infnetiano["nome"],
-            "idade": infnetiano["idade"],
-            "cidade": infnetiano["cidade"],
-            "estado": infnetiano["estado"],
-            "hobbies": [],
-            "linguagens de programação": [],
-            "jogos": [],
-        }
-        for infnetiano in infnetianos
-    ]
+    if lote:
+        diario.compactar()
+        return diario.registros()
 
+    print("** Cadastro Ampliado **")
     while True:
         cadastrar_infnetiano = input('\nDigite "sim" para inserir um novo infnetiano: ')
 
@@ -131,150 +178,112 @@ def inserir_infnetianos():
             "jogos": jogos,
         }
 
-        infnetianos.append(infnetiano)
-
-    with open("./gerados/INFwebNET.json", "w", encoding="utf-8") as arquivo_json:
-        json.dump(infnetianos, arquivo_json, ensure_ascii=False, indent=4)
+        diario.inserir(infnetiano)
 
+    # Consolida o diário em um snapshot novo de ./gerados/INFwebNET.json.
+    diario.compactar()
+    return diario.registros()
 
-inserir_infnetianos()
 
 # 6. Dados Delimitados
-with open("./brutos/dados_usuarios_novos.txt", "r", encoding="utf-8") as arquivo_txt:
-    leitor_csv = csv.DictReader(arquivo_txt, delimiter=";")
-
 # 7. Organizando a Bagunça
-with open("./gerados/INFwebNET.json", "r", encoding="utf-8") as arquivo_json:
-    infnetianos = json.load(arquivo_json)
-
-infnetianos = [
-    {
-        "id": secrets.token_hex(4),
-        "nome": infnetiano["nome"],
-        "sobrenome": "",
-        "email": "",
-        "idade": infnetiano["idade"],
-        "data de nascimento": datetime(datetime.now().year - infnetiano["idade"], 1, 1),
-        "cidade": infnetiano["cidade"],
-        "estado": infnetiano["estado"],
-        "hobbies": infnetiano["hobbies"],
-        "linguagens de programação": infnetiano["linguagens de programação"],
-        "jogos": [(jogo["nome"], jogo["plataforma"]) for jogo in infnetiano["jogos"]],
-    }
-    for infnetiano in infnetianos
-]
+def organizar(cadastro, ano_referencia):
+    infnetianos = [
+        {
+            "id": infnetiano.get("id") or secrets.token_hex(4),
+            "nome": infnetiano["nome"],
+            "sobrenome": "",
+            "email": "",
+            "idade": infnetiano["idade"],
+            "data de nascimento": datetime(ano_referencia - infnetiano["idade"], 1, 1),
+            "cidade": infnetiano["cidade"],
+            "estado": infnetiano["estado"],
+            "hobbies": infnetiano["hobbies"],
+            "linguagens de programação": infnetiano["linguagens de programação"],
+            "jogos": [
+                (jogo["nome"], jogo["plataforma"]) for jogo in infnetiano["jogos"]
+            ],
+        }
+        for infnetiano in cadastro
+    ]
 
-with open("./brutos/dados_usuarios_novos.txt", "r", encoding="utf-8") as arquivo_txt:
-    leitor_csv = csv.DictReader(arquivo_txt, delimiter=";")
+    # Leitura colunar: datas em vários formatos e listas convertidas em bloco (ver ingestao.py).
+    usuarios_novos = ler_usuarios_novos("./brutos/dados_usuarios_novos.txt")
 
-    for linha in leitor_csv:
-        idade = None if linha["idade"] == "" else int(float(linha["idade"]))
+    return pd.concat([pd.DataFrame(infnetianos), usuarios_novos], ignore_index=True)
 
-        data_de_nascimento = None
-        formatos_de_data = [
-            "%Y-%m-%d",
-            "%b %d, %Y",
-            "%d/%m/%y",
-            "%Y-%m-%d",
-        ]
-        for formato in formatos_de_data:
-            try:
-                data = datetime.strptime(linha["data de nascimento"], formato)
-                data_de_nascimento = data
-            except ValueError:
-                continue
-
-        infnetianos.append(
-            {
-                "id": linha["id"],
-                "nome": linha["nome"],
-                "sobrenome": linha["sobrenome"],
-                "email": linha["email"],
-                "idade": idade,
-                "data de nascimento": data_de_nascimento,
-                "cidade": linha["cidade"],
-                "estado": linha["estado"],
-                "hobbies": ast.literal_eval(linha["hobbies"]),
-                "linguagens de programação": ast.literal_eval(
-                    linha["linguagens de programação"]
-                ),
-                "jogos": ast.literal_eval(linha["jogos"]),
-            }
-        )
-
-infnetianos_df = pd.DataFrame(infnetianos)
 
 # 8. Criando Informações
-infnetianos_df["ano nascimento"] = (
-    datetime.now().year - infnetianos_df["idade"].fillna(0)
-).astype(int)
-
-
 # 9. Completando os Dados
-# Utilizamos o campo "data de nascimento", pois esta é a fonte mais precisa para determinar a idade. Evita-se, assim, possíveis inconsistências.
-def completando_idade(x):
-    if pd.isna(x["idade"]) and pd.notna(x["data de nascimento"]):
-        return int(datetime.now().year - x["data de nascimento"].year)
-    else:
-        return x["idade"]
+def completar_dados(infnetianos_df, ano_referencia):
+    # A idade é completada pela data de nascimento (fonte mais precisa) e a data, quando só há a
+    # idade, é estimada como 1º de janeiro do ano de nascimento. Sem nenhum dos dois, ficam nulos.
+    return enriquecer_infnetianos(infnetianos_df, ano_referencia)
 
 
-infnetianos_df["idade"] = infnetianos_df.apply(completando_idade, axis=1)
+# 10. Guardando as Informações
+def guardar(infnetianos_df):
+    infnetianos_df = infnetianos_df.copy()
+    infnetianos_df["data de nascimento"] = infnetianos_df[
+        "data de nascimento"
+    ].dt.strftime("%Y-%m-%d")
+    infnetianos_df.to_json(
+        "./gerados/INFwebNet_Data.json", orient="records", force_ascii=False, indent=4
+    )
+    return infnetianos_df
 
 
-# Quando só a idade está disponível, estimamos a data de nascimento assumindo o dia 1º de janeiro. Embora seja uma simplificação, é uma prática comum quando se trabalha com dados incompletos.
-def completando_data_de_nascimento(x):
-    if pd.isna(x["data de nascimento"]) and pd.notna(x["idade"]):
-        return datetime(x["ano nascimento"], 1, 1)
-    else:
-        return x["data de nascimento"]
+# 11. Selecionando Grupos
+def selecionar_grupos(infnetianos_df):
+    # Um arquivo por estado em ./gerados/grupos/estado=XX/; estados vazios ou inválidos ficam na
+    # partição de quarentena. Só as partições que mudaram desde a última execução são regravadas.
+    exportar_particoes(infnetianos_df, "./gerados/grupos", coluna="estado")
 
 
-infnetianos_df["data de nascimento"] = infnetianos_df.apply(
-    completando_data_de_nascimento, axis=1
-)
+def contar_trending(infnetianos_df):
+    trending = ContadoresTrending()
+    trending.registrar_dataframe(infnetianos_df)
+    return trending
 
-# 10. Guardando as Informações
-infnetianos_df["data de nascimento"] = infnetianos_df["data de nascimento"].dt.strftime(
-    "%Y-%m-%d"
-)
-infnetianos_df.to_json(
-    "./gerados/INFwebNet_Data.json", orient="records", force_ascii=False, indent=4
-)
 
-# 11. Selecionando Grupos
-siglas_estados = infnetianos_df["estado"].unique()
+# 12. Agrupando INFNETianos
+def indexar_datas(infnetianos_df):
+    # Índice ordenado das datas de nascimento: um intervalo de anos vira uma fatia do índice, sem
+    # converter a coluna de datas a cada consulta.
+    return IndiceDatas.de_serie(infnetianos_df["data de nascimento"])
 
-for sigla in siglas_estados:
-    df_estado = infnetianos_df[infnetianos_df["estado"] == sigla]
 
-    df_estado.to_csv(
-        f"./gerados/grupo_{sigla}.csv", index=False, encoding="utf-8", sep=";"
-    )
+def filtrar_por_ano_nascimento(
+    infnetianos_df, indice_datas, ano_inicial, ano_final, exibir=True
+):
+    infnetianos_filtrados = infnetianos_df.loc[
+        indice_datas.intervalo(ano_inicial, ano_final)
+    ]
 
+    if exibir:
+        print(infnetianos_filtrados)
+    return infnetianos_filtrados
 
-# 12. Agrupando INFNETianos
-def filtrar_por_ano_nascimento(ano_inicial, ano_final):
-    infnetianos_df["data de nascimento"] = pd.to_datetime(
-        infnetianos_df["data de nascimento"]
-    )
 
-    filtro = (infnetianos_df["data de nascimento"].dt.year >= ano_inicial) & (
-        infnetianos_df["data de nascimento"].dt.year <= ano_final
-    )
-    infnetianos_filtrados = infnetianos_df[filtro]
+def agrupar(infnetianos_df, indice_datas):
+    filtrar_por_ano_nascimento(infnetianos_df, indice_datas, 2000, 2010)
 
-    print(infnetianos_filtrados)
 
+# 13. Selecionando INFNETiano
+def indexar_nomes(infnetianos_df):
+    # Índice dos nomes sem acentos e sem diferença de maiúsculas ("Joao" encontra "João"),
+    # montado uma vez e atualizado a cada alteração de cadastro.
+    return IndiceNomes.de_serie(infnetianos_df["nome"])
 
-filtrar_por_ano_nascimento(2000, 2010)
 
+def indexar_ids(infnetianos_df):
+    # Linha de cada id no DataFrame (a primeira, se houver ids repetidos), montada uma vez: uma
+    # atualização encontra a linha sem percorrer a coluna de ids.
+    return dict(zip(infnetianos_df["id"][::-1], infnetianos_df.index[::-1]))
 
-# 13. Selecionando INFNETiano
-def buscar_infnetiano(nome):
-    resultados = infnetianos_df[
-        infnetianos_df["nome"].str.contains(nome, case=False, na=False)
-    ]
+
+def buscar_infnetiano(infnetianos_df, indice_nomes, nome):
+    resultados = infnetianos_df.loc[indice_nomes.buscar(nome)]
 
     if resultados.empty:
         print(f"Nenhum INFNETiano encontrado com o nome '{nome}'.")
@@ -298,12 +307,22 @@ def buscar_infnetiano(nome):
         return None
 
 
-infnetiano_selecionado = buscar_infnetiano("João")
+def selecionar(infnetianos_df, indice_nomes, lote):
+    if lote:
+        return None
+    return buscar_infnetiano(infnetianos_df, indice_nomes, "João")
 
 
 # 14. Atualizando Dados
-def atualizar_infnetiano(infnetiano):
-    index = infnetianos_df[infnetianos_df["nome"] == infnetiano["nome"]].index[0]
+def atualizar_infnetiano(
+    infnetianos_df, infnetiano, indice_ids, indice_nomes, indice_datas, trending, diario
+):
+    if infnetiano is None:
+        return infnetianos_df, trending
+
+    # O DataFrame é alterado no lugar: a etapa só começa depois da exportação por estado, a
+    # única que ainda poderia estar lendo o DataFrame.
+    index = indice_ids[infnetiano["id"]]
 
     infnetiano["idade"] = int(
         input(f"Nova idade ({infnetiano['idade']}): ") or infnetiano["idade"]
@@ -335,29 +354,213 @@ def atualizar_infnetiano(infnetiano):
     infnetiano["jogos"] = jogos if jogos else infnetiano["jogos"]
 
     infnetianos_df.loc[index] = infnetiano
+    indice_nomes.adicionar(index, infnetiano["nome"])
+    indice_datas.atualizar(index, infnetiano["data de nascimento"])
+    trending.registrar(index, infnetiano)
+    diario.atualizar(infnetiano["id"], infnetiano)
+    diario.sincronizar()
 
     print()
     print(infnetiano)
     print("\nDados atualizados com sucesso!")
-    return infnetianos_df
-
-
-atualizar_infnetiano(infnetiano_selecionado)
+    return infnetianos_df, trending
 
 
 # 15. Trending
-def linguagens_trending():
-    linguagens = [
-        linguagem
-        for lista in infnetianos_df["linguagens de programação"]
-        for linguagem in lista
-    ]
-    contagem = Counter(linguagens)
-    top_5 = contagem.most_common(5)
+def linguagens_trending(trending):
+    top_5 = trending.top(5, "linguagens")
 
     print("\nTop 5 Linguagens de Programação:")
     for linguagem, qtd in top_5:
         print(f"{linguagem}: {qtd} vezes")
 
 
-linguagens_trending()
+ETAPAS = [
+    Etapa(
+        "abrir_portas",
+        abrir_portas,
+        saidas=("linhas",),
+        arquivos=("./brutos/rede_INFNET_atualizado.txt",),
+        produz=("./gerados/INFwebNet.csv",),
+    ),
+    Etapa(
+        "estruturar_dados",
+        estruturar_dados,
+        entradas=("linhas",),
+        saidas=("infnetianos",),
+    ),
+    Etapa(
+        "cadastro_simplificado",
+        cadastro_simplificado,
+        entradas=("infnetianos", "lote", "formato_lote"),
+        saidas=("diario",),
+        console=True,
+    ),
+    Etapa("analise_pandas", analise_pandas, entradas=("diario",), console=True),
+    Etapa(
+        "cadastro_ampliado",
+        inserir_infnetianos,
+        entradas=("diario", "lote"),
+        saidas=("cadastro",),
+        console=True,
+    ),
+    Etapa(
+        "organizar",
+        organizar,
+        entradas=("cadastro", "ano_referencia"),
+        saidas=("infnetianos_organizados",),
+        arquivos=("./brutos/dados_usuarios_novos.txt",),
+        codigo=(ingestao,),
+    ),
+    Etapa(
+        "completar_dados",
+        completar_dados,
+        entradas=("infnetianos_organizados", "ano_referencia"),
+        saidas=("infnetianos_completos",),
+        codigo=(enriquecimento,),
+    ),
+    Etapa(
+        "guardar",
+        guardar,
+        entradas=("infnetianos_completos",),
+        saidas=("infnetianos_df",),
+        produz=("./gerados/INFwebNet_Data.json",),
+    ),
+    Etapa(
+        "selecionar_grupos",
+        selecionar_grupos,
+        entradas=("infnetianos_df",),
+        produz=("./gerados/grupos/_manifesto.json",),
+    ),
+    Etapa(
+        "contar_trending",
+        contar_trending,
+        entradas=("infnetianos_df",),
+        saidas=("trending",),
+    ),
+    Etapa(
+        "indexar_datas",
+        indexar_datas,
+        entradas=("infnetianos_df",),
+        saidas=("indice_datas",),
+    ),
+    Etapa(
+        "indexar_nomes",
+        indexar_nomes,
+        entradas=("infnetianos_df",),
+        saidas=("indice_nomes",),
+    ),
+    Etapa(
+        "indexar_ids",
+        indexar_ids,
+        entradas=("infnetianos_df",),
+        saidas=("indice_ids",),
+    ),
+    Etapa(
+        "agrupar",
+        agrupar,
+        entradas=("infnetianos_df", "indice_datas"),
+        console=True,
+    ),
+    Etapa(
+        "selecionar",
+        selecionar,
+        entradas=("infnetianos_df", "indice_nomes", "lote"),
+        saidas=("infnetiano_selecionado",),
+        console=True,
+    ),
+    Etapa(
+        "atualizar",
+        atualizar_infnetiano,
+        entradas=(
+            "infnetianos_df",
+            "infnetiano_selecionado",
+            "indice_ids",
+            "indice_nomes",
+            "indice_datas",
+            "trending",
+            "diario",
+        ),
+        saidas=("infnetianos_atualizados", "trending_atualizado"),
+        console=True,
+        apos=("selecionar_grupos",),
+    ),
+    Etapa(
+        "trending",
+        linguagens_trending,
+        entradas=("trending_atualizado",),
+        console=True,
+    ),
+]
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Pipeline do TP2 (INFwebNET).")
+    argumentos.add_argument(
+        "--refazer",
+        action="store_true",
+        help="Executa todas as etapas, sem reaproveitar o cache.",
+    )
+    argumentos.add_argument(
+        "--max-workers",
+        type=int,
+        help="Threads para as etapas que não interagem com o usuário.",
+    )
+    argumentos.add_argument(
+        "--resumo",
+        action="store_true",
+        help="Mostra, no fim, quais etapas foram executadas e quais foram reaproveitadas.",
+    )
+    argumentos.add_argument(
+        "--lote",
+        metavar="ARQUIVO",
+        help='Carrega os cadastros de um arquivo NDJSON ou CSV ("-" para a entrada padrão), '
+        "sem perguntas pelo teclado.",
+    )
+    argumentos.add_argument("--formato-lote", choices=("ndjson", "csv"))
+    argumentos.add_argument(
+        "--em-blocos",
+        action="store_true",
+        help="Processa os arquivos brutos em blocos, com memória limitada, sem cadastros pelo "
+        "teclado (passos 1, 2 e 7 a 11).",
+    )
+    argumentos.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    adicionar_argumentos(argumentos)
+    args = argumentos.parse_args()
+
+    # Com --metricas ou --perfil, cada etapa é envolvida pela instrumentação (as etapas
+    # reaproveitadas do cache não rodam e, portanto, não são medidas).
+    instrumentacao = criar_instrumentacao(args)
+    if instrumentacao is not None:
+        for etapa in ETAPAS:
+            etapa.funcao = instrumentacao.envolver(etapa.funcao, etapa.nome)
+        instrumentacao.instrumentar(globals(), ["processar_em_blocos"])
+
+    try:
+        if args.em_blocos:
+            resultado = processar_em_blocos(tamanho_bloco=args.tamanho_bloco)
+            print(f"{resultado['registros']} registros processados.")
+        else:
+            grafo = GrafoEtapas(
+                ETAPAS, max_workers=args.max_workers, refazer=args.refazer
+            )
+            grafo.executar(
+                {
+                    "ano_referencia": datetime.now().year,
+                    "lote": args.lote,
+                    "formato_lote": args.formato_lote,
+                }
+            )
+
+            if args.resumo:
+                print()
+                for etapa in ETAPAS:
+                    print(f"{etapa.nome}: {grafo.situacao[etapa.nome]}")
+    finally:
+        if instrumentacao is not None and args.metricas:
+            instrumentacao.exportar(args.metricas, args.formato_metricas)
+        if args.perfil and not instrumentacao.relatorios_perfil:
+            print(
+                f"\nA etapa '{args.perfil}' não foi executada (nome errado ou reaproveitada "
+                "do cache; use --refazer): nenhum perfil gravado."
+            )
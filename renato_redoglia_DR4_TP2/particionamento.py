@@ -0,0 +1,301 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - o Parquet é opcional
+    pa = None
+    pq = None
+
+UFS = frozenset(
+    "AC AL AP AM BA CE DF ES GO MA MT MS MG PA PB PR PE PI RJ RN RS RO RR SC SP SE TO".split()
+)
+PARTICAO_QUARENTENA = "QUARENTENA"
+FORMATOS = ("csv", "parquet")
+ARQUIVO_MANIFESTO = "_manifesto.json"
+
+
+def chaves_particao(valores, validos=UFS):
+    """
+    Normaliza os valores da coluna de partição e manda os inválidos para a quarentena.
+
+    Args:
+        valores (pd.Series): Valores da coluna (ex.: siglas de estado).
+        validos (set): Valores aceitos, já normalizados (sem espaços e em maiúsculas).
+
+    Returns:
+        pd.Series: A partição de cada linha; vazios, nulos e valores fora de `validos` viram
+        `PARTICAO_QUARENTENA`.
+    """
+    normalizados = valores.astype("string").str.strip().str.upper()
+    return normalizados.where(normalizados.isin(validos), PARTICAO_QUARENTENA).astype(
+        object
+    )
+
+
+def _serializar(df, formato):
+    if formato == "csv":
+        return df.to_csv(index=False, sep=";").encode("utf-8")
+
+    if pa is None:
+        raise ImportError("A exportação em Parquet precisa do pacote pyarrow.")
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def _ler_manifesto(diretorio):
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def exportar_particoes(
+    df,
+    diretorio,
+    coluna="estado",
+    formato="csv",
+    validos=UFS,
+    max_workers=None,
+):
+    """
+    Exporta um DataFrame particionado por uma coluna, no layout Hive (`coluna=VALOR/`).
+
+    As linhas são separadas em um único `groupby`; cada partição é serializada e gravada em
+    paralelo. Um manifesto com o hash SHA-256 de cada partição fica em `diretorio`: partições
+    cujo conteúdo não mudou desde a última exportação não são regravadas, e partições que
+    deixaram de existir são removidas. A gravação é atômica (arquivo temporário + `os.replace`).
+
+    Valores vazios ou fora de `validos` vão para a partição `PARTICAO_QUARENTENA`. A coluna de
+    partição é mantida nos arquivos, para que a quarentena preserve os valores originais.
+
+    Args:
+        df (pd.DataFrame): Os dados.
+        diretorio (str): Diretório raiz da exportação.
+        coluna (str): Coluna de partição.
+        formato (str): "csv" (separado por ";") ou "parquet".
+        validos (set): Valores aceitos na coluna de partição (ver `chaves_particao`).
+        max_workers (int, optional): Threads de gravação; por padrão, as do ThreadPoolExecutor.
+
+    Returns:
+        dict: Partição -> "gravada", "inalterada" ou "removida".
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(
+            f"Formato desconhecido: '{formato}'. Opções: {', '.join(FORMATOS)}."
+        )
+
+    anteriores = _ler_manifesto(diretorio).get("particoes", {})
+
+    def exportar(particao, grupo):
+        arquivo = os.path.join(f"{coluna}={particao}", f"parte-0.{formato}")
+        conteudo = _serializar(grupo, formato)
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+
+        anterior = anteriores.get(particao, {})
+        inalterada = (
+            anterior.get("arquivo") == arquivo
+            and anterior.get("sha256") == sha256
+            and os.path.exists(os.path.join(diretorio, arquivo))
+        )
+        if not inalterada:
+            _gravar_atomico(os.path.join(diretorio, arquivo), conteudo)
+
+        entrada = {"arquivo": arquivo, "sha256": sha256, "linhas": len(grupo)}
+        return particao, entrada, "inalterada" if inalterada else "gravada"
+
+    grupos = df.groupby(chaves_particao(df[coluna], validos), sort=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultados = list(executor.map(lambda item: exportar(*item), grupos))
+
+    particoes = {particao: entrada for particao, entrada, _ in resultados}
+    situacao = {particao: estado for particao, _, estado in resultados}
+
+    return _concluir_exportacao(
+        diretorio, coluna, formato, anteriores, particoes, situacao
+    )
+
+
+def _concluir_exportacao(diretorio, coluna, formato, anteriores, particoes, situacao):
+    # Arquivos de partições que sumiram (ou que mudaram de formato) são apagados.
+    for particao, anterior in anteriores.items():
+        if particoes.get(particao, {}).get("arquivo") == anterior["arquivo"]:
+            continue
+        caminho = os.path.join(diretorio, anterior["arquivo"])
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        with contextlib.suppress(OSError):
+            os.rmdir(os.path.dirname(caminho))
+        situacao.setdefault(particao, "removida")
+
+    os.makedirs(diretorio, exist_ok=True)
+    manifesto = {"coluna": coluna, "formato": formato, "particoes": particoes}
+    _gravar_atomico(
+        os.path.join(diretorio, ARQUIVO_MANIFESTO),
+        json.dumps(manifesto, ensure_ascii=False, indent=4).encode("utf-8"),
+    )
+
+    return situacao
+
+
+class ExportadorParticoes:
+    """
+    Versão incremental de `exportar_particoes`, para dados que chegam em blocos.
+
+    Cada bloco é separado por partição e acrescentado a um arquivo temporário da partição,
+    enquanto o hash SHA-256 é calculado; a memória usada não depende da quantidade de blocos.
+    Em `concluir`, os arquivos das partições que mudaram substituem os anteriores e o manifesto
+    é gravado, como em `exportar_particoes` (o resultado é o mesmo de exportar todos os blocos
+    concatenados). Só o formato CSV é suportado: o Parquet precisaria do esquema completo antes
+    do primeiro bloco.
+    """
+
+    def __init__(self, diretorio, coluna="estado", validos=UFS):
+        """
+        Args:
+            diretorio (str): Diretório raiz da exportação.
+            coluna (str): Coluna de partição.
+            validos (set): Valores aceitos na coluna de partição (ver `chaves_particao`).
+        """
+        self.diretorio = diretorio
+        self.coluna = coluna
+        self.validos = validos
+        self._abertas = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *excecao):
+        if tipo is not None:
+            self.descartar()
+
+    def _caminhos(self, particao):
+        arquivo = os.path.join(f"{self.coluna}={particao}", "parte-0.csv")
+        return arquivo, os.path.join(self.diretorio, f"{arquivo}.tmp")
+
+    def adicionar(self, bloco):
+        """
+        Acrescenta as linhas de um bloco às suas partições.
+
+        Args:
+            bloco (pd.DataFrame): As linhas (as colunas precisam ser as mesmas em todos os blocos).
+        """
+        for particao, grupo in bloco.groupby(
+            chaves_particao(bloco[self.coluna], self.validos), sort=False
+        ):
+            aberta = self._abertas.get(particao)
+            if aberta is None:
+                arquivo, temporario = self._caminhos(particao)
+                os.makedirs(os.path.dirname(temporario), exist_ok=True)
+                aberta = self._abertas[particao] = {
+                    "arquivo": arquivo,
+                    "saida": open(temporario, "wb"),
+                    "sha256": hashlib.sha256(),
+                    "linhas": 0,
+                }
+
+            conteudo = grupo.to_csv(
+                index=False, sep=";", header=aberta["linhas"] == 0
+            ).encode("utf-8")
+            aberta["saida"].write(conteudo)
+            aberta["sha256"].update(conteudo)
+            aberta["linhas"] += len(grupo)
+
+    def concluir(self):
+        """
+        Fecha as partições, troca as que mudaram e grava o manifesto.
+
+        Returns:
+            dict: Partição -> "gravada", "inalterada" ou "removida".
+        """
+        anteriores = _ler_manifesto(self.diretorio).get("particoes", {})
+        particoes = {}
+        situacao = {}
+
+        for particao, aberta in sorted(self._abertas.items()):
+            aberta["saida"].close()
+            _, temporario = self._caminhos(particao)
+            caminho = os.path.join(self.diretorio, aberta["arquivo"])
+            entrada = {
+                "arquivo": aberta["arquivo"],
+                "sha256": aberta["sha256"].hexdigest(),
+                "linhas": aberta["linhas"],
+            }
+
+            anterior = anteriores.get(particao, {})
+            if (
+                anterior.get("arquivo") == entrada["arquivo"]
+                and anterior.get("sha256") == entrada["sha256"]
+                and os.path.exists(caminho)
+            ):
+                os.remove(temporario)
+                situacao[particao] = "inalterada"
+            else:
+                os.replace(temporario, caminho)
+                situacao[particao] = "gravada"
+            particoes[particao] = entrada
+
+        self._abertas = {}
+        return _concluir_exportacao(
+            self.diretorio, self.coluna, "csv", anteriores, particoes, situacao
+        )
+
+    def descartar(self):
+        """
+        Fecha e apaga os arquivos temporários, sem mexer na exportação anterior.
+        """
+        for particao, aberta in self._abertas.items():
+            aberta["saida"].close()
+            with contextlib.suppress(OSError):
+                os.remove(self._caminhos(particao)[1])
+        self._abertas = {}
+
+
+def ler_particoes(diretorio, particoes=None):
+    """
+    Lê de volta uma exportação de `exportar_particoes`.
+
+    Args:
+        diretorio (str): Diretório raiz da exportação.
+        particoes (list, optional): Partições a ler; por padrão, todas.
+
+    Returns:
+        pd.DataFrame: As linhas das partições, na ordem das partições.
+    """
+    manifesto = _ler_manifesto(diretorio)
+    entradas = manifesto.get("particoes", {})
+    selecionadas = sorted(entradas) if particoes is None else particoes
+
+    partes = []
+    for particao in selecionadas:
+        caminho = os.path.join(diretorio, entradas[particao]["arquivo"])
+        if manifesto["formato"] == "csv":
+            partes.append(
+                pd.read_csv(caminho, sep=";", dtype=str, keep_default_na=False)
+            )
+        else:
+            partes.append(pd.read_parquet(caminho))
+
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
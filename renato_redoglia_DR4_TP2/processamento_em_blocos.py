@@ -0,0 +1,324 @@
+import argparse
+import contextlib
+import csv
+import os
+import random
+import resource
+import secrets
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+
+import pandas as pd
+
+from enriquecimento import enriquecer_infnetianos
+from ingestao import ler_usuarios_novos_em_blocos
+from particionamento import ExportadorParticoes
+
+TAMANHO_BLOCO = 100_000
+
+
+def ler_rede_em_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO, caminho_csv=None):
+    """
+    Lê o arquivo da rede (delimitado por "?") em blocos de linhas.
+
+    Como nos passos 1 e 2, cada linha contribui com os quatro primeiros campos (nome, idade,
+    cidade e estado); os demais (amigos) são descartados, e os nomes das colunas vêm do
+    cabeçalho.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+        tamanho_bloco (int): Quantidade de linhas por bloco.
+        caminho_csv (str, optional): Se informado, as linhas (com o cabeçalho) também são
+            gravadas nesse CSV, como `./gerados/INFwebNet.csv`.
+
+    Yields:
+        pd.DataFrame: As colunas de texto de cada bloco, com 'idade' em int64.
+
+    Raises:
+        ValueError: Se alguma idade não for um número inteiro.
+    """
+    with contextlib.ExitStack() as arquivos:
+        arquivo_txt = arquivos.enter_context(open(caminho, "r", encoding="utf-8"))
+        escritor = None
+        if caminho_csv is not None:
+            escritor = csv.writer(
+                arquivos.enter_context(
+                    open(caminho_csv, "w", newline="", encoding="utf-8")
+                )
+            )
+
+        linhas = (linha.strip().split("?")[:4] for linha in arquivo_txt)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        if escritor is not None:
+            escritor.writerow(cabecalho)
+
+        while bloco := list(islice(linhas, tamanho_bloco)):
+            if escritor is not None:
+                escritor.writerows(bloco)
+            df = pd.DataFrame(bloco, columns=cabecalho, dtype=object)
+            df["idade"] = df["idade"].astype("int64")
+            yield df
+
+
+def organizar_rede(bloco, ano_referencia):
+    """
+    Converte um bloco da rede para as colunas do passo 7.
+
+    Cada infnetiano recebe um id novo; a data de nascimento é estimada como 1º de janeiro do
+    ano `ano_referencia - idade` e as listas começam vazias, como no cadastro ampliado.
+
+    Args:
+        bloco (pd.DataFrame): Um bloco de `ler_rede_em_blocos`.
+        ano_referencia (int): Ano usado para estimar as datas de nascimento.
+
+    Returns:
+        pd.DataFrame: O bloco organizado.
+    """
+    quantidade = len(bloco)
+    anos = ano_referencia - bloco["idade"].to_numpy()
+    return pd.DataFrame(
+        {
+            "id": [secrets.token_hex(4) for _ in range(quantidade)],
+            "nome": bloco["nome"].to_numpy(),
+            "sobrenome": "",
+            "email": "",
+            "idade": bloco["idade"].to_numpy(),
+            "data de nascimento": pd.to_datetime(
+                pd.DataFrame({"year": anos, "month": 1, "day": 1})
+            ).to_numpy(),
+            "cidade": bloco["cidade"].to_numpy(),
+            "estado": bloco["estado"].to_numpy(),
+            "hobbies": [[] for _ in range(quantidade)],
+            "linguagens de programação": [[] for _ in range(quantidade)],
+            "jogos": [[] for _ in range(quantidade)],
+        }
+    )
+
+
+class EscritorJsonEmBlocos:
+    """
+    Grava blocos de um DataFrame em um único arquivo JSON (lista de registros), com o mesmo
+    conteúdo de `DataFrame.to_json(orient="records", force_ascii=False, indent=4)` aplicado aos
+    blocos concatenados.
+    """
+
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho (str): Arquivo de saída (gravado em um temporário e trocado no fim).
+        """
+        self.caminho = caminho
+        self._temporario = f"{caminho}.tmp"
+        self._arquivo = open(self._temporario, "w", encoding="utf-8")
+        self._arquivo.write("[\n")
+        self._registros = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *excecao):
+        if tipo is not None:
+            self.descartar()
+
+    def adicionar(self, bloco):
+        """
+        Args:
+            bloco (pd.DataFrame): Os registros do bloco.
+        """
+        if bloco.empty:
+            return
+        texto = bloco.to_json(orient="records", force_ascii=False, indent=4)
+        if self._registros:
+            self._arquivo.write(",\n")
+        self._arquivo.write(texto[2:-2])  # Sem o "[\n" inicial e o "\n]" final.
+        self._registros += len(bloco)
+
+    def concluir(self):
+        """
+        Fecha a lista e troca o arquivo de saída.
+
+        Returns:
+            int: A quantidade de registros gravados.
+        """
+        self._arquivo.write("\n]")
+        self._arquivo.close()
+        os.replace(self._temporario, self.caminho)
+        return self._registros
+
+    def descartar(self):
+        """
+        Fecha e apaga o arquivo temporário, sem mexer no arquivo de saída.
+        """
+        self._arquivo.close()
+        with contextlib.suppress(OSError):
+            os.remove(self._temporario)
+
+
+def blocos_infnetianos(
+    caminho_rede,
+    caminho_usuarios_novos,
+    ano_referencia=None,
+    tamanho_bloco=TAMANHO_BLOCO,
+    caminho_csv=None,
+):
+    """
+    Os infnetianos dos dois arquivos brutos, organizados e completados, bloco a bloco.
+
+    Equivale aos passos 1, 2 e 7 a 9 sem cadastros pelo teclado: primeiro os blocos da rede,
+    depois os dos usuários novos.
+
+    Args:
+        caminho_rede (str): Arquivo delimitado por "?" (`rede_INFNET_atualizado.txt`).
+        caminho_usuarios_novos (str): Arquivo delimitado por ";" (`dados_usuarios_novos.txt`).
+        ano_referencia (int, optional): Ano usado nas estimativas; por padrão, o atual.
+        tamanho_bloco (int): Quantidade de linhas por bloco.
+        caminho_csv (str, optional): CSV da rede a gravar (ver `ler_rede_em_blocos`).
+
+    Yields:
+        pd.DataFrame: Cada bloco, já com 'idade', 'data de nascimento' e 'ano nascimento'
+        completados.
+    """
+    ano_referencia = ano_referencia or datetime.now().year
+
+    for bloco in ler_rede_em_blocos(caminho_rede, tamanho_bloco, caminho_csv):
+        yield enriquecer_infnetianos(
+            organizar_rede(bloco, ano_referencia), ano_referencia
+        )
+    for bloco in ler_usuarios_novos_em_blocos(caminho_usuarios_novos, tamanho_bloco):
+        yield enriquecer_infnetianos(bloco, ano_referencia)
+
+
+def processar_em_blocos(
+    caminho_rede="./brutos/rede_INFNET_atualizado.txt",
+    caminho_usuarios_novos="./brutos/dados_usuarios_novos.txt",
+    diretorio_saida="./gerados",
+    ano_referencia=None,
+    tamanho_bloco=TAMANHO_BLOCO,
+):
+    """
+    Executa os passos 1, 2 e 7 a 11 com memória limitada ao tamanho do bloco.
+
+    Grava `INFwebNet.csv`, `INFwebNet_Data.json` e as partições por estado em `grupos/`, com
+    o mesmo conteúdo do pipeline completo quando não há cadastros pelo teclado (os ids são
+    sorteados, como no pipeline).
+
+    Args:
+        caminho_rede (str): Arquivo da rede.
+        caminho_usuarios_novos (str): Arquivo dos usuários novos.
+        diretorio_saida (str): Diretório dos arquivos gerados.
+        ano_referencia (int, optional): Ano usado nas estimativas; por padrão, o atual.
+        tamanho_bloco (int): Quantidade de linhas por bloco.
+
+    Returns:
+        dict: Quantidade de registros e situação de cada partição (ver `exportar_particoes`).
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    with EscritorJsonEmBlocos(
+        os.path.join(diretorio_saida, "INFwebNet_Data.json")
+    ) as escritor_json, ExportadorParticoes(
+        os.path.join(diretorio_saida, "grupos"), coluna="estado"
+    ) as exportador:
+        for bloco in blocos_infnetianos(
+            caminho_rede,
+            caminho_usuarios_novos,
+            ano_referencia,
+            tamanho_bloco,
+            caminho_csv=os.path.join(diretorio_saida, "INFwebNet.csv"),
+        ):
+            bloco["data de nascimento"] = bloco["data de nascimento"].dt.strftime(
+                "%Y-%m-%d"
+            )
+            escritor_json.adicionar(bloco)
+            exportador.adicionar(bloco)
+
+        particoes = exportador.concluir()
+        registros = escritor_json.concluir()
+
+    return {"registros": registros, "particoes": particoes}
+
+
+def _gerar_rede_sintetica(caminho_base, caminho_saida, linhas, semente):
+    # Sorteia linhas do arquivo base (sem carregar a saída na memória).
+    aleatorio = random.Random(semente)
+    with open(caminho_base, encoding="utf-8") as arquivo:
+        cabecalho, *base = arquivo.read().splitlines()
+
+    with open(caminho_saida, "w", encoding="utf-8") as saida:
+        saida.write(cabecalho + "\n")
+        restantes = linhas
+        while restantes:
+            quantidade = min(restantes, 100_000)
+            saida.write("\n".join(aleatorio.choices(base, k=quantidade)) + "\n")
+            restantes -= quantidade
+
+
+def benchmark_memoria(
+    linhas=1_000_000,
+    tamanho_bloco=TAMANHO_BLOCO,
+    caminho_base="./brutos/rede_INFNET_atualizado.txt",
+    caminho_usuarios_novos="./brutos/dados_usuarios_novos.txt",
+):
+    """
+    Processa em blocos um arquivo da rede sintético e mede o tempo e o pico de memória.
+
+    O pico (`ru_maxrss`) é o do processo inteiro: para comparar tamanhos de entrada, rode cada
+    tamanho em um processo separado (ex.: pela linha de comando).
+
+    Args:
+        linhas (int): Quantidade de linhas do arquivo sintético.
+        tamanho_bloco (int): Quantidade de linhas por bloco.
+        caminho_base (str): Arquivo de onde as linhas sintéticas são sorteadas.
+        caminho_usuarios_novos (str): Arquivo dos usuários novos.
+
+    Returns:
+        dict: Registros processados, tempo em segundos e pico de memória em MiB.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_rede = os.path.join(diretorio, "rede.txt")
+        _gerar_rede_sintetica(caminho_base, caminho_rede, linhas, semente=42)
+
+        inicio = time.perf_counter()
+        resultado = processar_em_blocos(
+            caminho_rede,
+            caminho_usuarios_novos,
+            os.path.join(diretorio, "gerados"),
+            tamanho_bloco=tamanho_bloco,
+        )
+        segundos = time.perf_counter() - inicio
+        shutil.rmtree(os.path.join(diretorio, "gerados"))
+
+    return {
+        "linhas": linhas,
+        "registros": resultado["registros"],
+        "segundos": segundos,
+        "pico_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(
+        description="Processamento em blocos dos arquivos brutos do TP2."
+    )
+    argumentos.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    argumentos.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="LINHAS",
+        help="Processa um arquivo sintético com LINHAS linhas e mostra o pico de memória.",
+    )
+    args = argumentos.parse_args()
+
+    if args.benchmark:
+        resultado = benchmark_memoria(args.benchmark, args.tamanho_bloco)
+        print(
+            f"{resultado['linhas']} linhas: {resultado['registros']} registros em "
+            f"{resultado['segundos']:.1f} s, pico de memória {resultado['pico_mib']:.0f} MiB."
+        )
+    else:
+        resultado = processar_em_blocos(tamanho_bloco=args.tamanho_bloco)
+        print(f"{resultado['registros']} registros processados.")
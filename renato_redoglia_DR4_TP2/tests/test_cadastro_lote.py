@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from cadastro_lote import carregar_lote, ler_registros, validar_registro
+from diario import DiarioInfnetianos
+
+VALIDO = {
+    "nome": "Ana",
+    "idade": 30,
+    "cidade": "Rio de Janeiro",
+    "estado": "RJ",
+    "hobbies": ["leitura"],
+    "linguagens de programação": ["Python"],
+    "jogos": [{"nome": "Minecraft", "plataforma": "PC"}],
+}
+
+
+@pytest.fixture
+def diario(tmp_path):
+    with DiarioInfnetianos.criar(str(tmp_path / "INFwebNET.json"), []) as diario:
+        yield diario
+
+
+def test_validar_registro_valido():
+    convertido, motivo = validar_registro(VALIDO)
+    assert motivo is None
+    assert convertido["idade"] == 30
+    assert convertido["jogos"] == [{"nome": "Minecraft", "plataforma": "PC"}]
+
+
+@pytest.mark.parametrize(
+    "alteracoes",
+    [
+        {"nome": ""},
+        {"idade": "trinta"},
+        {"idade": 30.5},
+        {"idade": 200},
+        {"hobbies": 5},
+        {"hobbies": ["a", "b", "c", "d", "e", "f"]},
+        {"jogos": [("Minecraft",)]},
+    ],
+)
+def test_validar_registro_rejeita(alteracoes):
+    convertido, motivo = validar_registro({**VALIDO, **alteracoes})
+    assert convertido is None and motivo
+
+
+def test_atualizacao_so_leva_os_campos_informados():
+    convertido, motivo = validar_registro({"id": "a1", "cidade": "Recife"}, True)
+    assert motivo is None
+    assert convertido == {"id": "a1", "cidade": "Recife"}
+
+
+def test_ler_registros_csv_e_ndjson():
+    csv = (
+        "nome;idade;cidade;estado;hobbies;linguagens de programação;jogos\n"
+        "Ana;30;Rio;RJ;leitura, cinema;Python;[('Minecraft', 'PC')]\n"
+    )
+    ((numero, registro),) = ler_registros(io.StringIO(csv), "csv")
+    assert numero == 2
+    assert validar_registro(registro)[0]["hobbies"] == ["leitura", "cinema"]
+
+    ndjson = '{"nome": "Ana"}\n\n{quebrado\n'
+    assert list(ler_registros(io.StringIO(ndjson), "ndjson")) == [
+        (1, {"nome": "Ana"}),
+        (3, None),
+    ]
+
+
+def test_carregar_lote(diario):
+    registros = [VALIDO, {**VALIDO, "idade": -1}, None, {**VALIDO, "nome": "Bruno"}]
+    relatorio = carregar_lote(diario, enumerate(registros, start=1), tamanho_lote=2)
+
+    assert relatorio["aceitos"] == 2
+    assert relatorio["rejeitados"] == 2
+    assert [numero for numero, _ in relatorio["erros"]] == [2, 3]
+    assert sorted(registro["nome"] for registro in diario.registros()) == [
+        "Ana",
+        "Bruno",
+    ]
+
+
+def test_carregar_lote_atualiza_pelo_id(diario):
+    identificador = diario.inserir(validar_registro(VALIDO)[0])
+    relatorio = carregar_lote(
+        diario, [(1, {"id": identificador, "cidade": "Recife", "hobbies": ""})]
+    )
+
+    assert relatorio["aceitos"] == 1
+    registro = diario.obter(identificador)
+    assert registro["cidade"] == "Recife"
+    assert registro["nome"] == "Ana" and registro["hobbies"] == ["leitura"]
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from diario import DiarioInfnetianos
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return str(tmp_path / "INFwebNET.json")
+
+
+def test_reabrir_reaplica_o_diario(snapshot):
+    with DiarioInfnetianos.criar(snapshot, [{"id": "a1", "nome": "Ana"}]) as diario:
+        identificador = diario.inserir({"nome": "Bruno"})
+        diario.atualizar("a1", {"cidade": "Rio"})
+
+    with DiarioInfnetianos(snapshot) as diario:
+        assert diario.obter("a1") == {"id": "a1", "nome": "Ana", "cidade": "Rio"}
+        assert diario.obter(identificador) == {"id": identificador, "nome": "Bruno"}
+        assert len(diario) == 2
+
+
+@pytest.mark.parametrize("vazio", [None, ""])
+def test_id_vazio_recebe_um_id_novo(snapshot, vazio):
+    with DiarioInfnetianos.criar(snapshot, [{"id": vazio, "nome": "Ana"}]) as diario:
+        identificador = diario.inserir({"id": vazio, "nome": "Bruno"})
+        registros = diario.registros()
+
+    assert identificador
+    assert all(registro["id"] for registro in registros)
+    assert registros[1]["id"] == identificador
+
+
+def test_atualizar_nao_troca_o_id(snapshot):
+    with DiarioInfnetianos.criar(snapshot, [{"id": "a1", "nome": "Ana"}]) as diario:
+        diario.atualizar("a1", {"id": "outro", "nome": "Ana Maria"})
+        assert diario.obter("a1") == {"id": "a1", "nome": "Ana Maria"}
+
+
+def test_linha_incompleta_no_fim_do_diario_e_descartada(snapshot):
+    with DiarioInfnetianos.criar(snapshot, [{"id": "a1", "nome": "Ana"}]) as diario:
+        diario.atualizar("a1", {"cidade": "Rio"})
+        arquivo_diario = diario.arquivo_diario
+
+    with open(arquivo_diario, "ab") as arquivo:
+        arquivo.write(b'{"op": "atualizar", "id": "a1", "alter')
+
+    with DiarioInfnetianos(snapshot) as diario:
+        assert diario.obter("a1") == {"id": "a1", "nome": "Ana", "cidade": "Rio"}
+        diario.atualizar("a1", {"estado": "RJ"})
+
+    with DiarioInfnetianos(snapshot) as diario:
+        assert diario.obter("a1")["estado"] == "RJ"
+
+
+def test_compactar_grava_o_snapshot_e_esvazia_o_diario(snapshot):
+    with DiarioInfnetianos.criar(snapshot, [{"id": "a1", "nome": "Ana"}]) as diario:
+        diario.inserir({"id": "b2", "nome": "Bruno"})
+        diario.compactar()
+        arquivo_diario = diario.arquivo_diario
+
+    with open(snapshot, encoding="utf-8") as arquivo:
+        assert [registro["id"] for registro in json.load(arquivo)] == ["a1", "b2"]
+    with open(arquivo_diario, "rb") as arquivo:
+        assert arquivo.read() == b""
+
+
+def test_gravar_lote_insere_e_atualiza(snapshot):
+    with DiarioInfnetianos.criar(snapshot, [{"id": "a1", "nome": "Ana"}]) as diario:
+        ids = diario.gravar_lote(
+            [{"id": "a1", "cidade": "Rio"}, {"id": None, "nome": "Bruno"}]
+        )
+
+    assert ids[0] == "a1" and ids[1]
+    with DiarioInfnetianos(snapshot) as diario:
+        assert diario.obter("a1") == {"id": "a1", "nome": "Ana", "cidade": "Rio"}
+        assert diario.obter(ids[1]) == {"id": ids[1], "nome": "Bruno"}
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+from particionamento import (
+    PARTICAO_QUARENTENA,
+    chaves_particao,
+    exportar_particoes,
+    ler_particoes,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "nome": ["Ana", "Bruno", "Carla", "Davi", "Eva"],
+            "estado": ["RJ", " sp", "", None, "XX"],
+        }
+    )
+
+
+def test_chaves_particao(df):
+    assert list(chaves_particao(df["estado"])) == [
+        "RJ",
+        "SP",
+        PARTICAO_QUARENTENA,
+        PARTICAO_QUARENTENA,
+        PARTICAO_QUARENTENA,
+    ]
+
+
+@pytest.mark.parametrize("formato", ["csv", "parquet"])
+def test_exportar_e_ler_de_volta(tmp_path, df, formato):
+    diretorio = str(tmp_path)
+    situacao = exportar_particoes(df, diretorio, formato=formato)
+
+    assert situacao == {
+        "RJ": "gravada",
+        "SP": "gravada",
+        PARTICAO_QUARENTENA: "gravada",
+    }
+    assert os.path.exists(os.path.join(diretorio, "estado=RJ", f"parte-0.{formato}"))
+    lidos = ler_particoes(diretorio, ["RJ", PARTICAO_QUARENTENA])
+    assert list(lidos["nome"]) == ["Ana", "Carla", "Davi", "Eva"]
+
+
+def test_reexportar_so_grava_o_que_mudou(tmp_path, df):
+    diretorio = str(tmp_path)
+    exportar_particoes(df, diretorio)
+    arquivo_rj = os.path.join(diretorio, "estado=RJ", "parte-0.csv")
+    os.utime(arquivo_rj, (0, 0))
+
+    assert set(exportar_particoes(df, diretorio).values()) == {"inalterada"}
+    assert os.stat(arquivo_rj).st_mtime == 0
+
+    df.loc[1, "nome"] = "Bruna"
+    situacao = exportar_particoes(df, diretorio)
+    assert situacao["SP"] == "gravada" and situacao["RJ"] == "inalterada"
+    assert list(ler_particoes(diretorio, ["SP"])["nome"]) == ["Bruna"]
+
+
+def test_particao_que_sumiu_e_removida(tmp_path, df):
+    diretorio = str(tmp_path)
+    exportar_particoes(df, diretorio)
+
+    situacao = exportar_particoes(df[df["estado"] != " sp"], diretorio)
+    assert situacao["SP"] == "removida"
+    assert not os.path.exists(os.path.join(diretorio, "estado=SP"))
+    assert sorted(ler_particoes(diretorio)["nome"]) == ["Ana", "Carla", "Davi", "Eva"]
+
+
+def test_formato_desconhecido(tmp_path, df):
+    with pytest.raises(ValueError):
+        exportar_particoes(df, str(tmp_path), formato="xlsx")
@@ -0,0 +1,426 @@
+import bisect
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from listas_compactas import ColunaListas
+
+DIMENSOES = ("linguagens", "hobbies", "jogos", "plataformas")
+
+
+def pares_jogos(jogos):
+    """
+    Normaliza os jogos de um infnetiano em pares (jogo, plataforma).
+
+    Aceita os formatos usados ao longo do pipeline: dicionários `{"nome", "plataforma"}`
+    (cadastro ampliado) e tuplas ou listas `(jogo, plataforma)`.
+
+    Args:
+        jogos (list): Os jogos do infnetiano.
+
+    Returns:
+        list: Os pares (jogo, plataforma).
+    """
+    pares = []
+    for jogo in jogos if isinstance(jogos, (list, tuple)) else []:
+        if isinstance(jogo, dict):
+            pares.append((jogo.get("nome"), jogo.get("plataforma")))
+        elif isinstance(jogo, (list, tuple)) and len(jogo) == 2:
+            pares.append((jogo[0], jogo[1]))
+    return pares
+
+
+def _lista(valor):
+    return list(valor) if isinstance(valor, (list, tuple)) else []
+
+
+def _estado(valor):
+    return valor if isinstance(valor, str) and valor else None
+
+
+def _ano_da_data(data):
+    if isinstance(data, str):
+        data = pd.to_datetime(data, errors="coerce")
+    if isinstance(data, (date, datetime)) and not pd.isna(data):
+        return data.year
+    return None
+
+
+def ano_nascimento(infnetiano):
+    """
+    Ano de nascimento de um infnetiano, pela data de nascimento, pelo campo "ano nascimento" ou,
+    na falta dos dois, estimado pela idade.
+
+    Returns:
+        int: O ano, ou None se não houver como determiná-lo.
+    """
+    ano = _ano_da_data(infnetiano.get("data de nascimento"))
+    if ano is not None:
+        return ano
+
+    ano = infnetiano.get("ano nascimento")
+    if ano is not None and not pd.isna(ano):
+        return int(ano)
+
+    idade = infnetiano.get("idade")
+    if idade is not None and not pd.isna(idade):
+        return datetime.now().year - int(idade)
+
+    return None
+
+
+def anos_nascimento(df):
+    """
+    Versão vetorizada de `ano_nascimento` para todas as linhas de um DataFrame.
+
+    Datas em texto no formato "%Y-%m-%d" (o gravado por `guardar`) são convertidas em bloco; só
+    as que estão em outro formato são convertidas uma a uma.
+
+    Returns:
+        list: O ano de cada linha, ou None onde não há como determiná-lo.
+    """
+    anos = np.full(len(df), np.nan)
+
+    if "data de nascimento" in df:
+        datas = df["data de nascimento"]
+        if pd.api.types.is_datetime64_any_dtype(datas):
+            anos = datas.dt.year.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            valores = datas.to_numpy(dtype=object)
+            textos = np.fromiter(
+                (isinstance(valor, str) for valor in valores), bool, len(valores)
+            )
+            if textos.any():
+                anos[textos] = pd.to_datetime(
+                    pd.Series(valores[textos], dtype=object),
+                    errors="coerce",
+                    format="%Y-%m-%d",
+                ).dt.year.to_numpy(dtype=float, na_value=np.nan)
+            for posicao in np.flatnonzero(np.isnan(anos)):
+                ano = _ano_da_data(valores[posicao])
+                if ano is not None:
+                    anos[posicao] = ano
+
+    for coluna, converter in (
+        ("ano nascimento", lambda valores: valores),
+        ("idade", lambda valores: datetime.now().year - np.trunc(valores)),
+    ):
+        faltando = np.isnan(anos)
+        if coluna in df and faltando.any():
+            valores = pd.to_numeric(df[coluna], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            anos[faltando] = converter(valores[faltando])
+
+    return [None if np.isnan(ano) else int(ano) for ano in anos]
+
+
+def _recortes(estado, faixa):
+    recortes = [(None, None)]
+    if estado is not None:
+        recortes.append((estado, None))
+    if faixa is not None:
+        recortes.append((None, faixa))
+    if estado is not None and faixa is not None:
+        recortes.append((estado, faixa))
+    return recortes
+
+
+class _ContagemOrdenada:
+    """
+    Contagens dos valores de um recorte, agrupadas pelo valor da contagem.
+
+    Cada contagem positiva tem um balde com os valores que a têm, na ordem em que apareceram pela
+    primeira vez no recorte (o desempate do `Counter.most_common`), e as contagens com balde
+    ficam em uma lista ordenada: o top-k lê os baldes da maior contagem para a menor e para no
+    k-ésimo valor.
+    """
+
+    def __init__(self):
+        self._valores = []
+        self._ordem = {}
+        self._contagens = {}
+        self._baldes = {}
+        self._niveis = []
+
+    def somar(self, valor, quantidade):
+        """
+        Soma `quantidade` (que pode ser negativa) à contagem de um valor.
+        """
+        if not quantidade:
+            return
+
+        ordem = self._ordem.get(valor)
+        if ordem is None:
+            ordem = self._ordem[valor] = len(self._valores)
+            self._valores.append(valor)
+
+        anterior = self._contagens.get(ordem, 0)
+        atual = self._contagens[ordem] = anterior + quantidade
+        if anterior > 0:
+            self._retirar(anterior, ordem)
+        if atual > 0:
+            self._colocar(atual, ordem)
+
+    def _colocar(self, contagem, ordem):
+        balde = self._baldes.get(contagem)
+        if balde is None:
+            balde = self._baldes[contagem] = []
+            bisect.insort(self._niveis, contagem)
+        bisect.insort(balde, ordem)
+
+    def _retirar(self, contagem, ordem):
+        balde = self._baldes[contagem]
+        del balde[bisect.bisect_left(balde, ordem)]
+        if not balde:
+            del self._baldes[contagem]
+            del self._niveis[bisect.bisect_left(self._niveis, contagem)]
+
+    def top(self, k):
+        """
+        Returns:
+            list: Até k pares (valor, contagem) com contagem positiva, do mais frequente para o
+            menos frequente.
+        """
+        resultado = []
+        for contagem in reversed(self._niveis):
+            for ordem in self._baldes[contagem]:
+                if len(resultado) >= k:
+                    return resultado
+                resultado.append((self._valores[ordem], contagem))
+        return resultado
+
+
+class _Lote:
+    # Linhas registradas juntas por `registrar_dataframe`. As listas ficam em formato CSR (ver
+    # listas_compactas.py); os valores de uma linha só voltam a ser listas Python quando ela é
+    # atualizada ou removida.
+
+    def __init__(self, colunas, estados, faixas):
+        self.colunas = colunas
+        self.estados = estados
+        self.faixas = faixas
+
+    def contribuicao(self, posicao):
+        valores = {}
+        for dimensao, (coluna, campo) in self.colunas.items():
+            inicio, fim = coluna.deslocamentos[posicao : posicao + 2]
+            vocabulario = coluna.vocabularios[campo].valores
+            valores[dimensao] = [
+                vocabulario[codigo] for codigo in coluna.codigos[campo][inicio:fim]
+            ]
+        return _recortes(self.estados[posicao], self.faixas[posicao]), valores
+
+
+class ContadoresTrending:
+    """
+    Contadores de linguagens, hobbies, jogos e plataformas mantidos de forma incremental.
+
+    Cada infnetiano é registrado por uma chave (por exemplo, o índice no DataFrame) e contribui
+    para os contadores globais, do seu estado, da sua faixa de ano de nascimento e da combinação
+    estado + faixa. Registrar de novo a mesma chave troca as contribuições antigas pelas novas,
+    então uma atualização só mexe nos valores do próprio infnetiano.
+
+    Cada recorte guarda os valores agrupados pela contagem (ver `_ContagemOrdenada`): uma
+    consulta de top-k lê só os k primeiros valores, sem depender da quantidade de infnetianos
+    nem de valores distintos.
+    """
+
+    def __init__(self, tamanho_faixa_ano=10):
+        """
+        Args:
+            tamanho_faixa_ano (int): Quantidade de anos em cada faixa de ano de nascimento.
+        """
+        self.tamanho_faixa_ano = tamanho_faixa_ano
+        self._contadores = defaultdict(_ContagemOrdenada)
+        self._contribuicoes = {}
+
+    def faixa_ano(self, ano):
+        """
+        Returns:
+            int: O primeiro ano da faixa que contém `ano` (ex.: 1990 para 1994, com faixas de 10 anos).
+        """
+        return ano - ano % self.tamanho_faixa_ano
+
+    def _valores(self, infnetiano):
+        pares = pares_jogos(infnetiano.get("jogos"))
+        return {
+            "linguagens": _lista(infnetiano.get("linguagens de programação")),
+            "hobbies": _lista(infnetiano.get("hobbies")),
+            "jogos": [jogo for jogo, _ in pares],
+            "plataformas": [plataforma for _, plataforma in pares],
+        }
+
+    def _somar(self, recortes, valores, sinal):
+        for recorte in recortes:
+            for dimensao in DIMENSOES:
+                contador = self._contadores[(dimensao, *recorte)]
+                for valor, quantidade in Counter(valores[dimensao]).items():
+                    contador.somar(valor, sinal * quantidade)
+
+    def registrar(self, chave, infnetiano):
+        """
+        Conta um infnetiano novo ou substitui as contribuições de um já registrado.
+
+        Args:
+            chave: Identificador do infnetiano (hasheável).
+            infnetiano (dict): Os dados do infnetiano.
+        """
+        self.remover(chave)
+
+        ano = ano_nascimento(infnetiano)
+        recortes = _recortes(
+            _estado(infnetiano.get("estado")),
+            None if ano is None else self.faixa_ano(ano),
+        )
+        valores = self._valores(infnetiano)
+        self._somar(recortes, valores, 1)
+        self._contribuicoes[chave] = (recortes, valores)
+
+    def remover(self, chave):
+        """
+        Desconta as contribuições de um infnetiano registrado (nada acontece se a chave não existir).
+        """
+        contribuicao = self._contribuicoes.pop(chave, None)
+        if contribuicao is None:
+            return
+        if isinstance(contribuicao[0], _Lote):
+            lote, posicao = contribuicao
+            contribuicao = lote.contribuicao(posicao)
+        self._somar(*contribuicao, -1)
+
+    def registrar_dataframe(self, df):
+        """
+        Registra todas as linhas de um DataFrame, usando o índice como chave.
+
+        O resultado é o mesmo de chamar `registrar` linha a linha, mas as contagens são feitas em
+        bloco: as colunas de listas são compactadas em CSR (ver `listas_compactas.ColunaListas`)
+        e cada recorte soma de uma vez as ocorrências de cada valor.
+
+        Raises:
+            ValueError: Se o índice do DataFrame tiver chaves repetidas.
+        """
+        if not df.index.is_unique:
+            raise ValueError("O índice do DataFrame precisa ter chaves únicas.")
+
+        for chave in self._contribuicoes.keys() & set(df.index):
+            self.remover(chave)
+
+        quantidade = len(df)
+
+        def coluna(nome):
+            return df[nome] if nome in df else repeat(None, quantidade)
+
+        estados = [_estado(estado) for estado in coluna("estado")]
+        faixas = [
+            None if ano is None else self.faixa_ano(ano) for ano in anos_nascimento(df)
+        ]
+
+        jogos = ColunaListas.de_listas(map(pares_jogos, coluna("jogos")), campos=2)
+        colunas = {
+            "linguagens": (
+                ColunaListas.de_listas(
+                    map(_lista, coluna("linguagens de programação"))
+                ),
+                0,
+            ),
+            "hobbies": (ColunaListas.de_listas(map(_lista, coluna("hobbies"))), 0),
+            "jogos": (jogos, 0),
+            "plataformas": (jogos, 1),
+        }
+
+        # Grupo de cada linha em cada tipo de recorte (-1 quando a linha fica de fora).
+        codigos_estado, estados_distintos = pd.factorize(
+            pd.Series(estados, dtype=object)
+        )
+        codigos_faixa, faixas_distintas = pd.factorize(pd.Series(faixas, dtype=object))
+        estados_distintos = list(estados_distintos)
+        faixas_distintas = list(faixas_distintas)
+        quantidade_faixas = max(len(faixas_distintas), 1)
+        codigos_combinados = np.where(
+            (codigos_estado >= 0) & (codigos_faixa >= 0),
+            codigos_estado * quantidade_faixas + codigos_faixa,
+            -1,
+        )
+        tipos_recorte = (
+            (np.zeros(quantidade, dtype=np.int64), lambda grupo: (None, None)),
+            (codigos_estado, lambda grupo: (estados_distintos[grupo], None)),
+            (codigos_faixa, lambda grupo: (None, faixas_distintas[grupo])),
+            (
+                codigos_combinados,
+                lambda grupo: (
+                    estados_distintos[grupo // quantidade_faixas],
+                    faixas_distintas[grupo % quantidade_faixas],
+                ),
+            ),
+        )
+
+        for dimensao, (coluna_listas, campo) in colunas.items():
+            codigos = coluna_listas.codigos[campo].astype(np.int64)
+            if not len(codigos):
+                continue
+            valores = coluna_listas.vocabularios[campo].valores
+            linhas = coluna_listas.linhas()
+
+            for grupos_linhas, recorte_do_grupo in tipos_recorte:
+                grupos = grupos_linhas[linhas]
+                dentro = grupos >= 0
+                chaves, primeiras, contagens = np.unique(
+                    grupos[dentro] * len(valores) + codigos[dentro],
+                    return_index=True,
+                    return_counts=True,
+                )
+                # Na ordem da primeira ocorrência, para manter o desempate de `registrar`.
+                ordem = np.argsort(primeiras, kind="stable")
+                for chave, contagem in zip(
+                    chaves[ordem].tolist(), contagens[ordem].tolist()
+                ):
+                    grupo, codigo = divmod(chave, len(valores))
+                    self._contadores[(dimensao, *recorte_do_grupo(grupo))].somar(
+                        valores[codigo], contagem
+                    )
+
+        lote = _Lote(colunas, estados, faixas)
+        self._contribuicoes.update(zip(df.index, zip(repeat(lote), range(quantidade))))
+
+    def top(self, k=5, dimensao="linguagens", estado=None, faixa_ano=None):
+        """
+        Os k valores mais frequentes de uma dimensão, globalmente ou em um recorte.
+
+        Empates ficam na ordem em que os valores apareceram pela primeira vez, como em
+        `Counter.most_common`.
+
+        Args:
+            k (int): Quantidade de valores.
+            dimensao (str): "linguagens", "hobbies", "jogos" ou "plataformas".
+            estado (str, optional): Restringe a um estado.
+            faixa_ano (int, optional): Restringe a uma faixa de ano de nascimento (qualquer ano
+                dentro da faixa serve).
+
+        Returns:
+            list: Pares (valor, contagem), do mais frequente para o menos frequente.
+
+        Raises:
+            ValueError: Se a dimensão não existir.
+        """
+        if dimensao not in DIMENSOES:
+            raise ValueError(
+                f"Dimensão desconhecida: '{dimensao}'. Opções: {', '.join(DIMENSOES)}."
+            )
+        if faixa_ano is not None:
+            faixa_ano = self.faixa_ano(faixa_ano)
+
+        contador = self._contadores.get((dimensao, estado, faixa_ano))
+        return [] if contador is None else contador.top(k)
+
+    def painel(self, k=5, estado=None, faixa_ano=None):
+        """
+        Returns:
+            dict: O top-k de cada dimensão no recorte pedido.
+        """
+        return {
+            dimensao: self.top(k, dimensao, estado, faixa_ano) for dimensao in DIMENSOES
+        }